@@ -0,0 +1 @@
+"""Chip8 Benchmarks."""
@@ -0,0 +1,57 @@
+"""Compare the reference CPU against the faster execution engines on the bundled ROMs."""
+
+import time
+from pathlib import Path
+
+from chip8._exceptions import ChipError
+from chip8.audio import HeadlessAudio
+from chip8.chip8 import ENGINES
+from chip8.constants import CPU_CYCLES_PER_TICK
+from chip8.cpu import CPU
+from chip8.dispatch import dispatch_table
+from chip8.keypad import HeadlessKeypad
+from chip8.ram import RAM
+from chip8.screen import HeadlessScreen
+
+ROM_DIR: Path = Path("roms")
+FRAMES: int = 2000  # frames of CPU_CYCLES_PER_TICK instructions per run
+REPEATS: int = 5  # runs per engine, the fastest is reported
+
+
+def measure(engine: type[CPU], rom: Path) -> tuple[int, float]:
+    """Run a ROM for FRAMES frames, return instructions executed and best seconds taken."""
+    best = float("inf")
+    for _ in range(REPEATS):
+        cpu = engine(RAM(str(rom)), HeadlessScreen(), HeadlessKeypad(), HeadlessAudio())
+        frames = 0
+        start = time.perf_counter()
+        try:
+            while frames < FRAMES:
+                cpu.cycle()
+                frames += 1
+        except ChipError:
+            pass  # ROM ran off the end of its code, count completed frames only
+        best = min(best, time.perf_counter() - start)
+    return frames * CPU_CYCLES_PER_TICK, best
+
+
+def main() -> None:
+    """Print instructions per second for every engine on every bundled ROM."""
+    start = time.perf_counter()
+    dispatch_table()
+    print(f"dispatch table built in {(time.perf_counter() - start) * 1000:.1f} ms\n")
+
+    print(f"{'rom':<14}{'instructions':>14}" + "".join(f"{name:>14}" for name in ENGINES))
+    for rom in sorted(ROM_DIR.glob("*.ch8")):
+        results = [measure(engine, rom) for engine in ENGINES.values()]
+        count, reference = results[0]
+        if not count:
+            print(f"{rom.name:<14}{count:>14}" + f"{'halted':>14}" * len(ENGINES))
+            continue
+        row = f"{rom.name:<14}{count:>14}{count / reference:>14,.0f}"
+        row += "".join(f"{reference / seconds:>13.2f}x" for _, seconds in results[1:])
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
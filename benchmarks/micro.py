@@ -0,0 +1,130 @@
+"""Time one instruction class at a time with small generated ROMs."""
+
+import tempfile
+import time
+from pathlib import Path
+
+import click
+
+from chip8.audio import HeadlessAudio
+from chip8.chip8 import ENGINES
+from chip8.constants import PC_INIT
+from chip8.cpu import CPU
+from chip8.keypad import HeadlessKeypad
+from chip8.ram import RAM
+from chip8.screen import HeadlessScreen
+
+INSTRUCTIONS: int = 20_000  # instructions timed per class and engine
+REPEATS: int = 3  # runs per measurement, the fastest is kept
+UNROLL: int = 32  # copies of the instruction in each loop, so the jump back is 1 in 33
+SCRATCH: int = 0x800  # I points here for stores and loads, well clear of the code
+CALL_DEPTH: int = 15  # subroutines in the CALL/RET chain, one short of a full stack
+
+ALU_OPS: dict[str, int] = {
+    "ld_vx_vy": 0x0,
+    "or": 0x1,
+    "and": 0x2,
+    "xor": 0x3,
+    "add_vx_vy": 0x4,
+    "sub": 0x5,
+    "shr": 0x6,
+    "subn": 0x7,
+    "shl": 0xE,
+}
+
+
+def _assemble(words: list[int]) -> bytes:
+    return b"".join(word.to_bytes(2, "big") for word in words)
+
+
+def _jp(address: int) -> int:
+    return 0x1000 | address
+
+
+def unrolled(setup: list[int], body: list[int]) -> bytes:
+    """Setup words once, then body UNROLL times in a loop that jumps back to itself."""
+    start = PC_INIT + 2 * len(setup)
+    return _assemble([*setup, *body * UNROLL, _jp(start)])
+
+
+def alu(op: int) -> bytes:
+    """8xy_ with one ALU op, cycling x through V0..VE so results feed each other."""
+    body = [0x8000 | x << 8 | (x + 1) % 15 << 4 | op for x in range(15)]
+    return unrolled([0x6001, 0x6102, 0x6203], body)
+
+
+def drw(n: int) -> bytes:
+    """DRW V0, V1 drawing an n row sprite from the font, XOR toggling it on and off."""
+    return unrolled([0x6008, 0x6104, 0xA000], [0xD010 | n])
+
+
+def store_load(op: int) -> bytes:
+    """FX55 or FX65 with x = 15, moving all 16 registers to or from scratch memory."""
+    return unrolled([0xA000 | SCRATCH], [0xF000 | 0xF << 8 | op])
+
+
+def call_chain() -> bytes:
+    """CALL down a chain of CALL_DEPTH subroutines, then RET all the way back out."""
+    entry = PC_INIT + 4
+    words = [0x2000 | entry, _jp(PC_INIT)]
+    for depth in range(1, CALL_DEPTH):
+        words += [0x2000 | (entry + 4 * depth), 0x00EE]
+    words.append(0x00EE)
+    return _assemble(words)
+
+
+def programs() -> dict[str, bytes]:
+    """Every generated ROM, keyed by instruction class."""
+    roms = {f"alu_{name}": alu(op) for name, op in ALU_OPS.items()}
+    roms |= {f"drw_n{n}": drw(n) for n in range(1, 16)}
+    roms["ld_i_v15"] = store_load(0x55)
+    roms["ld_v15_i"] = store_load(0x65)
+    roms["call_ret"] = call_chain()
+    return roms
+
+
+def measure(engine: type[CPU], rom: Path) -> float:
+    """Best nanoseconds per instruction running a ROM for INSTRUCTIONS instructions."""
+    best = float("inf")
+    for _ in range(REPEATS):
+        cpu = engine(RAM(str(rom)), HeadlessScreen(), HeadlessKeypad(), HeadlessAudio(), 0)
+        cpu.run(UNROLL)  # compile and warm up before timing
+        start = time.perf_counter_ns()
+        cpu.run(INSTRUCTIONS)
+        best = min(best, time.perf_counter_ns() - start)
+    return best / INSTRUCTIONS
+
+
+@click.command()
+@click.option(
+    "--engine",
+    "engines",
+    type=click.Choice(list(ENGINES)),
+    multiple=True,
+    default=list(ENGINES),
+    help="Engines to time, repeat for several. Defaults to all of them.",
+)
+@click.option(
+    "--save",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Keep the generated ROMs in this directory.",
+)
+@click.option("--only", default="", help="Only time classes whose name starts with this.")
+def main(*, engines: tuple[str, ...], save: Path | None, only: str) -> None:
+    """Print nanoseconds per instruction for each instruction class on each engine."""
+    with tempfile.TemporaryDirectory() as scratch:
+        directory = save or Path(scratch)
+        directory.mkdir(parents=True, exist_ok=True)
+        click.echo(f"{'class':<14}" + "".join(f"{name + ' ns':>16}" for name in engines))
+        for name, program in programs().items():
+            if not name.startswith(only):
+                continue
+            rom = directory / f"{name}.ch8"
+            rom.write_bytes(program)
+            row = "".join(f"{measure(ENGINES[engine], rom):>16.0f}" for engine in engines)
+            click.echo(f"{name:<14}{row}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""Benchmark suite over the bundled ROMs, with results saved and checked against a baseline."""
+
+import json
+import os
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import click
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # render benchmarks need no real window
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame as pg
+
+from chip8._exceptions import ChipError
+from chip8.audio import HeadlessAudio
+from chip8.chip8 import ENGINES
+from chip8.constants import CPU_CYCLES_PER_TICK, SCREEN_HEIGHT
+from chip8.cpu import CPU
+from chip8.ctypes import Sprite
+from chip8.framebuffer import ROW_MASK
+from chip8.keypad import HeadlessKeypad
+from chip8.ram import RAM
+from chip8.screen import HeadlessScreen, Screen
+from chip8.state import STATE_SIZE
+
+ROM_DIR: Path = Path("roms")
+INSTRUCTIONS: int = 24_000  # instructions per ROM run, 2000 frames at the default rate
+REPEATS: int = 5  # runs per measurement, the fastest is kept
+SCALES: tuple[int, ...] = (1, 5, 10, 20)  # window scales timed for Screen.update
+RENDER_FRAMES: int = 200  # Screen.update calls timed per scale
+STATE_ROUNDS: int = 2000  # snapshot and restore calls timed
+SEED: int = 1  # random seed every ROM runs with
+DEFAULT_THRESHOLD: float = 0.10  # fraction a metric may get worse before it counts as a regression
+
+# Metrics where a smaller number is better, everything else is a rate.
+LOWER_IS_BETTER: tuple[str, ...] = ("_us",)
+
+
+def scripted_keys(frame: int) -> int:
+    """Key mask held on a frame: each key in turn for 10 frames out of every 30."""
+    if frame % 30 >= 10:
+        return 0
+    return 1 << (frame // 30) % 16
+
+
+class CountingScreen(HeadlessScreen):
+    """Headless screen that counts sprite draws."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.draws = 0
+
+    def draw_sprite(self, x: int, y: int, sprite: Sprite) -> bool:
+        """Count the draw, then XOR the sprite on as usual."""
+        self.draws += 1
+        return super().draw_sprite(x, y, sprite)
+
+
+def run_rom(engine: type[CPU], rom: Path) -> dict[str, float]:
+    """Instructions and sprite draws per second running a ROM with scripted input."""
+    best = float("inf")
+    executed = draws = 0
+    for _ in range(REPEATS):
+        screen = CountingScreen()
+        keypad = HeadlessKeypad()
+        cpu = engine(RAM(str(rom)), screen, keypad, HeadlessAudio(), SEED)
+        frame = executed = 0
+        start = time.perf_counter()
+        try:
+            while executed < INSTRUCTIONS:
+                keypad.set_mask(scripted_keys(frame))
+                cpu.cycle()
+                executed += CPU_CYCLES_PER_TICK
+                frame += 1
+        except ChipError:
+            pass  # ROM ran off the end of its code, count completed frames only
+        best = min(best, time.perf_counter() - start)
+        draws = screen.draws
+    if not executed:
+        return {"halted": True}
+    return {"instructions": executed, "ips": executed / best, "drw_per_sec": draws / best}
+
+
+def render_times() -> dict[str, float]:
+    """Microseconds per Screen.update at each scale, for full and single-sprite redraws."""
+    pg.init()
+    results = {}
+    for scale in SCALES:
+        screen = Screen(scale)
+        full = sprite = float("inf")
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            for _ in range(RENDER_FRAMES):
+                screen.frame.damage = [ROW_MASK] * SCREEN_HEIGHT
+                screen.dirty = True
+                screen.update()
+            full = min(full, time.perf_counter() - start)
+            start = time.perf_counter()
+            for frame in range(RENDER_FRAMES):
+                screen.draw_sprite(frame, frame, [0xF0, 0x90, 0xF0])
+                screen.update()
+            sprite = min(sprite, time.perf_counter() - start)
+        results[f"scale_{scale}_full_us"] = full / RENDER_FRAMES * 1e6
+        results[f"scale_{scale}_sprite_us"] = sprite / RENDER_FRAMES * 1e6
+    pg.quit()
+    return results
+
+
+def state_times(engine: type[CPU]) -> dict[str, float]:
+    """Microseconds per snapshot and per restore of a running machine."""
+    cpu = engine(
+        RAM(str(ROM_DIR / "particle.ch8")),
+        HeadlessScreen(),
+        HeadlessKeypad(),
+        HeadlessAudio(),
+        SEED,
+    )
+    cpu.run(1000)
+    slot = bytearray(STATE_SIZE)
+    snapshot = restore = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(STATE_ROUNDS):
+            cpu.snapshot(slot)
+        snapshot = min(snapshot, time.perf_counter() - start)
+        start = time.perf_counter()
+        for _ in range(STATE_ROUNDS):
+            cpu.restore(slot)
+        restore = min(restore, time.perf_counter() - start)
+    return {
+        "snapshot_us": snapshot / STATE_ROUNDS * 1e6,
+        "restore_us": restore / STATE_ROUNDS * 1e6,
+    }
+
+
+def run_suite(engines: list[str]) -> dict[str, Any]:
+    """Run every benchmark and collect the results."""
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "instructions": INSTRUCTIONS,
+        },
+        "roms": {
+            rom.name: {name: run_rom(ENGINES[name], rom) for name in engines}
+            for rom in sorted(ROM_DIR.glob("*.ch8"))
+        },
+        "render": render_times(),
+        "state": {name: state_times(ENGINES[name]) for name in engines},
+    }
+
+
+def flatten(results: dict[str, Any], prefix: str = "") -> dict[str, float]:
+    """Numeric metrics keyed by their dotted path, leaving out run metadata."""
+    metrics = {}
+    for key, value in results.items():
+        if key in {"meta", "instructions", "halted"}:
+            continue
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            metrics.update(flatten(value, f"{path}."))
+        elif isinstance(value, int | float):
+            metrics[path] = float(value)
+    return metrics
+
+
+def compare(
+    results: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[str]:
+    """Describe every metric that got worse than the baseline by more than threshold."""
+    current = flatten(results)
+    regressions = []
+    for name, before in flatten(baseline).items():
+        if name not in current or not before:
+            continue
+        after = current[name]
+        change = after / before - 1
+        if name.endswith(LOWER_IS_BETTER):
+            change = -change
+        if change < -threshold:
+            regressions.append(f"{name}: {before:,.2f} -> {after:,.2f} ({change:+.1%})")
+    return regressions
+
+
+def summary(results: dict[str, Any]) -> str:
+    """Short human readable table of the headline numbers."""
+    lines = [f"{'rom':<16}{'engine':<12}{'ips':>14}{'drw/sec':>12}"]
+    for rom, engines in results["roms"].items():
+        for engine, metrics in engines.items():
+            if metrics.get("halted"):
+                lines.append(f"{rom:<16}{engine:<12}{'halted':>14}")
+                continue
+            lines.append(
+                f"{rom:<16}{engine:<12}{metrics['ips']:>14,.0f}{metrics['drw_per_sec']:>12,.0f}",
+            )
+    lines.append("")
+    lines += [f"{name:<28}{value:>10.1f} us" for name, value in results["render"].items()]
+    lines.append("")
+    for engine, metrics in results["state"].items():
+        lines += [f"{engine + ' ' + name:<28}{value:>10.2f} us" for name, value in metrics.items()]
+    return "\n".join(lines)
+
+
+@click.command()
+@click.option(
+    "--engine",
+    "engines",
+    type=click.Choice(list(ENGINES)),
+    multiple=True,
+    default=list(ENGINES),
+    help="Engines to benchmark, repeat for several. Defaults to all of them.",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    default=None,
+    help="Write the results to a JSON file.",
+)
+@click.option(
+    "--baseline",
+    "-b",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Compare against results saved earlier, exit with an error on a regression.",
+)
+@click.option(
+    "--threshold",
+    default=DEFAULT_THRESHOLD,
+    type=float,
+    help="Fraction a metric may get worse than the baseline before it fails.",
+)
+def main(
+    *,
+    engines: tuple[str, ...],
+    output: Path | None,
+    baseline: Path | None,
+    threshold: float,
+) -> None:
+    """Benchmark every bundled ROM, rendering and save states."""
+    results = run_suite(list(engines))
+    click.echo(summary(results))
+    if output is not None:
+        output.write_text(json.dumps(results, indent=2))
+    if baseline is None:
+        return
+    regressions = compare(results, json.loads(baseline.read_text()), threshold)
+    if regressions:
+        click.echo("\nRegressions against " + str(baseline))
+        click.echo("\n".join(regressions))
+        raise SystemExit(1)
+    click.echo(f"\nNo regressions over {threshold:.0%} against {baseline}")
+
+
+if __name__ == "__main__":
+    main()
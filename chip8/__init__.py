@@ -1 +1,6 @@
 """Chip8 Emulator."""
+
+import os
+
+# pygame prints a banner on stdout when imported, which would corrupt a frame stream piped out.
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
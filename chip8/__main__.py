@@ -1,10 +1,46 @@
+import asyncio
+import json
+import os
+from itertools import islice
+from pathlib import Path
+
 import click
+import pygame as pg
 
-from chip8.chip8 import Chip8
-from chip8.config import DEFAULT_ROM, DEFAULT_SCALE
+from chip8._exceptions import (
+    BatchError,
+    ChipError,
+    LockstepError,
+    MovieError,
+    RomError,
+    StateError,
+    StreamError,
+    TraceError,
+)
+from chip8.aio import AsyncChip8
+from chip8.batch import load_jobs, run_batch
+from chip8.chip8 import ENGINES, Chip8, replay
+from chip8.config import (
+    DEFAULT_BATCH_CYCLES,
+    DEFAULT_FPS,
+    DEFAULT_FRAME_SKIP,
+    DEFAULT_IPS,
+    DEFAULT_REWIND,
+    DEFAULT_ROM,
+    DEFAULT_SCALE,
+)
+from chip8.disasm import disassemble, render_dot, render_text
+from chip8.keypad import Keypad
+from chip8.lockstep import CHECK_INTERVAL, DEFAULT_LOCKSTEP_FRAMES, VECTOR_ENGINE, Lockstep
+from chip8.movie import Movie
+from chip8.profiler import Profile, ProfiledCPU, profiled
+from chip8.romcache import load_image
+from chip8.screen import Screen
+from chip8.stream import open_pipe_reader, open_pipe_writer, serve, stream, view
+from chip8.trace import format_record, query, read_trace
 
 
-@click.command()
+@click.group(invoke_without_command=True)
 @click.option(
     "--rom",
     "-r",
@@ -20,6 +56,399 @@ from chip8.config import DEFAULT_ROM, DEFAULT_SCALE
     is_flag=False,
     help="Scale multiplier for the screen size.",
 )
-def run(rom: str, scale: int) -> None:
+@click.option(
+    "--headless",
+    is_flag=True,
+    default=False,
+    help="Run without a window, audio device or keyboard input.",
+)
+@click.option(
+    "--ips",
+    type=click.IntRange(min=1),
+    default=DEFAULT_IPS,
+    help="Instructions executed per emulated second.",
+)
+@click.option(
+    "--fps",
+    default=DEFAULT_FPS,
+    is_flag=False,
+    help="Cap on frames drawn per second, 0 draws as fast as the display allows.",
+)
+@click.option(
+    "--uncapped",
+    is_flag=True,
+    default=False,
+    help="Run emulated time as fast as the host allows.",
+)
+@click.option(
+    "--turbo",
+    is_flag=True,
+    default=False,
+    help="Run uncapped, draw only some frames and report speed on exit.",
+)
+@click.option(
+    "--frame-skip",
+    type=click.IntRange(min=1),
+    default=DEFAULT_FRAME_SKIP,
+    help="In turbo mode, draw one frame out of this many.",
+)
+@click.option(
+    "--frames",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Stop after this many frames.",
+)
+@click.option(
+    "--engine",
+    type=click.Choice(list(ENGINES)),
+    default="reference",
+    help="CPU execution engine.",
+)
+@click.option(
+    "--rewind",
+    type=click.IntRange(min=0),
+    default=DEFAULT_REWIND,
+    help="Seconds of play kept to step back through by holding backspace, 0 turns it off.",
+)
+@click.option(
+    "--seed",
+    type=click.IntRange(0, 2**64 - 1),
+    default=None,
+    help="Seed for the random number opcode, picked at random if not given.",
+)
+@click.option(
+    "--record",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Save the keys pressed each frame to a movie file for replaying.",
+)
+@click.option(
+    "--replay",
+    "movie",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="Replay a movie file headless at full speed and check where it ends up.",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    default=False,
+    help="Time every instruction and print the hottest opcodes and addresses on exit.",
+)
+@click.option(
+    "--profile-json",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Profile as with --profile, writing the report to a JSON file instead.",
+)
+@click.option(
+    "--skip-idle/--no-skip-idle",
+    default=True,
+    help="Fast-forward through loops that only wait on the delay timer or keypad.",
+)
+@click.option(
+    "--trace",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Record every instruction run to a trace file, compressed if it ends in .gz or .zst.",
+)
+@click.pass_context
+def run(
+    ctx: click.Context,
+    *,
+    rom: str,
+    scale: int,
+    headless: bool,
+    ips: int,
+    fps: int,
+    uncapped: bool,
+    turbo: bool,
+    frame_skip: int,
+    frames: int | None,
+    engine: str,
+    rewind: int,
+    seed: int | None,
+    record: str | None,
+    movie: str | None,
+    profile: bool,
+    profile_json: str | None,
+    skip_idle: bool,
+    trace: str | None,
+) -> None:
     """Run the CHIP-8 emulator."""
-    Chip8(rom, scale).run()
+    if ctx.invoked_subcommand is not None:
+        return
+    if trace and (profile or profile_json):
+        raise click.UsageError("--trace can't be combined with --profile")
+    if movie is not None and (trace or profile or profile_json):
+        raise click.UsageError("--replay can't be combined with --trace or --profile")
+    if movie is not None:
+        try:
+            recorded = Movie.load(movie)
+            chip8 = replay(recorded, rom, ENGINES[engine])
+        except ChipError as e:
+            raise click.ClickException(str(e)) from e
+        if chip8.digest() != recorded.digest:
+            message = f"Replay of {len(recorded)} frames ended in a different state"
+            raise click.ClickException(message)
+        click.echo(f"Replayed {len(recorded)} frames, final state matches")
+        return
+    engine_class = ENGINES[engine]
+    if profile or profile_json:
+        engine_class = profiled(engine_class)
+    try:
+        chip8 = Chip8(
+            rom,
+            scale,
+            headless=headless,
+            ips=ips,
+            fps=fps,
+            uncapped=uncapped,
+            turbo=turbo,
+            frame_skip=frame_skip,
+            engine=engine_class,
+            rewind=rewind,
+            seed=seed,
+            record=record,
+            skip_idle=skip_idle,
+            trace=trace,
+        )
+    except RomError as e:
+        raise click.ClickException(str(e)) from e
+    try:
+        chip8.run(frames)
+    finally:
+        chip8.close()
+        if isinstance(chip8.cpu, ProfiledCPU):
+            _write_profile(chip8.cpu.profile, profile_json)
+
+
+def _write_profile(profile: Profile, path: str | None) -> None:
+    """Print a profile report, or save it as JSON when given a path."""
+    if path is None:
+        click.echo(profile.report())
+        return
+    Path(path).write_text(json.dumps(profile.to_dict(), indent=2))
+
+
+@run.command()
+@click.argument("path", type=click.Path(exists=True, path_type=Path))
+@click.option(
+    "--cycles",
+    default=DEFAULT_BATCH_CYCLES,
+    is_flag=False,
+    help="Instructions each job executes, unless its manifest entry says otherwise.",
+)
+@click.option(
+    "--seed",
+    default=0,
+    is_flag=False,
+    help="Random seed for jobs that don't set their own.",
+)
+@click.option(
+    "--engine",
+    type=click.Choice(list(ENGINES)),
+    default="dispatch",
+    help="CPU execution engine for jobs that don't set their own.",
+)
+@click.option(
+    "--workers",
+    type=int,
+    default=os.cpu_count(),
+    is_flag=False,
+    help="Worker processes, defaults to one per core.",
+)
+def batch(*, path: Path, cycles: int, seed: int, engine: str, workers: int) -> None:
+    """Run every ROM in a directory, or the jobs in a JSON lines manifest.
+
+    Each job runs headless in its own process and prints one JSON line when done.
+    """
+    try:
+        jobs = load_jobs(path, cycles, seed, engine)
+    except BatchError as e:
+        raise click.ClickException(str(e)) from e
+    for result in run_batch(jobs, workers):
+        click.echo(json.dumps(result))
+
+
+@run.command()
+@click.argument("rom", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["text", "dot"]),
+    default="text",
+    help="Annotated assembly, or the control-flow graph as Graphviz DOT.",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    default=None,
+    help="Write to a file instead of the terminal.",
+)
+def disasm(*, rom: Path, output_format: str, output: Path | None) -> None:
+    """Disassemble a ROM, following jumps, calls and skips to tell code from data."""
+    try:
+        program = disassemble(load_image(rom).rom)
+    except RomError as e:
+        raise click.ClickException(str(e)) from e
+    listing = render_text(program) if output_format == "text" else render_dot(program)
+    if output is None:
+        click.echo(listing, nl=False)
+    else:
+        output.write_text(listing)
+
+
+def _parse_address(_ctx: click.Context, _param: click.Parameter, value: str | None) -> int | None:
+    """Read an address given in hex, with or without 0x."""
+    if value is None:
+        return None
+    try:
+        return int(value, 16)
+    except ValueError as e:
+        raise click.BadParameter(f"{value} is not a hex address") from e
+
+
+@run.command(name="trace")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--pc", callback=_parse_address, help="Only instructions at this hex address.")
+@click.option("--opcode", default=None, help="Only instructions whose mnemonic starts with this.")
+@click.option(
+    "--register",
+    type=click.IntRange(0, 15),
+    default=None,
+    help="Only instructions that wrote this V register.",
+)
+@click.option("--start", default=0, is_flag=False, help="Skip this many matching records.")
+@click.option("--limit", type=int, default=None, help="Show at most this many records.")
+def trace_command(
+    *,
+    path: Path,
+    pc: int | None,
+    opcode: str | None,
+    register: int | None,
+    start: int,
+    limit: int | None,
+) -> None:
+    """Print the instructions recorded in a trace file, optionally filtered."""
+    matches = query(read_trace(path), pc=pc, mnemonic=opcode, register=register)
+    stop = None if limit is None else start + limit
+    try:
+        for record in islice(matches, start, stop):
+            click.echo(format_record(record))
+    except TraceError as e:
+        raise click.ClickException(str(e)) from e
+
+
+@run.command(name="lockstep")
+@click.argument("rom", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--engine",
+    "-e",
+    "engines",
+    type=click.Choice([name for name in ENGINES if name != "reference"] + [VECTOR_ENGINE]),
+    multiple=True,
+    help="Engine to check against the reference CPU, repeat for more. Defaults to all but vector.",
+)
+@click.option(
+    "--movie",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="Feed every engine the keys, seed and speed of a recorded movie.",
+)
+@click.option(
+    "--frames",
+    default=DEFAULT_LOCKSTEP_FRAMES,
+    is_flag=False,
+    help="Emulated frames to run without a movie.",
+)
+@click.option("--seed", default=0, is_flag=False, help="Random seed, without a movie.")
+@click.option(
+    "--interval",
+    default=CHECK_INTERVAL,
+    is_flag=False,
+    help="Instructions between state comparisons.",
+)
+def lockstep_command(
+    *,
+    rom: str,
+    engines: tuple[str, ...],
+    movie: str | None,
+    frames: int,
+    seed: int,
+    interval: int,
+) -> None:
+    """Run engines side by side with the reference CPU and report where they first differ."""
+    engines = engines or tuple(name for name in ENGINES if name != "reference")
+    try:
+        recorded = Movie.load(movie) if movie else None
+        checker = Lockstep(
+            rom,
+            engines,
+            movie=recorded,
+            frames=frames,
+            seed=seed,
+            interval=interval,
+        )
+        result = checker.run()
+    except (LockstepError, MovieError, StateError) as e:
+        raise click.ClickException(str(e)) from e
+    if result.divergence is not None:
+        click.echo(result.divergence.report())
+        raise SystemExit(1)
+    ended = f", all faulted with: {result.fault}" if result.fault else ""
+    matched = f"{result.instructions:,} instructions"
+    click.echo(f"{', '.join(engines)} matched the reference CPU for {matched}{ended}")
+
+
+@run.command(name="stream")
+@click.argument("rom", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--socket",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Serve on a unix socket, one machine per viewer, instead of writing to stdout.",
+)
+@click.option(
+    "--frames",
+    type=int,
+    default=None,
+    is_flag=False,
+    help="Stop each machine after a number of frames.",
+)
+def stream_command(*, rom: str, socket: Path | None, frames: int | None) -> None:
+    """Stream a headless machine's screen as compressed frame packets."""
+
+    async def to_stdout() -> None:
+        await stream(AsyncChip8(rom), await open_pipe_writer(), frames)
+
+    asyncio.run(to_stdout() if socket is None else serve(rom, socket, frames))
+
+
+@run.command(name="view")
+@click.option(
+    "--socket",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Connect to a stream on a unix socket instead of reading stdin.",
+)
+@click.option("--scale", "-s", type=int, default=DEFAULT_SCALE, help="Screen scale factor.")
+def view_command(*, socket: Path | None, scale: int) -> None:
+    """Show a frame stream in a window. Press ESC to quit."""
+
+    async def show() -> None:
+        if socket is None:
+            reader = await open_pipe_reader()
+        else:
+            reader, _ = await asyncio.open_unix_connection(socket)
+        await view(reader, Screen(scale), Keypad())
+
+    pg.init()
+    pg.display.set_caption("👾 Chip8 Viewer")
+    try:
+        asyncio.run(show())
+    except StreamError as e:
+        raise click.ClickException(str(e)) from e
+    finally:
+        pg.quit()
@@ -20,3 +20,27 @@ class RomError(ChipError):
 
 class KeypadError(ChipError):
     pass
+
+
+class StateError(ChipError):
+    pass
+
+
+class MovieError(ChipError):
+    pass
+
+
+class StreamError(ChipError):
+    pass
+
+
+class TraceError(ChipError):
+    pass
+
+
+class LockstepError(ChipError):
+    pass
+
+
+class BatchError(ChipError):
+    pass
@@ -0,0 +1,105 @@
+import asyncio
+from dataclasses import dataclass
+
+from chip8._exceptions import ChipError
+from chip8.chip8 import Chip8
+from chip8.config import DEFAULT_IPS
+from chip8.constants import TIMER_RATE
+from chip8.cpu import CPU
+from chip8.dispatch import DispatchCPU
+from chip8.scheduler import MAX_LAG
+
+SUBSCRIBER_BACKLOG: int = 4  # frames a subscriber can fall behind before the oldest are dropped
+
+type FrameQueue = asyncio.Queue[Frame | None]  # None once the machine has stopped
+
+
+@dataclass(frozen=True)
+class Frame:
+    """The screen as it stood after an emulated frame."""
+
+    number: int  # emulated frames run so far
+    pixels: bytes  # packed framebuffer, rows top to bottom, eight pixels per byte
+
+
+class AsyncChip8:
+    """Headless machine run on an asyncio event loop, yielding between frames.
+
+    Key masks put on inputs are applied one per frame, so a press and release
+    queued together still reach the ROM. Whenever the screen changes the new
+    frame is published to every subscriber queue, and a subscriber that falls
+    behind loses its oldest frames rather than holding the machine up. Many
+    machines can share one event loop.
+    """
+
+    def __init__(
+        self,
+        rom: str,
+        *,
+        fps: int = TIMER_RATE,
+        ips: int = DEFAULT_IPS,
+        seed: int | None = None,
+        engine: type[CPU] = DispatchCPU,
+    ) -> None:
+        self.chip8 = Chip8(rom, headless=True, uncapped=True, ips=ips, seed=seed, engine=engine)
+        self.fps = fps  # emulated frames per second of host time, 0 runs flat out
+        self.inputs: asyncio.Queue[int] = asyncio.Queue()
+        self.subscribers: set[FrameQueue] = set()
+        self.frame: Frame | None = None  # last frame published
+        self.running = False
+        self.error: str | None = None  # why the ROM stopped, if it faulted
+
+    def subscribe(self, backlog: int = SUBSCRIBER_BACKLOG) -> FrameQueue:
+        """Queue that receives every new frame, starting with the current screen."""
+        queue: FrameQueue = asyncio.Queue(backlog)
+        if self.frame is not None:
+            queue.put_nowait(self.frame)
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: FrameQueue) -> None:
+        """Stop sending frames to a queue."""
+        self.subscribers.discard(queue)
+
+    def publish(self, frame: Frame | None) -> None:
+        """Hand a frame to every subscriber, dropping their oldest if they're full."""
+        for queue in self.subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(frame)
+
+    def stop(self) -> None:
+        """Finish the run after the current frame."""
+        self.running = False
+
+    async def run(self, frames: int | None = None) -> None:
+        """Run for a number of frames, or until stopped or the ROM faults."""
+        loop = asyncio.get_running_loop()
+        chip8 = self.chip8
+        screen = chip8.screen
+        period = 1 / self.fps if self.fps else 0.0
+        deadline = loop.time()
+        self.running = True
+        try:
+            while self.running and (frames is None or chip8.frames < frames):
+                if not self.inputs.empty():
+                    chip8.keypad.set_mask(self.inputs.get_nowait())
+                chip8.step()
+                chip8.frames += 1
+                if screen.dirty:
+                    screen.update()
+                    self.frame = Frame(chip8.frames, screen.frame.to_bytes())
+                    self.publish(self.frame)
+                if not period:
+                    await asyncio.sleep(0)  # let other machines and clients run
+                    continue
+                deadline += period
+                delay = deadline - loop.time()
+                if delay < -MAX_LAG:
+                    deadline = loop.time()  # too far behind to catch up, carry on from now
+                await asyncio.sleep(max(delay, 0))
+        except ChipError as e:
+            self.error = str(e)
+        finally:
+            self.running = False
+            self.publish(None)
@@ -1,5 +1,7 @@
 from pygame import mixer
 
+from chip8.config import BEEP_SOUND
+
 
 class Audio:
     """Audio processor for the CHIP-8."""
@@ -8,7 +10,7 @@ class Audio:
         self.timer = 0
         self.mute = mute
         mixer.init()
-        self.plays = mixer.Sound("assets/beep.wav")
+        self.plays = mixer.Sound(BEEP_SOUND)
 
     def update(self) -> None:
         """Decrement the sound timer if it's greater than zero."""
@@ -20,3 +22,14 @@ class Audio:
         """Play a sound if the sound timer is greater than zero."""
         if not self.mute:
             self.plays.play()
+
+
+class HeadlessAudio(Audio):
+    """Sound timer without a mixer, for running with no audio device."""
+
+    def __init__(self, mute: bool = True) -> None:
+        self.timer = 0
+        self.mute = mute
+
+    def play(self) -> None:
+        """Nothing to play without a mixer."""
@@ -0,0 +1,118 @@
+import hashlib
+import json
+import multiprocessing
+import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from chip8._exceptions import BatchError, ChipError, MovieError
+from chip8.chip8 import ENGINES, Chip8
+from chip8.config import DEFAULT_BATCH_CYCLES, DEFAULT_IPS
+from chip8.movie import Movie, rom_digest
+from chip8.scheduler import frame_start
+
+
+@dataclass(frozen=True)
+class Job:
+    """One headless run in a batch."""
+
+    rom: str
+    seed: int = 0
+    movie: str | None = None  # input movie fed in one key mask per frame
+    cycles: int = DEFAULT_BATCH_CYCLES  # instructions to execute
+    engine: str = "dispatch"
+
+
+def _machine(job: Job) -> tuple[Chip8, Iterator[int] | None]:
+    """A job's headless machine, and the key masks of its movie if it has one."""
+    movie = Movie.load(job.movie) if job.movie else None
+    if movie is not None and movie.rom != rom_digest(job.rom):
+        raise MovieError(f"Movie was not recorded on {job.rom}")
+    if job.engine not in ENGINES:
+        raise ChipError(f"Unknown engine {job.engine}")
+    seed = movie.seed if movie else job.seed
+    ips = movie.ips if movie else DEFAULT_IPS
+    engine = ENGINES[job.engine]
+    chip8 = Chip8(job.rom, headless=True, uncapped=True, ips=ips, seed=seed, engine=engine)
+    return chip8, movie.frames() if movie else None
+
+
+def run_job(job: Job) -> dict[str, Any]:
+    """Run a job to its cycle budget and summarize where the machine ended up.
+
+    A job that can't start, a missing ROM or a movie of another ROM say, only
+    fills in its error, leaving the machine fields empty.
+    """
+    start = time.perf_counter()
+    chip8 = None
+    error = None
+    try:
+        chip8, masks = _machine(job)
+        scheduler = chip8.scheduler
+        frame = 0
+        while scheduler.executed < job.cycles:
+            if masks is not None:
+                chip8.keypad.set_mask(next(masks, 0))
+            frame += 1
+            end = min(frame_start(frame, scheduler.ips), job.cycles)
+            scheduler.run_for(end - scheduler.executed)
+    except (ChipError, OSError) as e:
+        error = str(e)
+    if chip8 is None:
+        machine: dict[str, Any] = dict.fromkeys(("pc", "i", "v", "framebuffer"))
+        machine["executed"] = 0
+    else:
+        cpu = chip8.cpu
+        machine = {
+            "pc": cpu.pc,
+            "i": cpu.i,
+            "v": list(cpu.v),
+            "framebuffer": hashlib.sha1(cpu.screen.frame.to_bytes()).hexdigest(),  # noqa: S324
+            "executed": chip8.scheduler.executed,
+        }
+    return {
+        **asdict(job),
+        **machine,
+        "seconds": round(time.perf_counter() - start, 6),
+        "error": error,
+    }
+
+
+def load_jobs(path: Path, cycles: int, seed: int, engine: str) -> list[Job]:
+    """Jobs for every ROM in a directory, or read from a JSON lines manifest.
+
+    Manifest lines hold a rom and optionally seed, movie, cycles and engine,
+    with paths relative to the manifest. A line that isn't a job fails the whole
+    manifest, before any job runs.
+    """
+    if path.is_dir():
+        return [Job(str(rom), seed, None, cycles, engine) for rom in sorted(path.glob("*.ch8"))]
+    jobs = []
+    for number, line in enumerate(path.read_text().splitlines(), 1):
+        if not line.strip():
+            continue
+        entry: dict[str, Any] = {"seed": seed, "cycles": cycles, "engine": engine}
+        try:
+            entry.update(json.loads(line))
+            entry["rom"] = str(path.parent / entry["rom"])
+            if entry.get("movie"):
+                entry["movie"] = str(path.parent / entry["movie"])
+            jobs.append(Job(**entry))
+        except KeyError as e:
+            raise BatchError(f"Job on line {number} of {path} has no {e.args[0]}") from e
+        except (TypeError, ValueError) as e:
+            raise BatchError(f"Bad job on line {number} of {path}: {e}") from e
+    return jobs
+
+
+def run_batch(jobs: list[Job], workers: int | None = None) -> Iterator[dict[str, Any]]:
+    """Spread jobs over worker processes, yielding each result as it finishes."""
+    # Spawn fresh workers, forking a process that has loaded SDL can deadlock.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [pool.submit(run_job, job) for job in jobs]
+        for future in as_completed(futures):
+            yield future.result()
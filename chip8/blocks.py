@@ -0,0 +1,197 @@
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from chip8._exceptions import ExecuteError
+from chip8.audio import Audio
+from chip8.constants import MEMORY_SIZE
+from chip8.cpu import CPU
+from chip8.dispatch import STEP, DispatchCPU, dispatch_table
+from chip8.keypad import Keypad
+from chip8.opcodes import opcode_key, opcodes
+from chip8.ram import RAM
+from chip8.screen import Screen
+
+MAX_BLOCK_LENGTH: int = 64  # instructions compiled into a single block
+
+# Straight-line register ops that can be compiled into a block body.
+BODY_TEMPLATES: dict[int, str] = {
+    0x6000: "v[{x}] = {kk}",
+    0x7000: "v[{x}] = (v[{x}] + {kk}) % 256",
+    0x8000: "v[{x}] = v[{y}]",
+    0x8001: "v[{x}] |= v[{y}]",
+    0x8002: "v[{x}] &= v[{y}]",
+    0x8003: "v[{x}] ^= v[{y}]",
+    0x8004: "t = v[{x}] + v[{y}] - 256\nv[15] = t >= 0\nv[{x}] = t % 256",
+    0x8005: "t = v[{x}] - v[{y}]\nv[15] = t >= 0\nv[{x}] = t % 256",
+    0x8006: "v[15] = v[{x}] & 1\nv[{x}] >>= 1",
+    0x8007: "t = v[{y}] - v[{x}]\nv[15] = t >= 0\nv[{x}] = t % 256",
+    0x800E: "v[15] = (v[{x}] & 128) >> 7\nv[{x}] = (v[{x}] << 1) % 256",
+    0xA000: "cpu.i = {addr}",
+    0xF007: "v[{x}] = cpu.delay_timer",
+    0xF015: "cpu.delay_timer = v[{x}]",
+    0xF01E: "cpu.i += v[{x}]",
+    0xF029: "cpu.i = v[{x}] * 5",
+}
+
+# Control flow that ends a block by returning the next program counter.
+EXIT_TEMPLATES: dict[int, str] = {
+    0x00EE: "return cpu.stack.pop() + 2",
+    0x1000: "return {addr}",
+    0x2000: "cpu.stack.append({pc})\nreturn {addr}",
+    0x3000: "return {skip} if v[{x}] == {kk} else {next}",
+    0x4000: "return {skip} if v[{x}] != {kk} else {next}",
+    0x5000: "return {skip} if v[{x}] == v[{y}] else {next}",
+    0x9000: "return {skip} if v[{x}] != v[{y}] else {next}",
+    0xB000: "return {addr} + v[0]",
+    0xE09E: "return {skip} if cpu.keypad.pressed_keys[v[{x}] & 15] else {next}",
+    0xE0A1: "return {next} if cpu.keypad.pressed_keys[v[{x}] & 15] else {skip}",
+}
+
+
+# Opcodes run through their dispatch handler that may rewind the pc or write memory
+# (and so the block itself), so they have to end the block.
+HANDLER_EXITS: set[int] = {0xF00A, 0xF033, 0xF055}
+
+
+@dataclass(frozen=True)
+class Block:
+    """Straight-line run of instructions compiled into one function."""
+
+    start: int  # address of the first instruction
+    end: int  # address just past the last instruction
+    length: int  # number of instructions in the block
+    run: Callable[[CPU], int]  # executes the block and returns the next pc
+    source: str  # generated Python source, kept for debugging
+
+
+def _render(template: str, word: int, pc: int) -> list[str]:
+    """Fill an opcode template with the operands of a raw instruction."""
+    return template.format(
+        x=(word & 0x0F00) >> 8,
+        y=(word & 0x00F0) >> 4,
+        kk=word & 0x00FF,
+        addr=word & 0x0FFF,
+        pc=pc,
+        next=pc + STEP,
+        skip=pc + STEP * 2,
+    ).splitlines()
+
+
+def compile_block(
+    memory: bytearray | memoryview,
+    start: int,
+    limit: int = MAX_BLOCK_LENGTH,
+    *,
+    prologue: Sequence[str] = (),
+    names: Mapping[str, Any] | None = None,
+) -> Block | None:
+    """Compile the basic block starting at an address, None if it cannot start one.
+
+    Prologue lines run before the block's own, with names as their globals.
+    """
+    table = dispatch_table()
+    namespace: dict[str, Any] = dict(names or {})
+    body: list[str] = []
+    pc = start
+    length = 0
+    exit_lines = None
+    while length < limit and pc + 1 < MEMORY_SIZE:
+        word = memory[pc] << 8 | memory[pc + 1]
+        key = opcode_key(word)
+        if key not in opcodes:
+            break  # leave undecodable words to the dispatch engine to report
+        pc += STEP
+        length += 1
+        if key in EXIT_TEMPLATES:
+            exit_lines = _render(EXIT_TEMPLATES[key], word, pc - STEP)
+            break
+        if key in BODY_TEMPLATES:
+            body += _render(BODY_TEMPLATES[key], word, pc - STEP)
+            continue
+        # Screen, memory, sound and random opcodes call their dispatch handler.
+        handler = f"h{len(namespace)}"
+        namespace[handler] = table[word]
+        if key in HANDLER_EXITS:
+            exit_lines = [f"cpu.pc = {pc - STEP}", f"{handler}(cpu)", "return cpu.pc"]
+            break
+        body.append(f"{handler}(cpu)")
+
+    if not length:
+        return None
+
+    lines = [*prologue, "v = cpu.v", *body, *(exit_lines or [f"return {pc}"])]
+    source = "def block(cpu):\n" + "".join(f"    {line}\n" for line in lines)
+    exec(compile(source, f"<block {start:04x}>", "exec"), namespace)  # noqa: S102
+    return Block(start, pc, length, namespace["block"], source)
+
+
+class BlockCPU(DispatchCPU):
+    """Chip8 CPU that runs basic blocks translated into Python functions."""
+
+    def __init__(
+        self,
+        ram: RAM,
+        screen: Screen,
+        keypad: Keypad,
+        audio: Audio,
+        seed: int | None = None,
+    ) -> None:
+        super().__init__(ram, screen, keypad, audio, seed)
+        # Translated blocks keyed by start address. Blocks cut short to fit the end of a
+        # frame's instruction budget are keyed by start | limit << 12 instead.
+        self.blocks: dict[int, Block | None] = {}
+        self.owners: dict[int, set[int]] = {}  # keys of the blocks covering each byte
+        self.low, self.high = MEMORY_SIZE, 0  # extent of all translated code
+        ram.on_write = self.invalidate
+
+    def translate(self, start: int, limit: int = MAX_BLOCK_LENGTH) -> Block | None:
+        """Compile and cache the block starting at an address."""
+        key = start if limit == MAX_BLOCK_LENGTH else start | limit << 12
+        block = self.compile(start, limit)
+        self.blocks[key] = block
+        end = block.end if block else start + STEP
+        self.low, self.high = min(self.low, start), max(self.high, end)
+        for address in range(start, end):
+            self.owners.setdefault(address, set()).add(key)
+        return block
+
+    def compile(self, start: int, limit: int) -> Block | None:
+        """Compile the block starting at an address, without caching it."""
+        return compile_block(self.ram.memory, start, limit)
+
+    def invalidate(self, address: int, length: int = 1) -> None:
+        """Drop every cached block covering a written range."""
+        if address >= self.high or address + length <= self.low:
+            return  # data writes outside any code skip the per-byte lookups
+        owners = self.owners
+        for written in range(address, address + length):
+            for key in owners.pop(written, ()):
+                self.blocks.pop(key, None)
+
+    def restore(self, data: bytes | bytearray | memoryview) -> None:
+        """Resume from a snapshot, dropping blocks translated from the old memory."""
+        super().restore(data)
+        self.blocks.clear()
+        self.owners.clear()
+        self.low, self.high = MEMORY_SIZE, 0
+
+    def run(self, count: int) -> None:
+        """Execute count instructions, a whole block at a time where it fits."""
+        blocks = self.blocks
+        remaining = count
+        while remaining:
+            pc = self.pc
+            block = blocks[pc] if pc in blocks else self.translate(pc)
+            if block is not None and block.length > remaining:
+                key = pc | remaining << 12
+                block = blocks[key] if key in blocks else self.translate(pc, remaining)
+            if block is None:
+                super().run(1)
+                remaining -= 1
+                continue
+            try:
+                self.pc = block.run(self)
+            except Exception as e:
+                raise ExecuteError(f"Execution Error: block {pc:04x} - {e}") from e
+            remaining -= block.length
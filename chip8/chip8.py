@@ -1,12 +1,36 @@
+import hashlib
+import random
+import time
+
 import pygame as pg
 
-from chip8.audio import Audio
-from chip8.config import DEFAULT_ROM, DEFAULT_SCALE
-from chip8.constants import TICK_RATE
+from chip8._exceptions import MovieError
+from chip8.audio import Audio, HeadlessAudio
+from chip8.blocks import BlockCPU
+from chip8.config import (
+    DEFAULT_FPS,
+    DEFAULT_FRAME_SKIP,
+    DEFAULT_IPS,
+    DEFAULT_REWIND,
+    DEFAULT_ROM,
+    DEFAULT_SCALE,
+)
 from chip8.cpu import CPU
-from chip8.keypad import Keypad
+from chip8.dispatch import DispatchCPU
+from chip8.keypad import HeadlessKeypad, Keypad
+from chip8.movie import Movie, rom_digest
+from chip8.profiler import ProfiledCPU
 from chip8.ram import RAM
-from chip8.screen import Screen
+from chip8.rewind import Rewind
+from chip8.scheduler import Scheduler
+from chip8.screen import HeadlessScreen, Screen
+from chip8.trace import TraceWriter, traced
+
+ENGINES: dict[str, type[CPU]] = {
+    "reference": CPU,
+    "dispatch": DispatchCPU,
+    "block": BlockCPU,
+}
 
 
 class Chip8:
@@ -16,24 +40,133 @@ class Chip8:
         self,
         rom: str = DEFAULT_ROM,
         screen_scale: int = DEFAULT_SCALE,
+        headless: bool = False,
+        *,
+        screen: Screen | None = None,
+        keypad: Keypad | None = None,
+        audio: Audio | None = None,
+        ips: int = DEFAULT_IPS,
+        fps: int = DEFAULT_FPS,
+        uncapped: bool = False,
+        turbo: bool = False,
+        frame_skip: int = DEFAULT_FRAME_SKIP,
+        engine: type[CPU] = CPU,
+        rewind: int = DEFAULT_REWIND,
+        seed: int | None = None,
+        record: str | None = None,
+        skip_idle: bool = True,
+        trace: str | None = None,
     ) -> None:
         self.rom = rom
+        self.headless = headless
+        self.fps = fps
+        self.uncapped = uncapped or turbo
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.turbo = turbo  # uncapped, drawing every frame_skip frames and reporting speed
+        self.frame_skip = frame_skip if turbo else 1
+        self.ram = RAM(rom)  # before pygame starts, so a bad ROM leaves nothing to shut down
 
-        pg.init()
-        pg.display.set_caption("👾 Chip8 Emulator")
+        if not headless:
+            pg.init()
+            pg.display.set_caption("👾 Chip8 Emulator")
 
-        self.screen = Screen(screen_scale)
-        self.keypad = Keypad()
-        self.audio = Audio()
-        self.ram = RAM(rom)
-        self.cpu = CPU(self.ram, self.screen, self.keypad, self.audio)
+        # Backends passed in take priority over the pygame or headless defaults.
+        self.screen = screen or (HeadlessScreen if headless else Screen)(screen_scale)
+        self.keypad = keypad or (HeadlessKeypad if headless else Keypad)()
+        self.audio = audio or (HeadlessAudio if headless else Audio)()
+        self.trace = TraceWriter(trace) if trace else None  # every instruction run, for debugging
+        if self.trace is None:
+            self.cpu = engine(self.ram, self.screen, self.keypad, self.audio, self.seed)
+        else:
+            cpu = traced(engine)(self.ram, self.screen, self.keypad, self.audio, self.seed)
+            cpu.trace = self.trace
+            self.cpu = cpu
+        # A movie needs whole emulated frames between key reads, so recording steps
+        # one frame per pass and leaves the pacing to the frame cap. Traces and
+        # profiles shouldn't miss the loops idle skipping would pass over.
+        watched = trace is not None or issubclass(engine, ProfiledCPU)
+        self.scheduler = Scheduler(
+            self.cpu,
+            ips,
+            uncapped=self.uncapped or record is not None,
+            skip_idle=skip_idle and not watched,
+        )
+        self.record = record  # file the input movie is saved to when the run ends
+        self.movie = Movie(self.seed, ips, self.ram.rom.digest) if record else None
+        self.rewind = Rewind(self.cpu, rewind) if rewind else None
         self.clock = pg.time.Clock()
+        self.frames = 0  # passes through the main loop
+        self.drawn = 0  # frames pushed to the screen
+
+    def run(self, frames: int | None = None) -> None:
+        """Run the emulator, for a number of frames or until quit."""
+        start = time.perf_counter()
+        try:
+            while frames is None or self.frames < frames:
+                self.keypad.update()
+                if self.keypad.quit:
+                    break
+                self.step()
+                self.frames += 1
+                if self.frames % self.frame_skip == 0:
+                    self.screen.update()
+                    self.drawn += 1
+                if not self.uncapped:
+                    self.clock.tick(self.fps)  # Limit presented frames, 0 is as fast as possible
+        finally:
+            if self.movie is not None and self.record is not None:
+                self.movie.digest = self.digest()
+                self.movie.save(self.record)
+            if self.turbo:
+                print(self.report(time.perf_counter() - start))
+
+    def step(self) -> None:
+        """Advance one pass of the main loop, or step back one frame while rewinding."""
+        if self.rewind is not None and self.keypad.rewinding and self.rewind.step_back():
+            self.scheduler.resync()  # don't owe the time spent rewinding
+            if self.movie is not None:
+                self.movie.truncate(self.rewind.frames)  # the frame just restored
+            return
+        if self.movie is not None:
+            self.movie.record(self.keypad.mask)
+        self.scheduler.advance()
+        if self.rewind is not None:
+            self.rewind.record()
+
+    def close(self) -> None:
+        """Finish the trace and shut down pygame once the emulator is finished with them."""
+        if self.trace is not None:
+            self.trace.close()
+        if not self.headless:
+            pg.quit()
+
+    def digest(self) -> bytes:
+        """SHA-1 of the whole machine state, for checking two runs ended up alike."""
+        return hashlib.sha1(self.cpu.snapshot()).digest()  # noqa: S324
+
+    def report(self, seconds: float) -> str:
+        """Summarize throughput over a run that took the given seconds."""
+        seconds = max(seconds, 1e-9)
+        skipped = self.scheduler.skipped
+        interpreted = self.scheduler.executed - skipped  # the rest were fast-forwarded
+        return (
+            f"{interpreted:,} instructions interpreted in {seconds:.2f}s: "
+            f"{interpreted / seconds:,.0f} instructions/sec, "
+            f"{self.frames / seconds:,.0f} frames/sec, "
+            f"{self.drawn / seconds:,.0f} drawn/sec, "
+            f"{skipped:,} instructions skipped idle"
+        )
+
 
-    def run(self) -> None:
-        """Run the emulator."""
-        while True:
-            self.keypad.update()
-            self.cpu.cycle()
-            self.audio.update()
-            self.screen.update()
-            self.clock.tick(TICK_RATE)  # Limit to display tick rate
+def replay(movie: Movie, rom: str, engine: type[CPU] = DispatchCPU) -> Chip8:
+    """Feed a movie back through a headless machine as fast as possible."""
+    if rom_digest(rom) != movie.rom:
+        raise MovieError(f"Movie was not recorded on {rom}")
+    chip8 = Chip8(rom, headless=True, uncapped=True, ips=movie.ips, seed=movie.seed, engine=engine)
+    keypad = chip8.keypad
+    scheduler = chip8.scheduler
+    for mask in movie.frames():
+        keypad.set_mask(mask)
+        scheduler.advance()
+    chip8.frames = len(movie)
+    return chip8
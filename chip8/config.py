@@ -1,7 +1,16 @@
+from pathlib import Path
+
+from chip8.constants import CPU_CYCLES_PER_TICK, TICK_RATE
 from chip8.ctypes import Color
 
 DEFAULT_ROM: str = "./roms/particle.ch8"
 DEFAULT_SCALE: int = 10  # Screen size multiplier
+DEFAULT_IPS: int = TICK_RATE * CPU_CYCLES_PER_TICK  # instructions per emulated second
+DEFAULT_FPS: int = TICK_RATE  # cap on presented frames per second, 0 for no cap
+DEFAULT_FRAME_SKIP: int = 10  # turbo mode draws one frame in this many
+DEFAULT_REWIND: int = 0  # seconds of frames kept for rewinding, 0 turns it off
+DEFAULT_BATCH_CYCLES: int = DEFAULT_IPS * 60  # instructions per batch job, a minute of play
+BEEP_SOUND: Path = Path(__file__).resolve().parent.parent / "assets" / "beep.wav"
 
 # Monochrome colors
 BLACK: Color = (0, 0, 0)
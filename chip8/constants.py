@@ -3,17 +3,18 @@ from operator import and_, or_, xor
 
 MEMORY_SIZE: int = 4096  # 4KB of memory
 REGISTER_COUNT: int = 16  # 16 general-purpose registers (V0 to VF)
+STACK_DEPTH: int = 16  # nested subroutine calls kept in a save state
 TICK_RATE: int = 60  # 60Hz refresh rate
+TIMER_RATE: int = 60  # delay and sound timers count down at 60Hz
 CPU_CYCLES_PER_TICK: int = 12  # execute enough opcodes each frame to reduce CLS/DRW tear
 PC_INIT = 0x200  # Program counter starts at 0x200 in memory
 MAX_8BIT = 256  # 8-bit value wraparound
 CARRY_FLAG = 0xF  # VF register index for carry flag
+RNG_MASK: int = 0xFFFFFFFF  # random generator state is 32 bits
 
 # Screen settings
 SCREEN_WIDTH: int = 64
 SCREEN_HEIGHT: int = 32
-PIXEL_WIDTH: int = 8
-PIXEL_HEIGHT: int = 8
 
 # fmt: off
 FONT:list[int] = [
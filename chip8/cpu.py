@@ -1,6 +1,6 @@
 import random
 
-from chip8._exceptions import DecodeError, ExecuteError
+from chip8._exceptions import DecodeError, ExecuteError, StateError
 from chip8.audio import Audio
 from chip8.constants import (
     BITWISE_OPERATORS,
@@ -8,26 +8,35 @@ from chip8.constants import (
     CPU_CYCLES_PER_TICK,
     MAX_8BIT,
     PC_INIT,
-    REGISTER_COUNT,
+    RNG_MASK,
 )
 from chip8.ctypes import OpCode
 from chip8.keypad import Keypad
-from chip8.opcodes import opcodes
+from chip8.opcodes import lookup
 from chip8.ram import RAM
 from chip8.screen import Screen
+from chip8.state import STATE_SIZE, MachineState
 
 
 class CPU:
     """Chip8 CPU."""
 
-    def __init__(self, ram: RAM, screen: Screen, keypad: Keypad, audio: Audio) -> None:
+    def __init__(
+        self,
+        ram: RAM,
+        screen: Screen,
+        keypad: Keypad,
+        audio: Audio,
+        seed: int | None = None,
+    ) -> None:
         self.ram: RAM = ram
         self.keypad: Keypad = keypad
         self.screen: Screen = screen
         self.audio: Audio = audio
         self.opcode: OpCode
 
-        self.v: bytearray = bytearray([0] * REGISTER_COUNT)  # 16 8-Bit Registers - V0 to VF
+        self.state: MachineState = ram.state
+        self.v: memoryview = self.state.registers  # 16 8-Bit Registers - V0 to VF
 
         self.i: int = 0  # 12bit register
         self.x: int = 0  # 4-bit register
@@ -42,6 +51,40 @@ class CPU:
 
         self.pc: int = PC_INIT  # program counter, starts at 0x200 in ram
 
+        # Per-machine xorshift generator for RND, so a seed reproduces a whole run.
+        self.rng: int = 1
+        self.reseed(seed)
+
+    def reseed(self, seed: int | None = None) -> None:
+        """Restart the random generator from a seed, or a random one if not given."""
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.rng = seed % RNG_MASK + 1  # any seed maps to a non-zero 32-bit state
+
+    def random_byte(self) -> int:
+        """Advance the random generator and return its low byte."""
+        state = self.rng
+        state ^= (state << 13) & RNG_MASK
+        state ^= state >> 17
+        state ^= (state << 5) & RNG_MASK
+        self.rng = state
+        return state & 0xFF
+
+    def snapshot(self, into: bytearray | None = None) -> bytearray:
+        """Copy the whole machine state out, into a preallocated buffer if given."""
+        self.state.save(self)
+        if into is None:
+            return self.state.buffer[:]
+        into[:] = self.state.buffer
+        return into
+
+    def restore(self, data: bytes | bytearray | memoryview) -> None:
+        """Resume from a snapshot taken on this or any other machine."""
+        if len(data) != STATE_SIZE:
+            raise StateError(f"Save state must be {STATE_SIZE} bytes, got {len(data)}")
+        self.state.buffer[:] = data
+        self.state.load(self)
+
     def decode(self) -> None:
         """Retreive and decode next opcode."""
         try:
@@ -66,22 +109,24 @@ class CPU:
 
     def opcode_lookup(self, instruction: int) -> OpCode:
         """Convert instruction into an opcode."""
-        op_index = instruction & 0xF000
-        if op_index in [0xE000, 0xF000, 0x0]:
-            op_index = instruction & 0xF0FF
-        elif op_index == 0x8000:
-            op_index = instruction & 0xF00F
-        return opcodes[op_index]
+        return lookup(instruction)
 
     def cycle(self) -> None:
         """Next CPU instruction."""
         self.decrement_timers()
+        self.run(CPU_CYCLES_PER_TICK)
+
+    def run(self, count: int) -> None:
+        """Execute count instructions without touching the timers."""
+        for _ in range(count):
+            self.step()
 
-        for _ in range(CPU_CYCLES_PER_TICK):
-            self.decode()
-            self.execute()
-            if self.opcode.pc_inc:
-                self.pc += self.opcode.length  # move pc to next instruction
+    def step(self) -> None:
+        """Decode and execute a single instruction."""
+        self.decode()
+        self.execute()
+        if self.opcode.pc_inc:
+            self.pc += self.opcode.length  # move pc to next instruction
 
     def decrement_timers(self) -> None:
         """Decrement delay and sound timers."""
@@ -184,18 +229,14 @@ class CPU:
 
     def rnd(self) -> None:
         """Set Vx = random byte AND kk."""
-        self.v[self.x] = random.randint(0, MAX_8BIT - 1) & self.kk
+        self.v[self.x] = self.random_byte() & self.kk
 
     def draw(self) -> None:
         """Display n-byte sprite starting at memory location I at (Vx, Vy), set VF = collision."""
         self.v[CARRY_FLAG] = 0
-        for i in range(self.n):
-            sprite: int = self.ram[self.i + i]
-            for j in range(8):
-                if sprite & 0x80 and self.screen.flip_pixel(self.v[self.x] + j, self.v[self.y] + i):
-                    self.v[CARRY_FLAG] = 1
-
-                sprite <<= 1
+        sprite = self.ram.read(self.i, self.n)
+        if self.screen.draw_sprite(self.v[self.x], self.v[self.y], sprite):
+            self.v[CARRY_FLAG] = 1
 
     def skp_vx(self, equal: bool) -> None:
         """Skip next instruction if key with the value of Vx is pressed/not pressed."""
@@ -228,8 +269,7 @@ class CPU:
 
     def load_vx_i(self) -> None:
         """Read registers V0 through Vx from memory starting at location I."""
-        for i in range(self.x + 1):
-            self.v[i] = self.ram[self.i + i]
+        self.v[: self.x + 1] = self.ram.read(self.i, self.x + 1)
 
     def load_f_vx(self) -> None:
         """Set I = location of sprite for digit Vx."""
@@ -237,12 +277,9 @@ class CPU:
 
     def load_i_vx(self) -> None:
         """Store registers V0 through Vx in memory starting at location I."""
-        for i in range(self.x + 1):
-            self.ram[self.i + i] = self.v[i]
+        self.ram.write(self.i, self.v[: self.x + 1])
 
     def load_bcd(self) -> None:
         """Store BCD representation of Vx in memory locations I, I+1, and I+2."""
         value = self.v[self.x]
-        self.ram[self.i] = value // 100
-        self.ram[self.i + 1] = (value // 10) % 10
-        self.ram[self.i + 2] = value % 10
+        self.ram.write(self.i, bytes((value // 100, value // 10 % 10, value % 10)))
@@ -2,6 +2,8 @@ from dataclasses import dataclass, field
 
 type Color = tuple[int, int, int]
 type ScreenBuffer = list[list[int]]
+type Rect = tuple[int, int, int, int]  # x, y, width, height
+type Sprite = bytes | bytearray | memoryview | list[int]  # sprite rows, one byte each
 
 
 @dataclass(frozen=True)
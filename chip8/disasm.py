@@ -0,0 +1,194 @@
+import re
+from dataclasses import dataclass, field
+
+from chip8.constants import PC_INIT
+from chip8.dispatch import STEP
+from chip8.opcodes import lookup, opcode_key, opcodes
+
+# Opcodes that end a basic block, the edges they leave by are worked out in _successors.
+SKIPS: frozenset[int] = frozenset({0x3000, 0x4000, 0x5000, 0x9000, 0xE09E, 0xE0A1})
+CONTROL: frozenset[int] = SKIPS | {0x00EE, 0x1000, 0x2000, 0xB000}
+OPERANDS = re.compile(r"\b(Vx|VX|Vy|kk|addr|n)\b")
+DATA_LABEL: str = "DB"
+
+
+def format_instruction(word: int) -> str:
+    """Mnemonic for an instruction word with its operands filled in."""
+    key = opcode_key(word)
+    if key not in opcodes:
+        return f"{DATA_LABEL} 0x{word >> 8:02x}, 0x{word & 0xFF:02x}"
+    values = {
+        "Vx": f"V{word >> 8 & 0xF:X}",
+        "VX": f"V{word >> 8 & 0xF:X}",
+        "Vy": f"V{word >> 4 & 0xF:X}",
+        "kk": f"0x{word & 0xFF:02x}",
+        "addr": f"0x{word & 0xFFF:03x}",
+        "n": str(word & 0xF),
+    }
+    return OPERANDS.sub(lambda match: values[match[1]], lookup(word).label)
+
+
+@dataclass(frozen=True)
+class Instruction:
+    """One decoded instruction reached by following control flow."""
+
+    address: int
+    word: int
+    text: str  # mnemonic with operands
+    successors: tuple[tuple[int, str], ...]  # (address, edge kind) pairs control can go to
+
+
+@dataclass
+class BasicBlock:
+    """Run of instructions entered only at the top and left only at the bottom."""
+
+    start: int
+    instructions: list[Instruction] = field(default_factory=list)
+
+    @property
+    def end(self) -> int:
+        """Address just past the last instruction."""
+        return self.instructions[-1].address + STEP
+
+    @property
+    def successors(self) -> tuple[tuple[int, str], ...]:
+        """Edges out of the block, from its last instruction."""
+        return self.instructions[-1].successors
+
+
+@dataclass
+class Program:
+    """Code and data recovered from a ROM, with its control-flow graph."""
+
+    rom: bytes
+    instructions: dict[int, Instruction]  # keyed by address
+    blocks: dict[int, BasicBlock]  # keyed by start address
+    data_refs: set[int]  # addresses loaded into I that aren't code, most likely sprites
+    indirect: set[int]  # JP V0 sites whose targets can't be known statically
+    invalid: set[int]  # addresses control reaches that don't decode
+
+    @property
+    def end(self) -> int:
+        """Address just past the last ROM byte."""
+        return PC_INIT + len(self.rom)
+
+    def code_mask(self) -> bytearray:
+        """One byte per ROM byte, set where the byte is part of an instruction."""
+        mask = bytearray(len(self.rom))
+        for address in self.instructions:
+            mask[address - PC_INIT : address - PC_INIT + STEP] = b"\x01\x01"
+        return mask[: len(self.rom)]
+
+
+def _successors(address: int, word: int) -> tuple[tuple[int, str], ...]:
+    key = opcode_key(word)
+    target = word & 0xFFF
+    following = address + STEP
+    if key in {0x00EE, 0xB000}:
+        return ()
+    if key == 0x1000:
+        return ((target, "jump"),)
+    if key == 0x2000:
+        return (target, "call"), (following, "return")
+    if key in SKIPS:
+        return (following, "next"), (following + STEP, "skip")
+    return ((following, "next"),)
+
+
+def disassemble(rom: bytes, entry: int = PC_INIT) -> Program:
+    """Follow control flow from the entry point, separating code from data."""
+    end = PC_INIT + len(rom)
+    instructions: dict[int, Instruction] = {}
+    data_refs: set[int] = set()
+    indirect: set[int] = set()
+    invalid: set[int] = set()
+    pending = [entry]
+    while pending:
+        address = pending.pop()
+        if address in instructions or address in invalid:
+            continue
+        if not PC_INIT <= address < end - 1:
+            continue  # outside the ROM, nothing to decode
+        offset = address - PC_INIT
+        word = rom[offset] << 8 | rom[offset + 1]
+        key = opcode_key(word)
+        if key not in opcodes:
+            invalid.add(address)
+            continue
+        successors = _successors(address, word)
+        instructions[address] = Instruction(address, word, format_instruction(word), successors)
+        if key == 0xA000:
+            data_refs.add(word & 0xFFF)
+        elif key == 0xB000:
+            indirect.add(address)
+        pending += [target for target, _ in successors]
+    data_refs -= instructions.keys()
+    return Program(rom, instructions, _blocks(instructions, entry), data_refs, indirect, invalid)
+
+
+def _blocks(instructions: dict[int, Instruction], entry: int) -> dict[int, BasicBlock]:
+    leaders = {entry}
+    for instruction in instructions.values():
+        if opcode_key(instruction.word) in CONTROL:
+            leaders.update(target for target, _ in instruction.successors)
+    leaders &= instructions.keys()
+    blocks = {}
+    for start in sorted(leaders):
+        block = BasicBlock(start)
+        address = start
+        while True:
+            instruction = instructions[address]
+            block.instructions.append(instruction)
+            address += STEP
+            if (
+                opcode_key(instruction.word) in CONTROL
+                or address in leaders
+                or address not in instructions
+            ):
+                break
+        blocks[start] = block
+    return blocks
+
+
+def _sprite_row(byte: int) -> str:
+    return f"{byte:08b}".replace("0", ".").replace("1", "#")
+
+
+def render_text(program: Program) -> str:
+    """Annotated assembly listing, code by block and data bytes drawn as sprite rows."""
+    lines = []
+    address = PC_INIT
+    while address < program.end:
+        if address in program.blocks:
+            block = program.blocks[address]
+            exits = ", ".join(f"{kind} {target:03x}" for target, kind in block.successors)
+            lines += ["", f"L{address:03x}:" + (f"  ; -> {exits}" if exits else "")]
+        if address in program.instructions:
+            instruction = program.instructions[address]
+            note = "  ; target unknown" if address in program.indirect else ""
+            lines.append(f"  {address:03x}:  {instruction.word:04x}  {instruction.text}{note}")
+            address += STEP
+            continue
+        if address in program.data_refs:
+            lines += ["", f"D{address:03x}:"]
+        byte = program.rom[address - PC_INIT]
+        text = f"{DATA_LABEL} 0x{byte:02x}"
+        lines.append(f"  {address:03x}:  {byte:02x}    {text}  ; {_sprite_row(byte)}")
+        address += 1
+    return "\n".join(lines).lstrip("\n") + "\n"
+
+
+def render_dot(program: Program) -> str:
+    """Graphviz source for the control-flow graph, one node per basic block."""
+    lines = ["digraph cfg {", '  node [shape=box fontname="monospace"];']
+    for start, block in program.blocks.items():
+        body = "".join(f"{i.address:03x}: {i.text}\\l" for i in block.instructions)
+        lines.append(f'  b{start:03x} [label="{body}"];')
+    for start, block in program.blocks.items():
+        lines += [
+            f'  b{start:03x} -> b{target:03x} [label="{kind}"];'
+            for target, kind in block.successors
+            if target in program.blocks
+        ]
+    lines.append("}")
+    return "\n".join(lines) + "\n"
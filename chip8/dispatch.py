@@ -0,0 +1,376 @@
+from collections.abc import Callable
+from functools import cache
+
+from chip8._exceptions import ChipError, DecodeError, ExecuteError
+from chip8.audio import Audio
+from chip8.constants import BITWISE_OPERATORS, CARRY_FLAG, MAX_8BIT
+from chip8.cpu import CPU
+from chip8.ctypes import OpCode
+from chip8.keypad import Keypad
+from chip8.opcodes import opcode_key, opcodes
+from chip8.ram import RAM
+from chip8.screen import Screen
+
+type Handler = Callable[[CPU], None]  # executes one instruction and advances the pc
+type HandlerFactory = Callable[[int], Handler]  # builds a handler from a raw instruction
+
+INSTRUCTION_COUNT: int = 0x10000  # every possible 16-bit instruction word
+STEP: int = 2  # bytes per instruction
+
+
+def _x(word: int) -> int:
+    return (word & 0x0F00) >> 8
+
+
+def _y(word: int) -> int:
+    return (word & 0x00F0) >> 4
+
+
+def _ret(_word: int) -> Handler:
+    def op(cpu: CPU) -> None:
+        cpu.pc = cpu.stack.pop() + STEP
+
+    return op
+
+
+def _jmp(word: int) -> Handler:
+    addr = word & 0x0FFF
+
+    def op(cpu: CPU) -> None:
+        cpu.pc = addr
+
+    return op
+
+
+def _call(word: int) -> Handler:
+    addr = word & 0x0FFF
+
+    def op(cpu: CPU) -> None:
+        cpu.stack.append(cpu.pc)
+        cpu.pc = addr
+
+    return op
+
+
+def _se_vx(word: int) -> Handler:
+    x, kk = _x(word), word & 0xFF
+
+    def op(cpu: CPU) -> None:
+        cpu.pc += STEP * 2 if cpu.v[x] == kk else STEP
+
+    return op
+
+
+def _sne_vx(word: int) -> Handler:
+    x, kk = _x(word), word & 0xFF
+
+    def op(cpu: CPU) -> None:
+        cpu.pc += STEP * 2 if cpu.v[x] != kk else STEP
+
+    return op
+
+
+def _se_vx_vy(word: int) -> Handler:
+    x, y = _x(word), _y(word)
+
+    def op(cpu: CPU) -> None:
+        v = cpu.v
+        cpu.pc += STEP * 2 if v[x] == v[y] else STEP
+
+    return op
+
+
+def _sne_vx_vy(word: int) -> Handler:
+    x, y = _x(word), _y(word)
+
+    def op(cpu: CPU) -> None:
+        v = cpu.v
+        cpu.pc += STEP * 2 if v[x] != v[y] else STEP
+
+    return op
+
+
+def _load_vx(word: int) -> Handler:
+    x, kk = _x(word), word & 0xFF
+
+    def op(cpu: CPU) -> None:
+        cpu.v[x] = kk
+        cpu.pc += STEP
+
+    return op
+
+
+def _add_vx_kk(word: int) -> Handler:
+    x, kk = _x(word), word & 0xFF
+
+    def op(cpu: CPU) -> None:
+        v = cpu.v
+        v[x] = (v[x] + kk) % MAX_8BIT
+        cpu.pc += STEP
+
+    return op
+
+
+def _set_vx_vy(word: int) -> Handler:
+    x, y = _x(word), _y(word)
+
+    def op(cpu: CPU) -> None:
+        v = cpu.v
+        v[x] = v[y]
+        cpu.pc += STEP
+
+    return op
+
+
+def _bitwise(symbol: str) -> HandlerFactory:
+    operation = BITWISE_OPERATORS[symbol]
+
+    def factory(word: int) -> Handler:
+        x, y = _x(word), _y(word)
+
+        def op(cpu: CPU) -> None:
+            v = cpu.v
+            v[x] = operation(v[x], v[y])
+            cpu.pc += STEP
+
+        return op
+
+    return factory
+
+
+def _add_vx_vy(word: int) -> Handler:
+    x, y = _x(word), _y(word)
+
+    def op(cpu: CPU) -> None:
+        v = cpu.v
+        value = v[x] + v[y] - MAX_8BIT
+        v[CARRY_FLAG] = value >= 0
+        v[x] = value % MAX_8BIT
+        cpu.pc += STEP
+
+    return op
+
+
+def _sub_vx_vy(word: int) -> Handler:
+    x, y = _x(word), _y(word)
+
+    def op(cpu: CPU) -> None:
+        v = cpu.v
+        value = v[x] - v[y]
+        v[CARRY_FLAG] = value >= 0
+        v[x] = value % MAX_8BIT
+        cpu.pc += STEP
+
+    return op
+
+
+def _subn_vx_vy(word: int) -> Handler:
+    x, y = _x(word), _y(word)
+
+    def op(cpu: CPU) -> None:
+        v = cpu.v
+        value = v[y] - v[x]
+        v[CARRY_FLAG] = value >= 0
+        v[x] = value % MAX_8BIT
+        cpu.pc += STEP
+
+    return op
+
+
+def _shr_vx(word: int) -> Handler:
+    x = _x(word)
+
+    def op(cpu: CPU) -> None:
+        v = cpu.v
+        v[CARRY_FLAG] = v[x] & 0x1
+        v[x] >>= 1
+        cpu.pc += STEP
+
+    return op
+
+
+def _shl_vx(word: int) -> Handler:
+    x = _x(word)
+
+    def op(cpu: CPU) -> None:
+        v = cpu.v
+        v[CARRY_FLAG] = (v[x] & 0x80) >> 7
+        v[x] = (v[x] << 1) % MAX_8BIT
+        cpu.pc += STEP
+
+    return op
+
+
+def _load_i(word: int) -> Handler:
+    addr = word & 0x0FFF
+
+    def op(cpu: CPU) -> None:
+        cpu.i = addr
+        cpu.pc += STEP
+
+    return op
+
+
+def _jmp_v0_addr(word: int) -> Handler:
+    addr = word & 0x0FFF
+
+    def op(cpu: CPU) -> None:
+        cpu.pc = addr + cpu.v[0]
+
+    return op
+
+
+def _skp_vx(equal: bool) -> HandlerFactory:
+    def factory(word: int) -> Handler:
+        x = _x(word)
+
+        def op(cpu: CPU) -> None:
+            pressed = cpu.keypad.pressed_keys[cpu.v[x] & 0xF] == equal
+            cpu.pc += STEP * 2 if pressed else STEP
+
+        return op
+
+    return factory
+
+
+def _load_vx_dt(word: int) -> Handler:
+    x = _x(word)
+
+    def op(cpu: CPU) -> None:
+        cpu.v[x] = cpu.delay_timer
+        cpu.pc += STEP
+
+    return op
+
+
+def _load_dt_vx(word: int) -> Handler:
+    x = _x(word)
+
+    def op(cpu: CPU) -> None:
+        cpu.delay_timer = cpu.v[x]
+        cpu.pc += STEP
+
+    return op
+
+
+def _add_i_vx(word: int) -> Handler:
+    x = _x(word)
+
+    def op(cpu: CPU) -> None:
+        cpu.i += cpu.v[x]
+        cpu.pc += STEP
+
+    return op
+
+
+def _load_f_vx(word: int) -> Handler:
+    x = _x(word)
+
+    def op(cpu: CPU) -> None:
+        cpu.i = cpu.v[x] * 5
+        cpu.pc += STEP
+
+    return op
+
+
+# Register and control-flow opcodes get specialised handlers. Anything missing here
+# (screen, memory, sound, random and wait opcodes) is delegated to the CPU method.
+FACTORIES: dict[int, HandlerFactory] = {
+    0x00EE: _ret,
+    0x1000: _jmp,
+    0x2000: _call,
+    0x3000: _se_vx,
+    0x4000: _sne_vx,
+    0x5000: _se_vx_vy,
+    0x6000: _load_vx,
+    0x7000: _add_vx_kk,
+    0x8000: _set_vx_vy,
+    0x8001: _bitwise("|"),
+    0x8002: _bitwise("&"),
+    0x8003: _bitwise("^"),
+    0x8004: _add_vx_vy,
+    0x8005: _sub_vx_vy,
+    0x8006: _shr_vx,
+    0x8007: _subn_vx_vy,
+    0x800E: _shl_vx,
+    0x9000: _sne_vx_vy,
+    0xA000: _load_i,
+    0xB000: _jmp_v0_addr,
+    0xE09E: _skp_vx(True),
+    0xE0A1: _skp_vx(False),
+    0xF007: _load_vx_dt,
+    0xF015: _load_dt_vx,
+    0xF01E: _add_i_vx,
+    0xF029: _load_f_vx,
+}
+
+
+def _delegate(word: int, opcode: OpCode) -> Handler:
+    """Run the reference CPU method with the operands already decoded."""
+    method = getattr(CPU, opcode.call)
+    args = opcode.args
+    x, y, n, addr, kk = _x(word), _y(word), word & 0x000F, word & 0x0FFF, word & 0x00FF
+    advance = opcode.length if opcode.pc_inc else 0
+
+    def op(cpu: CPU) -> None:
+        cpu.x, cpu.y, cpu.n, cpu.addr, cpu.kk = x, y, n, addr, kk
+        cpu.opcode = opcode
+        method(cpu, *args)
+        cpu.pc += advance
+
+    return op
+
+
+def _invalid(word: int) -> Handler:
+    def op(_cpu: CPU) -> None:
+        raise DecodeError(f"Unable to decode opcode: {word}")
+
+    return op
+
+
+def build_handler(word: int) -> Handler:
+    """Build the handler for a single raw instruction word."""
+    key = opcode_key(word)
+    if key not in opcodes:
+        return _invalid(word)
+    if key in FACTORIES:
+        return FACTORIES[key](word)
+    return _delegate(word, opcodes[key])
+
+
+@cache
+def dispatch_table() -> tuple[Handler, ...]:
+    """Build the handler table for every instruction word, once per process."""
+    return tuple(build_handler(word) for word in range(INSTRUCTION_COUNT))
+
+
+class DispatchCPU(CPU):
+    """Chip8 CPU that executes through a pre-decoded instruction table."""
+
+    def __init__(
+        self,
+        ram: RAM,
+        screen: Screen,
+        keypad: Keypad,
+        audio: Audio,
+        seed: int | None = None,
+    ) -> None:
+        super().__init__(ram, screen, keypad, audio, seed)
+        self.table: tuple[Handler, ...] = dispatch_table()
+
+    def step(self) -> None:
+        """Fetch and execute a single instruction."""
+        self.run(1)
+
+    def run(self, count: int) -> None:
+        """Execute count instructions without touching the timers."""
+        memory = self.ram.memory
+        table = self.table
+        try:
+            for _ in range(count):
+                pc = self.pc
+                table[memory[pc] << 8 | memory[pc + 1]](self)
+        except ChipError:
+            raise
+        except Exception as e:
+            raise ExecuteError(f"Execution Error: {self.pc:04x} - {e}") from e
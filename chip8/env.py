@@ -0,0 +1,146 @@
+from collections.abc import Callable, Sequence
+from typing import Any
+
+import numpy as np
+
+from chip8._exceptions import ChipError
+from chip8.audio import HeadlessAudio
+from chip8.config import DEFAULT_IPS
+from chip8.constants import REGISTER_COUNT, SCREEN_HEIGHT, SCREEN_WIDTH
+from chip8.cpu import CPU
+from chip8.dispatch import DispatchCPU
+from chip8.keypad import HeadlessKeypad
+from chip8.ram import RAM
+from chip8.scheduler import Scheduler
+from chip8.screen import HeadlessScreen
+
+type RewardFn = Callable[[RAM], float]  # reads the reward out of memory after each step
+type DoneFn = Callable[[RAM], bool]  # reads whether the episode is over out of memory
+type StepResult = tuple[np.ndarray, float, bool, dict[str, Any]]
+
+DEFAULT_ENV_FRAME_SKIP: int = 4  # emulated frames each action is held for
+OBSERVATION_SHAPE: tuple[int, int] = (SCREEN_HEIGHT, SCREEN_WIDTH)
+# Action n holds the keys in mask n: nothing, then each key on its own.
+DEFAULT_ACTIONS: tuple[int, ...] = (0, *(1 << key for key in range(REGISTER_COUNT)))
+# Eight pixels for every possible framebuffer byte, most significant bit first.
+BYTE_PIXELS: np.ndarray = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1)
+
+
+def _no_reward(_ram: RAM) -> float:
+    return 0.0
+
+
+class Chip8Env:
+    """Gym-style environment around one headless machine.
+
+    Each step holds the keys of the chosen action for frame_skip emulated
+    frames, then reports the screen, a reward and whether the episode ended.
+    The observation array is reused between steps and updated in place, so
+    copy it if an earlier frame needs keeping.
+    """
+
+    def __init__(
+        self,
+        rom: str,
+        *,
+        reward: RewardFn = _no_reward,
+        done: DoneFn | None = None,
+        frame_skip: int = DEFAULT_ENV_FRAME_SKIP,
+        actions: Sequence[int] = DEFAULT_ACTIONS,
+        max_steps: int | None = None,
+        ips: int = DEFAULT_IPS,
+        engine: type[CPU] = DispatchCPU,
+        out: np.ndarray | None = None,
+    ) -> None:
+        self.reward = reward
+        self.done = done
+        self.frame_skip = frame_skip
+        self.actions = tuple(actions)
+        self.max_steps = max_steps
+        self.ips = ips
+        self.ram = RAM(rom)
+        self.screen = HeadlessScreen()
+        self.keypad = HeadlessKeypad()
+        self.cpu = engine(self.ram, self.screen, self.keypad, HeadlessAudio(), 0)
+        self.initial = self.cpu.snapshot()  # power-on state every episode starts from
+        self.scheduler = Scheduler(self.cpu, ips, uncapped=True)
+        # Observation pixels, one byte each. Written through a (256, 8) view of the
+        # same memory so a frame unpacks with one table lookup.
+        self.observation = np.zeros(OBSERVATION_SHAPE, dtype=np.uint8) if out is None else out
+        self._pixels = self.observation.reshape(-1, 8)
+        self.steps = 0
+
+    @property
+    def action_count(self) -> int:
+        """Number of distinct actions step accepts."""
+        return len(self.actions)
+
+    def observe(self) -> np.ndarray:
+        """Unpack the framebuffer into the observation array."""
+        packed = np.frombuffer(self.screen.frame.to_bytes(), dtype=np.uint8)
+        np.take(BYTE_PIXELS, packed, axis=0, out=self._pixels)
+        return self.observation
+
+    def reset(self, seed: int | None = None) -> np.ndarray:
+        """Start a new episode from power-on, reseeding the random generator if given a seed."""
+        rng = self.cpu.rng
+        self.cpu.restore(self.initial)
+        if seed is None:
+            self.cpu.rng = rng  # carry on the generator rather than replaying the last episode
+        else:
+            self.cpu.reseed(seed)
+        self.keypad.set_mask(0)
+        self.scheduler = Scheduler(self.cpu, self.ips, uncapped=True)
+        self.steps = 0
+        return self.observe()
+
+    def step(self, action: int) -> StepResult:
+        """Hold an action's keys for frame_skip frames, return (obs, reward, done, info)."""
+        self.keypad.set_mask(self.actions[action])
+        info: dict[str, Any] = {}
+        halted = False
+        try:
+            for _ in range(self.frame_skip):
+                self.scheduler.advance()
+        except ChipError as e:
+            halted = True
+            info["error"] = str(e)
+        self.steps += 1
+        done = halted or (self.done is not None and self.done(self.ram))
+        if self.max_steps is not None and self.steps >= self.max_steps:
+            done = True
+            info["truncated"] = True
+        return self.observe(), self.reward(self.ram), done, info
+
+
+class VectorEnv:
+    """Several Chip8Env copies stepped together, observations stacked in one array.
+
+    Each sub-environment writes its screen straight into its row of the shared
+    observation array, and sub-environments that finish are reset on the spot.
+    The last screen of a finished episode is kept as a copy in its info under
+    terminal_observation, its row already showing the next episode.
+    """
+
+    def __init__(self, rom: str, count: int, **kwargs: Any) -> None:  # noqa: ANN401
+        self.observations = np.zeros((count, *OBSERVATION_SHAPE), dtype=np.uint8)
+        self.envs = [Chip8Env(rom, out=self.observations[k], **kwargs) for k in range(count)]
+        self.rewards = np.zeros(count, dtype=np.float64)
+        self.dones = np.zeros(count, dtype=bool)
+
+    def reset(self, seeds: Sequence[int] | None = None) -> np.ndarray:
+        """Reset every sub-environment, seeding each from seeds if given."""
+        for k, env in enumerate(self.envs):
+            env.reset(None if seeds is None else seeds[k])
+        return self.observations
+
+    def step(self, actions: Sequence[int]) -> tuple[np.ndarray, np.ndarray, np.ndarray, list]:
+        """Step each sub-environment with its action, return stacked results."""
+        infos = []
+        for k, (env, action) in enumerate(zip(self.envs, actions, strict=True)):
+            observation, self.rewards[k], self.dones[k], info = env.step(action)
+            if self.dones[k]:
+                info["terminal_observation"] = observation.copy()
+                env.reset()
+            infos.append(info)
+        return self.observations, self.rewards, self.dones, infos
@@ -0,0 +1,88 @@
+from chip8.constants import SCREEN_HEIGHT, SCREEN_WIDTH
+from chip8.ctypes import Rect, ScreenBuffer, Sprite
+
+ROW_MASK: int = (1 << SCREEN_WIDTH) - 1  # all pixels in a row set
+ROW_BYTES: int = SCREEN_WIDTH // 8  # bytes per packed row
+SPRITE_SHIFT: int = SCREEN_WIDTH - 8  # moves a sprite byte to the leftmost column
+
+
+class FrameBuffer:
+    """Monochrome framebuffer with each row packed into one integer.
+
+    Column 0 is the most significant bit of a row, so a sprite byte lines up
+    with the screen the same way it reads in memory.
+    """
+
+    def __init__(self) -> None:
+        self.rows: list[int] = [0] * SCREEN_HEIGHT
+        self.damage: list[int] = [ROW_MASK] * SCREEN_HEIGHT  # changed pixels since last present
+
+    def clear(self) -> None:
+        """Blank every row."""
+        damage = self.damage
+        for y, row in enumerate(self.rows):
+            damage[y] |= row
+        self.rows = [0] * SCREEN_HEIGHT
+
+    def load(self, rows: list[int] | tuple[int, ...]) -> None:
+        """Replace every row, damaging only the pixels that change."""
+        damage = self.damage
+        for y, (old, new) in enumerate(zip(self.rows, rows, strict=True)):
+            damage[y] |= old ^ new
+        self.rows[:] = rows
+
+    def pixel(self, x: int, y: int) -> int:
+        """Read the pixel at (x, y) coordinates."""
+        return (self.rows[y] >> (SCREEN_WIDTH - 1 - x)) & 1
+
+    def flip_pixel(self, x: int, y: int) -> bool:
+        """Flip pixel at (x, y) coordinates, return True if it was erased."""
+        x %= SCREEN_WIDTH
+        y %= SCREEN_HEIGHT
+        bit = 1 << (SCREEN_WIDTH - 1 - x)
+        self.rows[y] ^= bit
+        self.damage[y] |= bit
+        return not self.rows[y] & bit
+
+    def draw_sprite(self, x: int, y: int, sprite: Sprite) -> bool:
+        """XOR sprite rows onto the screen at (x, y), return True on any collision."""
+        x %= SCREEN_WIDTH
+        y %= SCREEN_HEIGHT
+        rows = self.rows
+        damage = self.damage
+        collision = 0
+        for offset, byte in enumerate(sprite):
+            # rotate the byte into place so columns past the right edge wrap around
+            bits = byte << SPRITE_SHIFT
+            bits = (bits >> x | bits << (SCREEN_WIDTH - x)) & ROW_MASK
+            row = (y + offset) % SCREEN_HEIGHT
+            collision |= rows[row] & bits
+            rows[row] ^= bits
+            damage[row] |= bits
+        return collision != 0
+
+    def take_damage(self) -> list[Rect]:
+        """Return (x, y, width, height) boxes around changed rows and reset the damage."""
+        rects: list[Rect] = []
+        top = mask = 0
+        for y, changed in enumerate([*self.damage, 0]):  # trailing 0 closes the last run
+            if changed and not mask:
+                top = y
+            elif mask and not changed:
+                left = SCREEN_WIDTH - mask.bit_length()
+                right = SCREEN_WIDTH - (mask & -mask).bit_length()
+                rects.append((left, top, right - left + 1, y - top))
+                mask = 0
+            mask |= changed
+        self.damage = [0] * SCREEN_HEIGHT
+        return rects
+
+    def to_bytes(self) -> bytes:
+        """Pack the rows top to bottom, eight pixels per byte."""
+        return b"".join(row.to_bytes(ROW_BYTES, "big") for row in self.rows)
+
+    def to_lists(self) -> ScreenBuffer:
+        """Unpack the rows into one list of pixels per row."""
+        return [
+            [(row >> (SCREEN_WIDTH - 1 - x)) & 1 for x in range(SCREEN_WIDTH)] for row in self.rows
+        ]
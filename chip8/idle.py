@@ -0,0 +1,109 @@
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+from chip8.constants import MEMORY_SIZE
+from chip8.cpu import CPU
+from chip8.dispatch import STEP
+from chip8.opcodes import opcode_key
+
+IDLE_LOOP_LENGTH: int = 8  # longest loop looked for, in instructions
+
+
+@dataclass(frozen=True)
+class IdleLoop:
+    """A loop the CPU will keep spinning in until a timer tick or a key press."""
+
+    length: int  # instructions per trip around the loop
+    registers: bytes  # V registers once the loop has been round once
+    timed: bool  # polls a running delay timer, so may leave on the next tick
+
+
+def _x(word: int) -> int:
+    return word >> 8 & 0xF
+
+
+def _y(word: int) -> int:
+    return word >> 4 & 0xF
+
+
+type SkipTest = Callable[[bytearray, int, Sequence[int]], bool]
+
+# Whether each skip opcode skips, given the registers, the instruction and the keys.
+SKIP_TESTS: dict[int, SkipTest] = {
+    0x3000: lambda v, word, _keys: v[_x(word)] == word & 0xFF,
+    0x4000: lambda v, word, _keys: v[_x(word)] != word & 0xFF,
+    0x5000: lambda v, word, _keys: v[_x(word)] == v[_y(word)],
+    0x9000: lambda v, word, _keys: v[_x(word)] != v[_y(word)],
+    0xE09E: lambda v, word, keys: bool(keys[v[_x(word)] & 0xF]),
+    0xE0A1: lambda v, word, keys: not keys[v[_x(word)] & 0xF],
+}
+
+# Opcodes an idle loop can be made of, anything else means the CPU is doing work.
+IDLE_OPCODES: frozenset[int] = frozenset({0x1000, 0xF007, 0xF00A, *SKIP_TESTS})
+IDLE_NIBBLES: frozenset[int] = frozenset(key >> 12 for key in IDLE_OPCODES)
+
+
+def _trace(
+    memory: memoryview,
+    v: bytearray,
+    start: int,
+    *,
+    delay_timer: int,
+    keys: Sequence[int],
+    limit: int,
+) -> tuple[int, bool]:
+    """Go round the loop at start once on a copy of the registers.
+
+    Only the opcodes that spin loops are built from are followed: jumps, skips,
+    delay timer reads, key checks and waiting for a key. Returns the loop length
+    and whether it reads the delay timer, or a length of 0 if the code at start
+    does anything else or doesn't come back within limit instructions.
+    """
+    pc = start
+    reads_timer = False
+    for length in range(1, limit + 1):
+        if pc + 1 >= MEMORY_SIZE:
+            return 0, False
+        word = memory[pc] << 8 | memory[pc + 1]
+        key = opcode_key(word)
+        if key == 0x1000:
+            pc = word & 0xFFF
+        elif key == 0xF00A:
+            if any(keys):
+                return 0, False  # a key is down, the wait finishes
+        elif key == 0xF007:
+            v[_x(word)] = delay_timer
+            reads_timer = True
+            pc += STEP
+        elif key in SKIP_TESTS:
+            pc += STEP * 2 if SKIP_TESTS[key](v, word, keys) else STEP
+        else:
+            return 0, False
+        if pc == start:
+            return length, reads_timer
+    return 0, False
+
+
+def find_idle_loop(cpu: CPU, limit: int = IDLE_LOOP_LENGTH) -> IdleLoop | None:
+    """The loop the CPU is spinning in from its current pc, if it's only waiting.
+
+    The loop is traced twice. If the second trip takes the same path and leaves
+    the registers as the first did, every later trip will too, for as long as
+    the delay timer and keys stay the same.
+    """
+    memory, pc, timer = cpu.ram.memory, cpu.pc, cpu.delay_timer
+    if pc + 1 >= MEMORY_SIZE or memory[pc] >> 4 not in IDLE_NIBBLES:
+        return None  # quick way out for busy code
+    if opcode_key(memory[pc] << 8 | memory[pc + 1]) not in IDLE_OPCODES:
+        return None
+    keys = cpu.keypad.pressed_keys
+    first = bytearray(cpu.v)
+    length, reads_timer = _trace(memory, first, pc, delay_timer=timer, keys=keys, limit=limit)
+    if not length:
+        return None
+    second = bytearray(first)
+    again, _ = _trace(memory, second, pc, delay_timer=timer, keys=keys, limit=limit)
+    if again != length or second != first:
+        return None
+    # A delay timer at zero stays there, so polling it can't end the loop either.
+    return IdleLoop(length, bytes(first), reads_timer and timer > 0)
@@ -1,7 +1,7 @@
-import sys
-
 import pygame as pg
 
+REWIND_KEY: int = pg.K_BACKSPACE  # held to step backwards through recent frames
+
 
 class Keypad:
     """16 Key hex keypad ranging 1 to V."""
@@ -26,18 +26,37 @@ class Keypad:
             118: 0xF,  # V
         }
         self.pressed_keys: list[int] = [0] * len(self.key_map)
+        self.rewinding: bool = False  # rewind key held down
+        self.quit: bool = False  # window closed or escape pressed
 
     def is_key_pressed(self, key_code: int) -> int:
         """Check if a key is pressed."""
         return self.pressed_keys[key_code]
 
+    @property
+    def mask(self) -> int:
+        """Pressed keys as a 16-bit mask, bit n set while key n is down."""
+        return sum(pressed << key for key, pressed in enumerate(self.pressed_keys))
+
+    def set_mask(self, mask: int) -> None:
+        """Press exactly the keys set in a 16-bit mask."""
+        self.pressed_keys[:] = [(mask >> key) & 1 for key in range(len(self.pressed_keys))]
+
     def update(self) -> None:
         """Update the keypad state."""
         for event in pg.event.get():
             # Press ESCAPE to quit emulator
             if event.type == pg.QUIT or (event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE):
-                pg.quit()
-                sys.exit()
+                self.quit = True
             elif event.type in (pg.KEYDOWN, pg.KEYUP) and event.key in self.key_map:
                 key: int = self.key_map[event.key]
                 self.pressed_keys[key] = int(event.type == pg.KEYDOWN)
+            elif event.type in (pg.KEYDOWN, pg.KEYUP) and event.key == REWIND_KEY:
+                self.rewinding = event.type == pg.KEYDOWN
+
+
+class HeadlessKeypad(Keypad):
+    """Keypad without an event pump, keys are set directly on pressed_keys."""
+
+    def update(self) -> None:
+        """No window events to read."""
@@ -0,0 +1,332 @@
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from chip8._exceptions import ChipError, ExecuteError, LockstepError, MovieError
+from chip8.audio import HeadlessAudio
+from chip8.chip8 import ENGINES
+from chip8.config import DEFAULT_IPS
+from chip8.constants import REGISTER_COUNT
+from chip8.disasm import format_instruction
+from chip8.keypad import HeadlessKeypad
+from chip8.movie import Movie, rom_digest
+from chip8.ram import RAM
+from chip8.scheduler import Scheduler, frame_of, frame_start
+from chip8.screen import HeadlessScreen
+from chip8.state import (
+    EMPTY_STACK,
+    FRAME,
+    FRAME_OFFSET,
+    HEADER,
+    HEADER_OFFSET,
+    REGISTERS_OFFSET,
+    STACK,
+    STACK_OFFSET,
+    STATE_SIZE,
+)
+
+VECTOR_ENGINE: str = "vector"  # the NumPy VectorMachine, run as a single instance
+CHECK_INTERVAL: int = 1000  # instructions between state comparisons
+DEFAULT_LOCKSTEP_FRAMES: int = 600  # emulated frames run without a movie, ten seconds
+HEADER_FIELDS: tuple[str, ...] = ("pc", "I", "DT", "ST", "SP", "rng")  # state.HEADER order
+
+
+class _Runner(ABC):
+    """One engine under test, paced by its own uncapped scheduler without idle skipping."""
+
+    name: str
+    scheduler: Scheduler
+
+    def run(self, count: int) -> None:
+        self.scheduler.run_for(count)
+
+    def rewind(self, state: bytes, executed: int, ticks: int) -> None:
+        """Go back to a checkpoint, machine and scheduler both."""
+        self.restore(state)
+        self.scheduler.executed = executed
+        self.scheduler.ticks = ticks
+
+    @abstractmethod
+    def set_mask(self, mask: int) -> None:
+        """Hold down the keys set in a 16-bit mask."""
+
+    @abstractmethod
+    def snapshot(self) -> bytes:
+        """The machine in the CPU save state layout."""
+
+    @abstractmethod
+    def restore(self, state: bytes) -> None:
+        """Load a state taken by snapshot."""
+
+
+class _EngineRunner(_Runner):
+    """A CPU engine with headless backends."""
+
+    def __init__(self, name: str, rom: str, seed: int, ips: int) -> None:
+        self.name = name
+        self.keypad = HeadlessKeypad()
+        self.cpu = ENGINES[name](RAM(rom), HeadlessScreen(), self.keypad, HeadlessAudio(), seed)
+        self.scheduler = Scheduler(self.cpu, ips, uncapped=True, skip_idle=False)
+
+    def set_mask(self, mask: int) -> None:
+        self.keypad.set_mask(mask)
+
+    def snapshot(self) -> bytes:
+        return bytes(self.cpu.snapshot())
+
+    def restore(self, state: bytes) -> None:
+        self.cpu.restore(state)
+
+
+class _VectorRunner(_Runner):
+    """One VectorMachine instance, its state packed into the CPU save state layout."""
+
+    def __init__(self, name: str, rom: str, seed: int, ips: int) -> None:
+        try:
+            import numpy as np  # noqa: PLC0415
+
+            from chip8.vector import VectorMachine  # noqa: PLC0415
+        except ImportError as e:
+            raise LockstepError("The vector engine needs NumPy, install the vector extra") from e
+        self.name = name
+        self.machine = VectorMachine(rom, 1, np.array([seed], dtype=np.uint64))
+        self.scheduler = Scheduler(self.machine, ips, uncapped=True, skip_idle=False)
+
+    def set_mask(self, mask: int) -> None:
+        self.machine.keys[0] = [(mask >> key) & 1 for key in range(REGISTER_COUNT)]
+
+    def run(self, count: int) -> None:
+        super().run(count)
+        if self.machine.halted[0]:
+            raise ExecuteError(f"Vector machine halted at {int(self.machine.pc[0]):04x}")
+
+    def snapshot(self) -> bytes:
+        m = self.machine
+        state = bytearray(STATE_SIZE)
+        state[:REGISTERS_OFFSET] = m.memory[0].tobytes()
+        state[REGISTERS_OFFSET:HEADER_OFFSET] = m.v[0].tobytes()
+        depth = int(m.sp[0])
+        header = m.pc[0], m.i[0], m.delay_timer[0], m.sound_timer[0], depth, m.rng[0]
+        HEADER.pack_into(state, HEADER_OFFSET, *map(int, header))
+        STACK.pack_into(state, STACK_OFFSET, *m.stack[0, :depth].tolist(), *EMPTY_STACK[depth:])
+        FRAME.pack_into(state, FRAME_OFFSET, *m.frame[0].tolist())
+        return bytes(state)
+
+    def restore(self, state: bytes) -> None:
+        m = self.machine
+        m.memory[0] = memoryview(state)[:REGISTERS_OFFSET]
+        m.v[0] = memoryview(state)[REGISTERS_OFFSET:HEADER_OFFSET]
+        pc, i, delay, sound, depth, rng = HEADER.unpack_from(state, HEADER_OFFSET)
+        m.pc[0], m.i[0], m.delay_timer[0], m.sound_timer[0] = pc, i, delay, sound
+        m.sp[0], m.rng[0] = depth, rng
+        m.stack[0] = STACK.unpack_from(state, STACK_OFFSET)
+        m.frame[0] = FRAME.unpack_from(state, FRAME_OFFSET)
+        m.halted[0] = False
+
+
+def _runner(name: str, rom: str, seed: int, ips: int) -> _Runner:
+    if name == VECTOR_ENGINE:
+        return _VectorRunner(name, rom, seed, ips)
+    if name not in ENGINES:
+        raise LockstepError(f"Unknown engine {name}")
+    return _EngineRunner(name, rom, seed, ips)
+
+
+def _fields(state: bytes) -> dict[str, int]:
+    """Registers, pointers and timers out of a save state, in display order."""
+    header = HEADER.unpack_from(state, HEADER_OFFSET)
+    registers = state[REGISTERS_OFFSET:HEADER_OFFSET]
+    return {
+        **dict(zip(HEADER_FIELDS, header, strict=True)),
+        **{f"V{n:X}": value for n, value in enumerate(registers)},
+    }
+
+
+@dataclass(frozen=True)
+class Divergence:
+    """The first instruction after which an engine's state differed from the reference.
+
+    An engine can differ only when running several instructions at once, a block
+    engine translating a different block say. Then the divergence covers the
+    whole run of length instructions, starting at the one given.
+    """
+
+    instruction: int  # instructions every engine ran in agreement before this one
+    frame: int  # emulated frame the instruction ran in
+    pc: int  # where the instruction was fetched from
+    word: int
+    reference: str
+    engine: str
+    expected: bytes  # reference save state after the instruction
+    actual: bytes  # engine save state after the instruction
+    expected_error: str | None = None  # what the reference raised, if it faulted
+    actual_error: str | None = None
+    length: int = 1  # instructions run together when the states differed
+
+    def report(self) -> str:
+        """Both register files side by side, with differing fields marked."""
+        where = f"instruction {self.instruction:,} (frame {self.frame})"
+        if self.length > 1:
+            last = self.instruction + self.length - 1
+            where = f"instructions {self.instruction:,}-{last:,} (frame {self.frame})"
+        lines = [
+            f"{self.engine} diverged from {self.reference} at {where}",
+            f"  {self.pc:03x}:  {self.word:04x}  {format_instruction(self.word)}",
+        ]
+        if self.length > 1:
+            lines.append(f"  only when run {self.length} instructions at a time")
+        errors = (self.reference, self.expected_error), (self.engine, self.actual_error)
+        lines += [f"  {name} raised: {error}" for name, error in errors if error is not None]
+        expected, actual = _fields(self.expected), _fields(self.actual)
+        lines.append(f"  {'':<6}{self.reference:>12}{self.engine:>12}")
+        for name, value in expected.items():
+            mark = "  <" if actual[name] != value else ""
+            lines.append(f"  {name:<6}{value:>12x}{actual[name]:>12x}{mark}")
+        return "\n".join(lines + self._differences())
+
+    def _differences(self) -> list[str]:
+        """Memory, stack and screen, too big to list, summed up where they differ."""
+        lines = []
+        expected, actual = self.expected, self.actual
+        memory = [a for a in range(REGISTERS_OFFSET) if expected[a] != actual[a]]
+        if memory:
+            shown = ", ".join(f"{address:03x}" for address in memory[:8])
+            lines.append(f"  memory differs at {shown}" + (" ..." if len(memory) > 8 else ""))
+        stacks = STACK.unpack_from(expected, STACK_OFFSET), STACK.unpack_from(actual, STACK_OFFSET)
+        if stacks[0] != stacks[1]:
+            lines.append(f"  stack {stacks[0]} != {stacks[1]}")
+        frames = FRAME.unpack_from(expected, FRAME_OFFSET), FRAME.unpack_from(actual, FRAME_OFFSET)
+        rows = [str(y) for y, (old, new) in enumerate(zip(*frames, strict=True)) if old != new]
+        if rows:
+            lines.append(f"  screen differs in rows {', '.join(rows)}")
+        return lines
+
+
+@dataclass(frozen=True)
+class LockstepResult:
+    """How far the engines ran together, and where they parted if they did."""
+
+    instructions: int  # instructions run in agreement
+    divergence: Divergence | None
+    fault: str | None = None  # error every engine raised together, ending the run early
+
+
+class Lockstep:
+    """Runs a reference engine and the engines under test side by side on one ROM.
+
+    Every engine gets the same seed, speed and key presses, one movie frame at a
+    time. Their save states are compared every interval instructions. When they
+    differ, all engines go back to the last state they agreed on and step one
+    instruction at a time to find the first instruction that set them apart.
+    """
+
+    def __init__(
+        self,
+        rom: str,
+        engines: Sequence[str],
+        *,
+        reference: str = "reference",
+        movie: Movie | None = None,
+        frames: int = DEFAULT_LOCKSTEP_FRAMES,
+        seed: int = 0,
+        ips: int = DEFAULT_IPS,
+        interval: int = CHECK_INTERVAL,
+    ) -> None:
+        if interval < 1:
+            raise LockstepError("Interval must be at least one instruction")
+        if movie is not None:
+            if rom_digest(rom) != movie.rom:
+                raise MovieError(f"Movie was not recorded on {rom}")
+            seed, ips = movie.seed, movie.ips
+            frames = len(movie)
+        if ips < 1:
+            raise LockstepError("Speed must be at least one instruction per second")
+        self.masks = list(movie.frames()) if movie is not None else [0] * frames
+        self.ips = ips
+        self.total = frame_start(frames, ips)
+        self.interval = interval
+        self.runners = [_runner(name, rom, seed, ips) for name in (reference, *engines)]
+        self.executed = 0
+        self.checkpoint = self.runners[0].snapshot(), 0, 0  # state, executed, ticks
+
+    def run(self) -> LockstepResult:
+        """Run to the end of the movie or frame count, or the first divergence."""
+        while self.executed < self.total:
+            frame_end = frame_start(frame_of(self.executed, self.ips) + 1, self.ips)
+            count = min(self.executed + self.interval, frame_end, self.total) - self.executed
+            outcome = self._advance(count)
+            if outcome is None:
+                self.executed += count
+                reference = self.runners[0]
+                self.checkpoint = reference.snapshot(), self.executed, reference.scheduler.ticks
+                continue
+            return self._bisect(count, *outcome)
+        return LockstepResult(self.executed, None)
+
+    def _advance(self, count: int) -> tuple[list[bytes], list[str | None]] | None:
+        """Run every engine count instructions, returning their states if any differ."""
+        mask = self.masks[min(frame_of(self.executed, self.ips), len(self.masks) - 1)]
+        errors: list[str | None] = []
+        for runner in self.runners:
+            runner.set_mask(mask)
+            try:
+                runner.run(count)
+            except ChipError as e:
+                errors.append(str(e))
+            else:
+                errors.append(None)
+        states = [runner.snapshot() for runner in self.runners]
+        if any(errors) or any(state != states[0] for state in states[1:]):
+            return states, errors
+        return None
+
+    def _bisect(self, count: int, states: list[bytes], errors: list[str | None]) -> LockstepResult:
+        """Replay the last count instructions, whose states differed, one by one.
+
+        When single steps all agree, the engines only differ running the chunk
+        in one go, and the chunk's own states are reported.
+        """
+        start, before = self.executed, self.checkpoint[0]
+        for runner in self.runners:
+            runner.rewind(*self.checkpoint)
+        reference = self.runners[0]
+        for _ in range(count):
+            step_before = reference.snapshot()
+            outcome = self._advance(1)
+            if outcome is not None:
+                return self._result(step_before, *outcome)
+            self.executed += 1
+        self.executed = start
+        return self._result(before, states, errors, count)
+
+    def _result(
+        self,
+        before: bytes,
+        states: list[bytes],
+        errors: list[str | None],
+        length: int = 1,
+    ) -> LockstepResult:
+        """A fault every engine raised in the same state, or the first engine to differ."""
+        if all(errors) and all(state == states[0] for state in states[1:]):
+            return LockstepResult(self.executed, None, errors[0])
+        engine = next(
+            n
+            for n in range(1, len(states))
+            if states[n] != states[0] or bool(errors[n]) != bool(errors[0])
+        )
+        pc = HEADER.unpack_from(before, HEADER_OFFSET)[0]
+        word = before[pc] << 8 | before[pc + 1] if pc + 1 < REGISTERS_OFFSET else 0
+        divergence = Divergence(
+            self.executed,
+            frame_of(self.executed, self.ips),
+            pc,
+            word,
+            self.runners[0].name,
+            self.runners[engine].name,
+            states[0],
+            states[engine],
+            errors[0],
+            errors[engine],
+            length,
+        )
+        return LockstepResult(self.executed, divergence)
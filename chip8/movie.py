@@ -0,0 +1,98 @@
+import struct
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from chip8._exceptions import MovieError
+from chip8.romcache import load_image
+
+MAGIC: bytes = b"C8MV"
+VERSION: int = 1
+# magic, version, seed, instructions per second, ROM sha1, final state sha1, run count
+HEADER = struct.Struct(">4sBQI20s20sI")
+RUN = struct.Struct(">IH")  # frames the keys were held for, pressed key mask
+MAX_RUN: int = 0xFFFFFFFF  # longest run a single record can hold
+
+
+def rom_digest(rom: str | Path) -> bytes:
+    """SHA-1 of a ROM file, identifying the program a movie was recorded on."""
+    return load_image(rom).digest
+
+
+@dataclass
+class Movie:
+    """Keypad input for every emulated frame of a run, run-length encoded.
+
+    Together with the seed and instruction rate this reproduces the run exactly,
+    and the digest of the final save state checks that a replay ended up in the
+    same place.
+    """
+
+    seed: int
+    ips: int
+    rom: bytes  # sha1 of the ROM the movie was recorded on
+    digest: bytes = bytes(20)  # sha1 of the save state after the last frame
+    runs: list[list[int]] = field(default_factory=list)  # [frames, key mask] pairs
+
+    def __len__(self) -> int:
+        """Number of frames recorded."""
+        return sum(frames for frames, _ in self.runs)
+
+    def record(self, mask: int) -> None:
+        """Append one frame of input."""
+        runs = self.runs
+        if runs and runs[-1][1] == mask and runs[-1][0] < MAX_RUN:
+            runs[-1][0] += 1
+        else:
+            runs.append([1, mask])
+
+    def truncate(self, length: int) -> None:
+        """Drop every frame after the first length frames."""
+        runs = self.runs
+        excess = len(self) - length
+        while excess > 0 and runs:
+            if runs[-1][0] > excess:
+                runs[-1][0] -= excess
+                return
+            excess -= runs.pop()[0]
+
+    def frames(self) -> Iterator[int]:
+        """Key mask for each recorded frame in order."""
+        for frames, mask in self.runs:
+            for _ in range(frames):
+                yield mask
+
+    def to_bytes(self) -> bytes:
+        """Encode the movie in its binary file format."""
+        fields = self.seed, self.ips, self.rom, self.digest, len(self.runs)
+        header = HEADER.pack(MAGIC, VERSION, *fields)
+        return header + b"".join(RUN.pack(frames, mask) for frames, mask in self.runs)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Movie":
+        """Decode a movie from its binary file format."""
+        try:
+            magic, version, seed, ips, rom, digest, count = HEADER.unpack_from(data)
+        except struct.error as e:
+            raise MovieError("Movie file is truncated") from e
+        if magic != MAGIC or version != VERSION:
+            raise MovieError("Not a chip8 movie file, or from an unsupported version")
+        if len(data) != HEADER.size + count * RUN.size:
+            raise MovieError("Movie file is truncated")
+        if ips < 1:
+            raise MovieError(f"Movie runs at {ips} instructions per second, below one")
+        runs = [list(run) for run in RUN.iter_unpack(data[HEADER.size :])]
+        return cls(seed, ips, rom, digest, runs)
+
+    def save(self, path: str | Path) -> None:
+        """Write the movie to a file."""
+        Path(path).write_bytes(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Movie":
+        """Read a movie from a file."""
+        try:
+            data = Path(path).read_bytes()
+        except FileNotFoundError as e:
+            raise MovieError(f"Movie file not found: {path}") from e
+        return cls.from_bytes(data)
@@ -36,3 +36,18 @@ opcodes: dict[int, OpCode] = {
     0xF055: OpCode("LD [I], Vx", "load_i_vx"),
     0xF065: OpCode("LD Vx, [I]", "load_vx_i"),
 }
+
+
+def opcode_key(instruction: int) -> int:
+    """Mask a raw 16-bit instruction down to its key in the opcode table."""
+    op_index = instruction & 0xF000
+    if op_index in (0xE000, 0xF000, 0x0):
+        return instruction & 0xF0FF
+    if op_index == 0x8000:
+        return instruction & 0xF00F
+    return op_index
+
+
+def lookup(instruction: int) -> OpCode:
+    """Convert a raw 16-bit instruction into its opcode."""
+    return opcodes[opcode_key(instruction)]
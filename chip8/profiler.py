@@ -0,0 +1,211 @@
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import cache
+from typing import Any
+
+from chip8._exceptions import ChipError, ExecuteError
+from chip8.blocks import Block, BlockCPU, compile_block
+from chip8.constants import MEMORY_SIZE
+from chip8.cpu import CPU
+from chip8.dispatch import INSTRUCTION_COUNT, STEP
+from chip8.opcodes import opcode_key, opcodes
+
+INVALID_LABEL: str = "INVALID"  # words that don't decode to an opcode
+TOP_ADDRESSES: int = 20  # hottest addresses shown in the text report
+# Compiled into the start of profiled blocks: charge the last block and start the lap.
+LAP_PROLOGUE: tuple[str, ...] = (
+    "_now = _clock()",
+    "_running = _lap[0]",
+    "if _running is not None:",
+    "    _running[1] += _now - _lap[1]",
+    "_totals[0] += 1",
+    "_lap[0] = _totals",
+    "_lap[1] = _now",
+)
+
+
+@cache
+def opcode_labels() -> tuple[str, ...]:
+    """Mnemonic of every instruction word, built once per process."""
+    return tuple(
+        opcodes[key].label if (key := opcode_key(word)) in opcodes else INVALID_LABEL
+        for word in range(INSTRUCTION_COUNT)
+    )
+
+
+@dataclass
+class Profile:
+    """Execution counts and host nanoseconds per instruction word and per address."""
+
+    word_counts: list[int] = field(default_factory=lambda: [0] * INSTRUCTION_COUNT)
+    word_times: list[int] = field(default_factory=lambda: [0] * INSTRUCTION_COUNT)
+    address_counts: list[int] = field(default_factory=lambda: [0] * MEMORY_SIZE)
+    address_times: list[int] = field(default_factory=lambda: [0] * MEMORY_SIZE)
+    address_words: list[int] = field(default_factory=lambda: [0] * MEMORY_SIZE)  # last seen
+    # Start, words, and [runs, ns] not yet shared out, of every block timed whole.
+    blocks: list[tuple[int, list[int], list[int]]] = field(default_factory=list)
+    # The [runs, ns] of the block running, and when it started. Blocks are timed
+    # from their start to the next one's, one clock read each.
+    lap: list[Any] = field(default_factory=lambda: [None, 0])
+
+    def compile_block(self, memory: bytearray | memoryview, start: int, limit: int) -> Block | None:
+        """Compile a block that counts and times each run of itself."""
+        totals = [0, 0]
+        names = {"_clock": time.perf_counter_ns, "_lap": self.lap, "_totals": totals}
+        block = compile_block(memory, start, limit, prologue=LAP_PROLOGUE, names=names)
+        if block is not None:
+            words = [memory[pc] << 8 | memory[pc + 1] for pc in range(start, block.end, STEP)]
+            self.blocks.append((start, words, totals))
+        return block
+
+    def end_lap(self) -> None:
+        """Charge the block running with the time up to now, once a run is over."""
+        running, start = self.lap
+        if running is not None:
+            running[1] += time.perf_counter_ns() - start
+            self.lap[0] = None
+
+    def share_blocks(self) -> None:
+        """Add block runs to the instruction totals, their time split evenly."""
+        for start, words, totals in self.blocks:
+            runs, ns = totals
+            if not runs:
+                continue
+            share = ns // len(words)
+            for k, word in enumerate(words):
+                pc = start + k * STEP
+                self.word_counts[word] += runs
+                self.word_times[word] += share
+                self.address_counts[pc] += runs
+                self.address_times[pc] += share
+                self.address_words[pc] = word
+            totals[:] = 0, 0
+
+    def opcodes(self) -> list[dict[str, Any]]:
+        """Per-mnemonic totals, most host time first."""
+        self.share_blocks()
+        labels = opcode_labels()
+        counts: Counter[str] = Counter()
+        times: Counter[str] = Counter()
+        for word, count in enumerate(self.word_counts):
+            if count:
+                counts[labels[word]] += count
+                times[labels[word]] += self.word_times[word]
+        return [
+            {"label": label, "count": counts[label], "ns": ns} for label, ns in times.most_common()
+        ]
+
+    def addresses(self) -> list[dict[str, Any]]:
+        """Per-address totals for every address that ran, most host time first."""
+        self.share_blocks()
+        labels = opcode_labels()
+        ran = [address for address, count in enumerate(self.address_counts) if count]
+        ran.sort(key=self.address_times.__getitem__, reverse=True)
+        return [
+            {
+                "address": address,
+                "word": self.address_words[address],
+                "label": labels[self.address_words[address]],
+                "count": self.address_counts[address],
+                "ns": self.address_times[address],
+            }
+            for address in ran
+        ]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Whole profile as plain data, for writing out as JSON."""
+        return {"opcodes": self.opcodes(), "addresses": self.addresses()}
+
+    def report(self, top: int = TOP_ADDRESSES) -> str:
+        """Sorted text tables of the opcodes and the hottest addresses."""
+        opcode_rows = self.opcodes()
+        total = max(sum(row["ns"] for row in opcode_rows), 1)
+        lines = [f"{'opcode':<16}{'count':>12}{'ms':>10}{'ns/op':>8}{'time':>8}"]
+        lines += [
+            f"{row['label']:<16}{row['count']:>12,}{row['ns'] / 1e6:>10.1f}"
+            f"{row['ns'] / row['count']:>8.0f}{row['ns'] / total:>8.1%}"
+            for row in opcode_rows
+        ]
+        lines += ["", f"{'address':<9}{'word':<7}{'opcode':<16}{'count':>12}{'ms':>10}{'time':>8}"]
+        lines += [
+            f"{row['address']:04x}     {row['word']:04x}   {row['label']:<16}"
+            f"{row['count']:>12,}{row['ns'] / 1e6:>10.1f}{row['ns'] / total:>8.1%}"
+            for row in self.addresses()[:top]
+        ]
+        return "\n".join(lines)
+
+
+class ProfiledCPU(CPU):
+    """An engine built by profiled(), timing what it runs into its profile."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        super().__init__(*args, **kwargs)
+        self.profile = Profile()
+
+
+class _ProfiledSteps(ProfiledCPU):
+    """Times every instruction, through the dispatch table where there is one."""
+
+    def run(self, count: int) -> None:
+        """Execute count instructions one at a time, timing each."""
+        memory = self.ram.memory
+        table = getattr(self, "table", None)
+        step = self.step
+        profile = self.profile
+        word_counts, word_times = profile.word_counts, profile.word_times
+        counts, times, words = (
+            profile.address_counts,
+            profile.address_times,
+            profile.address_words,
+        )
+        clock = time.perf_counter_ns
+        try:
+            for _ in range(count):
+                pc = self.pc
+                word = memory[pc] << 8 | memory[pc + 1]
+                start = clock()
+                if table is None:
+                    step()
+                else:
+                    table[word](self)
+                elapsed = clock() - start
+                word_counts[word] += 1
+                word_times[word] += elapsed
+                counts[pc] += 1
+                times[pc] += elapsed
+                words[pc] = word
+        except ChipError:
+            raise
+        except Exception as e:
+            raise ExecuteError(f"Execution Error: {self.pc:04x} - {e}") from e
+
+
+class _ProfiledBlocks(ProfiledCPU):
+    """Times every block a block engine runs, mixed in ahead of the engine."""
+
+    def run(self, count: int) -> None:
+        """Execute count instructions as the engine does, timing the blocks run."""
+        try:
+            super().run(count)
+        finally:
+            self.profile.end_lap()
+
+    def compile(self, start: int, limit: int) -> Block | None:
+        """Compile a block that times itself into the profile."""
+        self.profile.end_lap()  # compiling isn't charged to the block before
+        return self.profile.compile_block(self.ram.memory, start, limit)
+
+
+@cache
+def profiled(engine: type[CPU]) -> type[ProfiledCPU]:
+    """Subclass an engine to time every instruction it runs.
+
+    Only machines built from the returned class pay for profiling, the engine
+    itself is left untouched. Engines with a dispatch table are timed through
+    the table one instruction at a time, the reference CPU through step. Block
+    engines keep translating and are timed a whole block at a time, each
+    block's time shared evenly between its instructions in the report.
+    """
+    timing = _ProfiledBlocks if issubclass(engine, BlockCPU) else _ProfiledSteps
+    return type(f"Profiled{engine.__name__}", (timing, engine), {})
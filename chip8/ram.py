@@ -1,32 +1,34 @@
-from pathlib import Path
-from typing import overload
+from typing import TYPE_CHECKING, overload
 
-from chip8._exceptions import RomError
-from chip8.constants import FONT, MEMORY_SIZE, PC_INIT
+from chip8.constants import MEMORY_SIZE, PC_INIT
+from chip8.romcache import RomImage, load_image
+from chip8.state import MachineState
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
 
 
 class RAM:
     """Unified memory for the CHIP-8 system."""
 
-    def __init__(self, rom_path: str) -> None:
-        self._memory: bytearray = bytearray([0] * MEMORY_SIZE)
-        # Load font data into the first 80 bytes of memory
-        self._memory[: len(FONT)] = FONT
-        self.load_rom(rom_path)
+    def __init__(self, rom_path: str, state: MachineState | None = None) -> None:
+        self.state: MachineState = state or MachineState()
+        self._memory: memoryview = self.state.memory  # lives inside the save state buffer
+        # Font and ROM come from the cached power-on image in a single copy.
+        self.rom: RomImage = load_image(rom_path)
+        self._memory[:] = self.rom.memory
+        # Notified with (address, length) of every write through __setitem__ or write.
+        self.on_write: Callable[[int, int], None] | None = None
 
     def load_rom(self, rom_path: str) -> None:
         """Load ROM bytes into RAM starting at 0x200."""
-        try:
-            with Path(rom_path).open("rb") as f:
-                rom_bytes = f.read()
-        except FileNotFoundError as e:
-            raise RomError(f"ROM file not found: {rom_path}") from e
-
-        if len(rom_bytes) > MEMORY_SIZE - PC_INIT:
-            raise RomError("ROM size exceeds available memory.")
+        self.rom = load_image(rom_path)
+        self._memory[PC_INIT : PC_INIT + self.rom.size] = self.rom.rom
 
-        # Load ROM bytes into RAM starting at 0x200.
-        self._memory[PC_INIT : PC_INIT + len(rom_bytes)] = rom_bytes
+    @property
+    def memory(self) -> memoryview:
+        """Raw backing store, for engines that fetch without per-byte bounds checks."""
+        return self._memory
 
     @overload
     def __getitem__(self, address: int) -> int: ...
@@ -47,6 +49,25 @@ class RAM:
         if not (0 <= address < MEMORY_SIZE):
             raise IndexError(f"Memory address out of bounds: {address:04x}")
         self._memory[address] = value
+        if self.on_write is not None:
+            self.on_write(address, 1)
+
+    def _check_range(self, address: int, length: int) -> None:
+        if address < 0 or address + length > MEMORY_SIZE:
+            raise IndexError(f"Memory range out of bounds: {address:04x}+{length}")
+
+    def read(self, address: int, length: int) -> memoryview:
+        """Read-only window onto length bytes from address, without copying."""
+        self._check_range(address, length)
+        return self._memory[address : address + length].toreadonly()
+
+    def write(self, address: int, data: bytes | bytearray | memoryview) -> None:
+        """Write a run of bytes starting at address, checking the range once."""
+        length = len(data)
+        self._check_range(address, length)
+        self._memory[address : address + length] = data
+        if self.on_write is not None:
+            self.on_write(address, length)
 
     def dump(self, start: int = 0, end: int = MEMORY_SIZE) -> None:
         """Print memory slice in formatted rows."""
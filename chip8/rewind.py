@@ -0,0 +1,93 @@
+import zlib
+from collections import deque
+from dataclasses import dataclass, field
+
+from chip8.constants import TICK_RATE
+from chip8.cpu import CPU
+from chip8.state import STATE_SIZE
+
+KEYFRAME_INTERVAL: int = 60  # frames recorded between full keyframes
+COMPRESSION_LEVEL: int = 1  # deltas are mostly zeros, so fast compression is enough
+
+
+def _xor(state: bytes | bytearray, base: bytes) -> bytes:
+    """XOR two save states of the same size."""
+    delta = int.from_bytes(state) ^ int.from_bytes(base)
+    return delta.to_bytes(STATE_SIZE)
+
+
+@dataclass
+class Segment:
+    """A compressed keyframe and the frames recorded after it."""
+
+    keyframe: bytes  # compressed full save state
+    deltas: list[bytes] = field(default_factory=list)  # compressed XOR against the keyframe
+
+
+class Rewind:
+    """Ring buffer of recent frames that can be stepped back through.
+
+    Frames are grouped behind periodic keyframes, each stored as the compressed
+    XOR of its save state against the keyframe. Whole segments fall off the back
+    of the ring, so memory stays bounded however long the session runs.
+    """
+
+    def __init__(
+        self,
+        cpu: CPU,
+        seconds: int,
+        keyframe_interval: int = KEYFRAME_INTERVAL,
+    ) -> None:
+        self.cpu = cpu
+        self.keyframe_interval = keyframe_interval
+        segments = -(-seconds * TICK_RATE // keyframe_interval)  # round up
+        self.segments: deque[Segment] = deque(maxlen=segments + 1)
+        self.base: bytes = b""  # uncompressed keyframe of the newest segment
+        self.scratch: bytearray = bytearray(STATE_SIZE)  # reused for every snapshot
+        # Frames recorded and not stepped back through, counting those fallen off the ring.
+        self.frames: int = 0
+
+    def __len__(self) -> int:
+        """Number of frames that can be stepped back through."""
+        return sum(1 + len(segment.deltas) for segment in self.segments)
+
+    def record(self) -> None:
+        """Store the current frame."""
+        state = self.cpu.snapshot(self.scratch)
+        self.frames += 1
+        segments = self.segments
+        if not segments or len(segments[-1].deltas) >= self.keyframe_interval - 1:
+            self.base = bytes(state)
+            segments.append(Segment(zlib.compress(self.base, COMPRESSION_LEVEL)))
+        else:
+            delta = zlib.compress(_xor(state, self.base), COMPRESSION_LEVEL)
+            segments[-1].deltas.append(delta)
+
+    def step_back(self) -> bool:
+        """Drop the newest stored frame and restore the one before it.
+
+        The newest frame is the state the machine is already in, so each step
+        moves back a frame. Returns False once no earlier frame is left.
+        """
+        if len(self) < 2:
+            return False
+        self.frames -= 1
+        segments = self.segments
+        segment = segments[-1]
+        if segment.deltas:
+            segment.deltas.pop()
+        else:
+            segments.pop()
+            segment = segments[-1]
+            self.base = zlib.decompress(segment.keyframe)
+        if segment.deltas:
+            self.cpu.restore(_xor(zlib.decompress(segment.deltas[-1]), self.base))
+        else:
+            self.cpu.restore(self.base)
+        return True
+
+    def clear(self) -> None:
+        """Forget every stored frame."""
+        self.segments.clear()
+        self.base = b""
+        self.frames = 0
@@ -0,0 +1,78 @@
+import hashlib
+import mmap
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from chip8._exceptions import RomError
+from chip8.constants import FONT, MEMORY_SIZE, PC_INIT
+
+type StatKey = tuple[int, int, int, int]  # device, inode, size, modified time in ns
+
+
+@dataclass(frozen=True)
+class RomImage:
+    """A ROM file's contents and the initial memory of a machine running it."""
+
+    digest: bytes  # sha1 of the ROM bytes
+    size: int  # ROM length in bytes
+    memory: bytes  # full power-on memory, font then ROM at PC_INIT
+
+    @property
+    def rom(self) -> bytes:
+        """The ROM bytes on their own."""
+        return self.memory[PC_INIT : PC_INIT + self.size]
+
+
+# Process-wide caches. Paths map to the stat they were read with, so a file that
+# changes on disk is read again, and images are shared by every path with the same
+# contents.
+_by_path: dict[str, tuple[StatKey, RomImage]] = {}
+_by_digest: dict[bytes, RomImage] = {}
+
+
+def _stat_key(stat: os.stat_result) -> StatKey:
+    return stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def _read(path: str, size: int) -> RomImage:
+    with Path(path).open("rb") as f:
+        if not size:
+            rom = b""  # empty files can't be mapped
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                rom = mapped[:]
+    if len(rom) > MEMORY_SIZE - PC_INIT:
+        raise RomError("ROM size exceeds available memory.")  # grew after it was checked
+    digest = hashlib.sha1(rom).digest()  # noqa: S324
+    if digest in _by_digest:
+        return _by_digest[digest]
+    memory = bytearray(MEMORY_SIZE)
+    memory[: len(FONT)] = bytes(FONT)
+    memory[PC_INIT : PC_INIT + len(rom)] = rom
+    image = RomImage(digest, len(rom), bytes(memory))
+    _by_digest[digest] = image
+    return image
+
+
+def load_image(rom_path: str | Path) -> RomImage:
+    """Initial memory image for a ROM, read from disk only when the file is new or changed."""
+    path = os.fspath(rom_path)
+    try:
+        key = _stat_key(Path(path).stat())
+    except FileNotFoundError as e:
+        raise RomError(f"ROM file not found: {path}") from e
+    cached = _by_path.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    if key[2] > MEMORY_SIZE - PC_INIT:
+        raise RomError("ROM size exceeds available memory.")
+    image = _read(path, key[2])
+    _by_path[path] = key, image
+    return image
+
+
+def clear() -> None:
+    """Forget every cached ROM."""
+    _by_path.clear()
+    _by_digest.clear()
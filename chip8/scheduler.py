@@ -0,0 +1,139 @@
+import time
+from collections.abc import Callable
+from typing import Protocol
+
+from chip8.config import DEFAULT_IPS
+from chip8.constants import TIMER_RATE
+from chip8.cpu import CPU
+from chip8.idle import find_idle_loop
+
+MAX_LAG: float = 0.25  # seconds of host time to catch up on before dropping the rest
+MAX_IDLE_BACKOFF: int = 16  # most timer periods to wait before looking for an idle loop again
+
+
+def frame_start(frame: int, ips: int) -> int:
+    """Instruction an emulated frame starts on, where its timer tick lands.
+
+    Frames are ips / 60 instructions long on average, the fraction carried from
+    one frame to the next, so a frame can be empty when ips is below 60.
+    """
+    return frame * ips // TIMER_RATE
+
+
+def frame_of(instruction: int, ips: int) -> int:
+    """Emulated frame an instruction runs in, the last one to start at or before it."""
+    return ((instruction + 1) * TIMER_RATE - 1) // ips
+
+
+class Machine(Protocol):
+    """What the scheduler drives: a CPU engine, or a VectorMachine running a batch."""
+
+    def run(self, count: int) -> None:
+        """Execute count instructions."""
+
+    def decrement_timers(self) -> None:
+        """Tick the delay and sound timers once."""
+
+
+class Scheduler:
+    """Paces CPU instructions and 60Hz timers against the host clock.
+
+    Timers tick every ips / 60 instructions of emulated time. When capped, emulated
+    time follows the host clock, so a slow frame is made up on the next call
+    instead of drifting. Uncapped, each call runs one emulated frame straight away.
+    With skip_idle, time a CPU would spend spinning in a wait loop is skipped
+    over, leaving the machine exactly as running the loop would have. Only CPU
+    engines are looked at for idle loops.
+    """
+
+    def __init__(
+        self,
+        cpu: Machine,
+        ips: int = DEFAULT_IPS,
+        uncapped: bool = False,
+        clock: Callable[[], float] = time.perf_counter,
+        skip_idle: bool = True,
+    ) -> None:
+        self.cpu = cpu
+        self.ips = ips
+        self.uncapped = uncapped
+        self.clock = clock
+        self.skip_idle = skip_idle
+        self.executed: int = 0  # instructions run since the scheduler started
+        self.skipped: int = 0  # of those, instructions fast-forwarded through idle loops
+        # Busy code is looked at less and less often, doubling the wait each time.
+        self.idle_backoff: int = 0
+        self.idle_wait: int = 0
+        self.ticks: int = 0  # timer ticks run since the scheduler started
+        self.frames: int = 0  # emulated frames run uncapped
+        self.dropped: int = 0  # instructions not owed, skipped after stalls or pauses
+        self.origin: float | None = None  # host time matching instruction zero
+
+    def advance(self) -> int:
+        """Run the instructions owed since the last call, return how many ran."""
+        if self.uncapped:
+            self.frames += 1
+            return self.run_for(frame_start(self.frames, self.ips) - self.executed)
+
+        now = self.clock()
+        if self.origin is None:
+            self.origin = now
+            self.dropped = -self.executed  # owe nothing for instructions already run
+        owed = int((now - self.origin) * self.ips) - self.dropped - self.executed
+        max_owed = int(MAX_LAG * self.ips)
+        if owed > max_owed:
+            # Drop time lost to a stall (window drag, debugger) rather than racing through it.
+            self.dropped += owed - max_owed
+            owed = max_owed
+        return self.run_for(owed)
+
+    def resync(self) -> None:
+        """Pace from the next call onwards, forgetting host time spent paused."""
+        self.origin = None
+
+    def run_for(self, count: int) -> int:
+        """Run count instructions, stepping the timers on each 60Hz boundary."""
+        target = self.executed + count
+        while self.executed < target:
+            next_tick = frame_start(self.ticks, self.ips)  # instruction the tick lands on
+            if self.executed >= next_tick:
+                self.cpu.decrement_timers()
+                self.ticks += 1
+                continue
+            if self.skip_idle and self.fast_forward(min(target, next_tick), target):
+                continue
+            batch = min(target, next_tick) - self.executed
+            self.cpu.run(batch)
+            self.executed += batch
+        return max(count, 0)
+
+    def fast_forward(self, tick_end: int, target: int) -> bool:
+        """Skip whole trips round an idle loop, return False if not idle.
+
+        Loops polling a running delay timer are skipped up to tick_end, the next
+        tick, and anything else up to target with the timers ticked on the way.
+        """
+        if self.idle_wait:
+            self.idle_wait -= 1
+            return False
+        cpu = self.cpu
+        if not isinstance(cpu, CPU):
+            return False
+        loop = find_idle_loop(cpu)
+        if loop is None:
+            self.idle_backoff = min(self.idle_backoff * 2 or 1, MAX_IDLE_BACKOFF)
+            self.idle_wait = self.idle_backoff
+            return False
+        self.idle_backoff = 0
+        end = tick_end if loop.timed else target
+        skip = (end - self.executed) // loop.length * loop.length
+        if not skip:
+            return False
+        cpu.v[:] = loop.registers
+        stop = self.executed + skip
+        while frame_start(self.ticks, self.ips) < stop:
+            cpu.decrement_timers()
+            self.ticks += 1
+        self.executed = stop
+        self.skipped += skip
+        return True
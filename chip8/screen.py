@@ -1,3 +1,5 @@
+import sys
+
 import pygame as pg
 
 from chip8.config import (
@@ -5,8 +7,9 @@ from chip8.config import (
     DEFAULT_SCALE,
     WHITE,
 )
-from chip8.constants import PIXEL_HEIGHT, PIXEL_WIDTH, SCREEN_HEIGHT, SCREEN_WIDTH
-from chip8.ctypes import Color, ScreenBuffer
+from chip8.constants import SCREEN_HEIGHT, SCREEN_WIDTH
+from chip8.ctypes import ScreenBuffer, Sprite
+from chip8.framebuffer import FrameBuffer
 
 
 class Screen:
@@ -14,54 +17,77 @@ class Screen:
 
     def __init__(self, scaler: int = DEFAULT_SCALE) -> None:
         self.scaler = scaler
-        self.buffer: ScreenBuffer = self._empty_buffer()  # pixel representation of display
+        self.frame = FrameBuffer()  # bit-packed pixel representation of display
         self.dirty = True  # only push frames when the framebuffer changes
 
         self.screen = pg.display.set_mode((SCREEN_WIDTH * scaler, SCREEN_HEIGHT * scaler))
+        # One texel per CHIP-8 pixel, in the window's format so it can be scaled straight in.
+        self.surface = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), 0, self.screen)
+        self.byte_pixels = self._byte_pixels()
         self.clear()
 
-    def flip_pixel(self, x: int = 0, y: int = 0) -> bool:
-        """Flip pixel at (x, y) coordinates."""
-        # wrap around screen
-        x %= SCREEN_WIDTH
-        y %= SCREEN_HEIGHT
+    @property
+    def buffer(self) -> ScreenBuffer:
+        """Unpacked copy of the display, one list of pixels per row."""
+        return self.frame.to_lists()
 
-        self.buffer[y][x] ^= 1
+    def flip_pixel(self, x: int = 0, y: int = 0) -> bool:
+        """Flip pixel at (x, y) coordinates, wrapping around the screen."""
         self.dirty = True
+        return self.frame.flip_pixel(x, y)  # was a pixel erased
 
-        # was a pixel erased
-        return not self.buffer[y][x]
-
-    def _empty_buffer(self) -> ScreenBuffer:
-        """Create a blank screen buffer."""
-        return [[0 for _ in range(SCREEN_WIDTH)] for _ in range(SCREEN_HEIGHT)]
+    def draw_sprite(self, x: int, y: int, sprite: Sprite) -> bool:
+        """XOR a sprite onto the screen at (x, y), return True on collision."""
+        self.dirty = True
+        return self.frame.draw_sprite(x, y, sprite)
 
     def clear(self) -> None:
         """Blank entire screen."""
-        self.buffer = self._empty_buffer()
+        self.frame.clear()
+        self.dirty = True
+
+    def load(self, rows: list[int] | tuple[int, ...]) -> None:
+        """Replace the framebuffer rows, from a restored save state."""
+        self.frame.load(rows)
         self.dirty = True
 
-    def draw_pixel(self, x: int, y: int) -> None:
-        """Draw a single buffer pixel at (x, y) coordinates."""
-        color: Color = WHITE if self.buffer[y][x] else BLACK
-        pg.draw.rect(
-            self.screen,
-            color,
-            [
-                x * self.scaler,
-                y * self.scaler,
-                PIXEL_WIDTH * self.scaler,
-                PIXEL_HEIGHT * self.scaler,
-            ],
-        )
+    def _byte_pixels(self) -> list[bytes]:
+        """Raw surface bytes for the eight pixels of every possible framebuffer byte."""
+        size = self.surface.get_bytesize()
+        on = self.surface.map_rgb(WHITE).to_bytes(size, sys.byteorder)
+        off = self.surface.map_rgb(BLACK).to_bytes(size, sys.byteorder)
+        return [
+            b"".join(on if byte & (0x80 >> bit) else off for bit in range(8)) for byte in range(256)
+        ]
 
     def update(self) -> None:
-        """Update entire visible screen."""
+        """Redraw and flush only the regions of the screen that changed."""
         if not self.dirty:
             return
 
-        for y in range(SCREEN_HEIGHT):
-            for x in range(SCREEN_WIDTH):
-                self.draw_pixel(x, y)
-        pg.display.update()
+        pixels = self.byte_pixels
+        self.surface.get_buffer().write(b"".join(pixels[byte] for byte in self.frame.to_bytes()))
+        scaler = self.scaler
+        areas: list[pg.Rect] = []
+        for x, y, width, height in self.frame.take_damage():
+            area = pg.Rect(x * scaler, y * scaler, width * scaler, height * scaler)
+            source = self.surface.subsurface((x, y, width, height))
+            pg.transform.scale(source, area.size, self.screen.subsurface(area))
+            areas.append(area)
+        if areas:
+            pg.display.update(areas)
+        self.dirty = False
+
+
+class HeadlessScreen(Screen):
+    """Framebuffer without a display window, for running with no video driver."""
+
+    def __init__(self, scaler: int = DEFAULT_SCALE) -> None:
+        self.scaler = scaler
+        self.frame = FrameBuffer()
+        self.dirty = True
+
+    def update(self) -> None:
+        """Mark the frame as presented without drawing anything."""
+        self.frame.take_damage()
         self.dirty = False
@@ -0,0 +1,57 @@
+import struct
+from typing import TYPE_CHECKING
+
+from chip8._exceptions import StateError
+from chip8.constants import MEMORY_SIZE, REGISTER_COUNT, SCREEN_HEIGHT, STACK_DEPTH
+
+if TYPE_CHECKING:
+    from chip8.cpu import CPU
+
+# Save state layout, one contiguous block:
+#   memory | V0-VF | pc, i, delay timer, sound timer, stack depth, rng | stack | framebuffer
+REGISTERS_OFFSET: int = MEMORY_SIZE
+HEADER = struct.Struct(">HIBBBI")  # i is unbounded by Fx1E, so give it 32 bits
+HEADER_OFFSET: int = REGISTERS_OFFSET + REGISTER_COUNT
+STACK = struct.Struct(f">{STACK_DEPTH}H")
+STACK_OFFSET: int = HEADER_OFFSET + HEADER.size
+FRAME = struct.Struct(f">{SCREEN_HEIGHT}Q")  # one 64-bit integer per row
+FRAME_OFFSET: int = STACK_OFFSET + STACK.size
+STATE_SIZE: int = FRAME_OFFSET + FRAME.size
+
+EMPTY_STACK: tuple[int, ...] = (0,) * STACK_DEPTH
+
+
+class MachineState:
+    """Fixed-size buffer holding everything needed to resume a machine.
+
+    Memory and the V registers live in the buffer all the time, through the
+    memoryview windows handed to RAM and the CPU. The pc, i, timers, stack,
+    random generator and framebuffer are plain attributes while running and
+    only packed into the buffer when a snapshot is taken.
+    """
+
+    def __init__(self) -> None:
+        self.buffer: bytearray = bytearray(STATE_SIZE)
+        view = memoryview(self.buffer)
+        self.memory: memoryview = view[:REGISTERS_OFFSET]
+        self.registers: memoryview = view[REGISTERS_OFFSET:HEADER_OFFSET]
+
+    def save(self, cpu: "CPU") -> None:
+        """Pack the CPU, sound timer and framebuffer into the buffer."""
+        stack = cpu.stack
+        depth = len(stack)
+        if depth > STACK_DEPTH:
+            raise StateError(f"Stack too deep to save: {depth} > {STACK_DEPTH}")
+        buffer = self.buffer
+        timers = cpu.delay_timer, cpu.audio.timer
+        HEADER.pack_into(buffer, HEADER_OFFSET, cpu.pc, cpu.i, *timers, depth, cpu.rng)
+        STACK.pack_into(buffer, STACK_OFFSET, *stack, *EMPTY_STACK[depth:])
+        FRAME.pack_into(buffer, FRAME_OFFSET, *cpu.screen.frame.rows)
+
+    def load(self, cpu: "CPU") -> None:
+        """Unpack the buffer back into the CPU, sound timer and framebuffer."""
+        buffer = self.buffer
+        header = HEADER.unpack_from(buffer, HEADER_OFFSET)
+        cpu.pc, cpu.i, cpu.delay_timer, cpu.audio.timer, depth, cpu.rng = header
+        cpu.stack[:] = STACK.unpack_from(buffer, STACK_OFFSET)[:depth]
+        cpu.screen.load(FRAME.unpack_from(buffer, FRAME_OFFSET))
@@ -0,0 +1,257 @@
+import asyncio
+import struct
+import sys
+from pathlib import Path
+
+from chip8._exceptions import StreamError
+from chip8.aio import AsyncChip8
+from chip8.constants import SCREEN_HEIGHT
+from chip8.framebuffer import ROW_BYTES
+from chip8.keypad import Keypad
+from chip8.screen import Screen
+
+KEYFRAME: int = 0  # packet holding the whole screen
+DELTA: int = 1  # packet holding only the rows that changed, XORed with the last frame
+KEYFRAME_INTERVAL: int = 60  # frames between keyframes, so a dropped packet heals in a second
+PACKET = struct.Struct(">BIH")  # kind, frame number, payload length
+CHANGED_ROWS = struct.Struct(">I")  # bit y set when row y changed, top row in the high bit
+FRAME_BYTES: int = SCREEN_HEIGHT * ROW_BYTES
+MAX_LITERAL: int = 128  # longest literal or repeat run one PackBits header covers
+MIN_REPEAT: int = 3  # shorter repeats cost less sent as literals
+POLL_INTERVAL: float = 1 / 60  # seconds between keypad polls while no packets arrive
+
+
+def pack_bits(data: bytes) -> bytes:
+    """PackBits run-length encode: runs of a repeated byte, everything else literal.
+
+    Header n below 128 is followed by n + 1 literal bytes, header n above 128
+    by one byte repeated 257 - n times.
+    """
+    out = bytearray()
+    literal_start = i = 0
+    size = len(data)
+    while i < size:
+        run = 1
+        while i + run < size and run < MAX_LITERAL and data[i + run] == data[i]:
+            run += 1
+        if run < MIN_REPEAT:
+            i += run
+            if i - literal_start >= MAX_LITERAL:
+                out.append(MAX_LITERAL - 1)
+                out += data[literal_start : literal_start + MAX_LITERAL]
+                literal_start += MAX_LITERAL
+            continue
+        if i > literal_start:
+            out.append(i - literal_start - 1)
+            out += data[literal_start:i]
+        out += bytes((257 - run, data[i]))
+        i += run
+        literal_start = i
+    while literal_start < size:
+        chunk = data[literal_start : literal_start + MAX_LITERAL]
+        out.append(len(chunk) - 1)
+        out += chunk
+        literal_start += len(chunk)
+    return bytes(out)
+
+
+def unpack_bits(data: bytes, size: int) -> bytes:
+    """Decode PackBits data that should expand to exactly size bytes."""
+    out = bytearray()
+    i = 0
+    try:
+        while i < len(data):
+            header = data[i]
+            if header < MAX_LITERAL:
+                out += data[i + 1 : i + header + 2]
+                i += header + 2
+            elif header > MAX_LITERAL:
+                out += bytes((data[i + 1],)) * (257 - header)
+                i += 2
+            else:
+                i += 1  # 128 is a no-op
+    except IndexError as e:
+        raise StreamError("Truncated run-length data") from e
+    if len(out) != size:
+        raise StreamError(f"Run-length data expanded to {len(out)} bytes, expected {size}")
+    return bytes(out)
+
+
+class FrameEncoder:
+    """Turns packed screens into keyframe and delta packets.
+
+    Deltas carry a bitmask of the rows that changed and the XOR of each of those
+    rows with the previous frame, run-length encoded, so a sprite moving a few
+    pixels costs a handful of bytes.
+    """
+
+    def __init__(self, keyframe_interval: int = KEYFRAME_INTERVAL) -> None:
+        self.keyframe_interval = keyframe_interval
+        self.previous: int | None = None  # last frame sent, as one big integer
+        self.keyframe_number = 0  # frame number of the last keyframe
+
+    def request_keyframe(self) -> None:
+        """Send the whole screen with the next frame, for a viewer that just joined."""
+        self.previous = None
+
+    def encode(self, number: int, pixels: bytes) -> bytes | None:
+        """Packet for a frame, or None if it didn't change and no keyframe is due."""
+        current = int.from_bytes(pixels)
+        if self.previous is None or number - self.keyframe_number >= self.keyframe_interval:
+            self.previous = current
+            self.keyframe_number = number
+            return self._packet(KEYFRAME, number, pack_bits(pixels))
+        if current == self.previous:
+            return None
+        changes = (current ^ self.previous).to_bytes(FRAME_BYTES)
+        self.previous = current
+        mask = 0
+        rows = bytearray()
+        for y in range(SCREEN_HEIGHT):
+            row = changes[y * ROW_BYTES : (y + 1) * ROW_BYTES]
+            if any(row):
+                mask |= 1 << (SCREEN_HEIGHT - 1 - y)
+                rows += row
+        return self._packet(DELTA, number, CHANGED_ROWS.pack(mask) + pack_bits(bytes(rows)))
+
+    @staticmethod
+    def _packet(kind: int, number: int, payload: bytes) -> bytes:
+        return PACKET.pack(kind, number, len(payload)) + payload
+
+
+class FrameDecoder:
+    """Rebuilds the screen from a stream of packets."""
+
+    def __init__(self) -> None:
+        self.rows: list[int] | None = None  # None until the first keyframe
+        self.number = 0  # frame number of the last packet applied
+
+    def decode(self, packet: bytes) -> list[int]:
+        """Apply one packet, header included, and return the screen rows."""
+        kind, number, length = PACKET.unpack_from(packet)
+        payload = packet[PACKET.size :]
+        if len(payload) != length:
+            raise StreamError(f"Packet payload is {len(payload)} bytes, header says {length}")
+        if kind == KEYFRAME:
+            pixels = unpack_bits(payload, FRAME_BYTES)
+            self.rows = [
+                int.from_bytes(pixels[y * ROW_BYTES : (y + 1) * ROW_BYTES])
+                for y in range(SCREEN_HEIGHT)
+            ]
+        elif kind == DELTA:
+            if self.rows is None:
+                raise StreamError("Delta packet before the first keyframe")
+            (mask,) = CHANGED_ROWS.unpack_from(payload)
+            changed = [y for y in range(SCREEN_HEIGHT) if mask >> (SCREEN_HEIGHT - 1 - y) & 1]
+            xors = unpack_bits(payload[CHANGED_ROWS.size :], len(changed) * ROW_BYTES)
+            for k, y in enumerate(changed):
+                self.rows[y] ^= int.from_bytes(xors[k * ROW_BYTES : (k + 1) * ROW_BYTES])
+        else:
+            raise StreamError(f"Unknown packet kind {kind}")
+        self.number = number
+        return self.rows
+
+
+async def read_packet(reader: asyncio.StreamReader) -> bytes | None:
+    """Read one whole packet from a stream, None at a clean end of stream."""
+    try:
+        header = await reader.readexactly(PACKET.size)
+    except asyncio.IncompleteReadError as e:
+        if e.partial:
+            raise StreamError("Stream ended partway through a packet header") from e
+        return None
+    _, _, length = PACKET.unpack(header)
+    try:
+        return header + await reader.readexactly(length)
+    except asyncio.IncompleteReadError as e:
+        raise StreamError("Stream ended partway through a packet") from e
+
+
+async def stream(machine: AsyncChip8, writer: asyncio.StreamWriter, frames: int | None) -> None:
+    """Run a machine and write its screen to a stream until it stops or the reader leaves."""
+    encoder = FrameEncoder()
+    subscription = machine.subscribe()
+    runner = asyncio.create_task(machine.run(frames))
+    try:
+        while (frame := await subscription.get()) is not None:
+            packet = encoder.encode(frame.number, frame.pixels)
+            if packet is not None:
+                writer.write(packet)
+                await writer.drain()
+    except ConnectionError:
+        pass  # viewer went away
+    finally:
+        machine.stop()
+        machine.unsubscribe(subscription)
+        await runner
+        writer.close()
+
+
+async def view(
+    reader: asyncio.StreamReader,
+    screen: Screen,
+    keypad: Keypad | None = None,
+) -> int:
+    """Draw a stream onto a screen until it ends or the keypad quits, return packets shown.
+
+    A still screen sends nothing, so the keypad is polled on a timer rather than
+    once per packet, keeping a window responsive while it waits.
+    """
+    decoder = FrameDecoder()
+    shown = 0
+    timeout = None if keypad is None else POLL_INTERVAL
+    # One read is kept going across polls, cancelling it could drop half a packet.
+    read = asyncio.ensure_future(read_packet(reader))
+    try:
+        while True:
+            done, _ = await asyncio.wait({read}, timeout=timeout)
+            if keypad is not None:
+                keypad.update()
+                if keypad.quit:
+                    break
+            if not done:
+                continue
+            packet = read.result()
+            if packet is None:
+                break
+            screen.load(decoder.decode(packet))
+            screen.update()
+            shown += 1
+            read = asyncio.ensure_future(read_packet(reader))
+    finally:
+        read.cancel()
+    return shown
+
+
+async def open_pipe_writer() -> asyncio.StreamWriter:
+    """Stream writer on stdout, for piping a stream into a viewer."""
+    loop = asyncio.get_running_loop()
+    transport, protocol = await loop.connect_write_pipe(
+        asyncio.streams.FlowControlMixin,
+        sys.stdout.buffer,
+    )
+    return asyncio.StreamWriter(transport, protocol, None, loop)
+
+
+async def open_pipe_reader() -> asyncio.StreamReader:
+    """Stream reader on stdin, for viewing a stream piped in."""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin.buffer)
+    return reader
+
+
+async def start_server(rom: str, socket: Path, frames: int | None = None) -> asyncio.Server:
+    """Listen on a unix socket, every connection getting its own machine running the ROM."""
+
+    async def session(_reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await stream(AsyncChip8(rom), writer, frames)
+
+    return await asyncio.start_unix_server(session, path=socket)
+
+
+async def serve(rom: str, socket: Path, frames: int | None = None) -> None:
+    """Serve a ROM on a unix socket until cancelled."""
+    server = await start_server(rom, socket, frames)
+    async with server:
+        await server.serve_forever()
@@ -0,0 +1,230 @@
+import gzip
+import io
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+from chip8._exceptions import ChipError, ExecuteError, TraceError
+from chip8.cpu import CPU
+from chip8.disasm import format_instruction
+from chip8.dispatch import INSTRUCTION_COUNT
+from chip8.opcodes import opcode_key
+
+MAGIC: bytes = b"C8TR"
+VERSION: int = 1
+HEADER = struct.Struct("<4sBB")  # magic, version, record size
+RECORD = struct.Struct("<HHHBB")  # pc, instruction word, I, register value, register number
+FIELDS: int = RECORD.size // 2  # unsigned shorts per record in the write buffer
+CHUNK_RECORDS: int = 1 << 16  # records buffered between writes, 512KiB
+NO_REGISTER: int = 0xFF  # register number of instructions that write no V register, value unset
+GZIP_MAGIC: bytes = b"\x1f\x8b"
+ZSTD_MAGIC: bytes = b"\x28\xb5\x2f\xfd"
+
+# Opcodes whose result lands in Vx. The ALU ops also set VF, but Vx is the result.
+WRITES_VX: frozenset[int] = frozenset(
+    {0x6000, 0x7000, 0xC000, 0xF007, 0xF00A, 0xF065}
+    | {0x8000 | op for op in (0x0, 0x1, 0x2, 0x3, 0x4, 0x5, 0x6, 0x7, 0xE)},
+)
+
+
+@cache
+def written_registers() -> bytes:
+    """V register each instruction word writes, or NO_REGISTER, built once per process."""
+    return bytes(
+        word >> 8 & 0xF if opcode_key(word) in WRITES_VX else NO_REGISTER
+        for word in range(INSTRUCTION_COUNT)
+    )
+
+
+@dataclass(frozen=True)
+class TraceRecord:
+    """One executed instruction read back from a trace."""
+
+    index: int  # instructions executed before this one
+    pc: int
+    word: int
+    i: int  # I after the instruction, low 16 bits
+    register: int | None  # V register the instruction wrote, if any
+    value: int  # what it wrote
+
+
+def _zstd() -> Any:  # noqa: ANN401
+    try:
+        import zstandard  # noqa: PLC0415
+    except ImportError as e:
+        raise TraceError("zstd traces need the zstandard package, install the zstd extra") from e
+    return zstandard
+
+
+def _open_write(path: Path) -> io.BufferedIOBase:
+    if path.suffix == ".gz":
+        return gzip.open(path, "wb", compresslevel=1)  # fast enough to keep up with the CPU
+    if path.suffix == ".zst":
+        return _zstd().open(path, "wb")
+    return path.open("wb")
+
+
+def _open_read(path: Path) -> io.BufferedIOBase:
+    with path.open("rb") as f:
+        start = f.read(len(ZSTD_MAGIC))
+    if start.startswith(GZIP_MAGIC):
+        return gzip.open(path, "rb")
+    if start == ZSTD_MAGIC:
+        return _zstd().open(path, "rb")
+    return path.open("rb")
+
+
+class TraceWriter:
+    """Fixed-size record per instruction, buffered in an array and written in big chunks.
+
+    The file is compressed with gzip when its name ends in .gz, or zstd for .zst.
+    """
+
+    def __init__(self, path: str | Path, chunk: int = CHUNK_RECORDS) -> None:
+        self.path = Path(path)
+        self.file = _open_write(self.path)
+        self.file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+        self.buffer = array("H", bytes(chunk * RECORD.size))
+        self.position = 0  # next free slot in the buffer, in shorts
+        self.records = 0  # records written out so far
+
+    def flush(self) -> None:
+        """Write out the buffered records."""
+        data = self.buffer[: self.position]
+        if sys.byteorder == "big":
+            data.byteswap()  # the file is little-endian
+        self.file.write(data.tobytes())
+        self.records += self.position // FIELDS
+        self.position = 0
+
+    def close(self) -> None:
+        """Write out what's left and close the file."""
+        if self.file.closed:
+            return
+        self.flush()
+        self.file.close()
+
+
+def _read(f: io.BufferedIOBase, size: int, path: str | Path) -> bytes:
+    """Up to size bytes of a trace, damaged compression raised as a TraceError."""
+    try:
+        return f.read(size)
+    except (OSError, EOFError, zlib.error) as e:
+        raise TraceError(f"{path} is corrupt: {e}") from e
+
+
+def read_trace(path: str | Path) -> Iterator[TraceRecord]:
+    """Every record in a trace file, in execution order."""
+    with _open_read(Path(path)) as f:
+        header = _read(f, HEADER.size, path)
+        if len(header) < HEADER.size:
+            raise TraceError(f"{path} is too short to be a trace")
+        magic, version, size = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise TraceError(f"{path} is not a trace file")
+        if version != VERSION or size != RECORD.size:
+            raise TraceError(f"Unsupported trace version {version}")
+        index = 0
+        while chunk := _read(f, CHUNK_RECORDS * RECORD.size, path):
+            if len(chunk) % RECORD.size:
+                raise TraceError(f"{path} ends partway through a record")
+            for pc, word, i, value, register in RECORD.iter_unpack(chunk):
+                written = None if register == NO_REGISTER else register
+                yield TraceRecord(index, pc, word, i, written, value)
+                index += 1
+
+
+def query(
+    records: Iterable[TraceRecord],
+    *,
+    pc: int | None = None,
+    mnemonic: str | None = None,
+    register: int | None = None,
+) -> Iterator[TraceRecord]:
+    """Records at an address, whose mnemonic starts with a prefix or that wrote a register."""
+    prefix = mnemonic.upper() if mnemonic else None
+    for record in records:
+        if pc is not None and record.pc != pc:
+            continue
+        if register is not None and record.register != register:
+            continue
+        if prefix is not None and not format_instruction(record.word).startswith(prefix):
+            continue
+        yield record
+
+
+def format_record(record: TraceRecord) -> str:
+    """One line listing a record, with the instruction disassembled."""
+    line = (
+        f"{record.index:>10}  {record.pc:03x}:  {record.word:04x}  "
+        f"{format_instruction(record.word):<20}  I={record.i:03x}"
+    )
+    if record.register is not None:
+        line += f"  V{record.register:X}={record.value:02x}"
+    return line
+
+
+class TracedCPU(CPU):
+    """An engine built by traced(), recording what it runs while it has a writer.
+
+    Mixed in ahead of the engine, it runs one instruction at a time through the
+    dispatch table where there is one, so block translation is given up while
+    tracing.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        super().__init__(*args, **kwargs)
+        self.trace: TraceWriter | None = None
+
+    def run(self, count: int) -> None:
+        """Execute count instructions one at a time, recording each."""
+        trace = self.trace
+        if trace is None:
+            super().run(count)
+            return
+        memory = self.ram.memory
+        table = getattr(self, "table", None)
+        step = self.step
+        v = self.v
+        writes = written_registers()
+        buffer, end = trace.buffer, len(trace.buffer)
+        k = trace.position
+        try:
+            for _ in range(count):
+                pc = self.pc
+                word = memory[pc] << 8 | memory[pc + 1]
+                if table is None:
+                    step()
+                else:
+                    table[word](self)
+                register = writes[word]
+                buffer[k] = pc
+                buffer[k + 1] = word
+                buffer[k + 2] = self.i & 0xFFFF
+                buffer[k + 3] = register << 8 | v[register & 0xF]
+                k += FIELDS
+                if k == end:
+                    trace.position = k
+                    trace.flush()
+                    k = 0
+        except ChipError:
+            raise
+        except Exception as e:
+            raise ExecuteError(f"Execution Error: {self.pc:04x} - {e}") from e
+        finally:
+            trace.position = k
+
+
+@cache
+def traced(engine: type[CPU]) -> type[TracedCPU]:
+    """Subclass an engine to record every instruction it runs to a TraceWriter.
+
+    Machines run untraced until a writer is put on their trace attribute.
+    """
+    return type(f"Traced{engine.__name__}", (TracedCPU, engine), {})
@@ -0,0 +1,355 @@
+from collections.abc import Callable
+
+import numpy as np
+
+from chip8.constants import (
+    BITWISE_OPERATORS,
+    CARRY_FLAG,
+    CPU_CYCLES_PER_TICK,
+    MEMORY_SIZE,
+    PC_INIT,
+    REGISTER_COUNT,
+    RNG_MASK,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+    STACK_DEPTH,
+)
+from chip8.opcodes import opcodes
+from chip8.ram import RAM
+
+type Indices = np.ndarray  # instance numbers an opcode runs on
+type VectorOp = Callable[..., None]  # (machine, indices, words, *opcode args)
+
+SPRITE_ROWS: int = 15  # most rows a DRW sprite can have
+
+
+def _x(words: np.ndarray) -> np.ndarray:
+    return (words >> 8) & 0xF
+
+
+def _y(words: np.ndarray) -> np.ndarray:
+    return (words >> 4) & 0xF
+
+
+def _skip(m: "VectorMachine", idx: Indices, condition: np.ndarray) -> None:
+    """Skip the next instruction where the condition holds."""
+    m.pc[idx] += 2 * condition
+
+
+def _cls(m: "VectorMachine", idx: Indices, _words: np.ndarray) -> None:
+    m.frame[idx] = 0
+
+
+def _ret(m: "VectorMachine", idx: Indices, _words: np.ndarray) -> None:
+    idx = m.fault(idx, m.sp[idx] == 0)
+    m.sp[idx] -= 1
+    m.pc[idx] = m.stack[idx, m.sp[idx]]
+
+
+def _jmp(m: "VectorMachine", idx: Indices, words: np.ndarray) -> None:
+    m.pc[idx] = words & 0x0FFF
+
+
+def _sub(m: "VectorMachine", idx: Indices, words: np.ndarray) -> None:
+    full = m.sp[idx] == STACK_DEPTH
+    words = words[~full]
+    idx = m.fault(idx, full)
+    m.stack[idx, m.sp[idx]] = m.pc[idx]
+    m.sp[idx] += 1
+    m.pc[idx] = words & 0x0FFF
+
+
+def _se_vx(m: "VectorMachine", idx: Indices, words: np.ndarray) -> None:
+    _skip(m, idx, m.v[idx, _x(words)] == (words & 0xFF))
+
+
+def _sne_vx(m: "VectorMachine", idx: Indices, words: np.ndarray) -> None:
+    _skip(m, idx, m.v[idx, _x(words)] != (words & 0xFF))
+
+
+def _se_vx_vy(m: "VectorMachine", idx: Indices, words: np.ndarray) -> None:
+    _skip(m, idx, m.v[idx, _x(words)] == m.v[idx, _y(words)])
+
+
+def _sne_vx_vy(m: "VectorMachine", idx: Indices, words: np.ndarray) -> None:
+    _skip(m, idx, m.v[idx, _x(words)] != m.v[idx, _y(words)])
+
+
+def _load_vx(m: "VectorMachine", idx: Indices, words: np.ndarray) -> None:
+    m.v[idx, _x(words)] = words & 0xFF
+
+
+def _add_vx_kk(m: "VectorMachine", idx: Indices, words: np.ndarray) -> None:
+    x = _x(words)
+    m.v[idx, x] = (m.v[idx, x] + (words & 0xFF)) & 0xFF
+
+
+def _set_vx_vy(m: "VectorMachine", idx: Indices, words: np.ndarray) -> None:
+    m.v[idx, _x(words)] = m.v[idx, _y(words)]
+
+
+def _bitwise_vx_vy(m: "VectorMachine", idx: Indices, words: np.ndarray, symbol: str) -> None:
+    x = _x(words)
+    m.v[idx, x] = BITWISE_OPERATORS[symbol](m.v[idx, x], m.v[idx, _y(words)])
+
+
+def _store_vx_result(m: "VectorMachine", idx: Indices, x: np.ndarray, value: np.ndarray) -> None:
+    """Store value in Vx and update VF, in the same order as the CPU."""
+    m.v[idx, CARRY_FLAG] = value >= 0
+    m.v[idx, x] = value & 0xFF
+
+
+def _add_vx_vy(m: "VectorMachine", idx: Indices, words: np.ndarray) -> None:
+    x = _x(words)
+    total = m.v[idx, x].astype(np.int32) + m.v[idx, _y(words)]
+    _store_vx_result(m, idx, x, total - 256)
+
+
+def _sub_vx_vy(m: "VectorMachine", idx: Indices, words: np.ndarray) -> None:
+    x = _x(words)
+    _store_vx_result(m, idx, x, m.v[idx, x].astype(np.int32) - m.v[idx, _y(words)])
+
+
+def _subn_vx_vy(m: "VectorMachine", idx: Indices, words: np.ndarray) -> None:
+    x = _x(words)
+    _store_vx_result(m, idx, x, m.v[idx, _y(words)].astype(np.int32) - m.v[idx, x])
+
+
+def _shr_vx(m: "VectorMachine", idx: Indices, words: np.ndarray) -> None:
+    x = _x(words)
+    m.v[idx, CARRY_FLAG] = m.v[idx, x] & 0x1
+    m.v[idx, x] = m.v[idx, x] >> 1
+
+
+def _shl_vx(m: "VectorMachine", idx: Indices, words: np.ndarray) -> None:
+    x = _x(words)
+    m.v[idx, CARRY_FLAG] = (m.v[idx, x] & 0x80) >> 7
+    m.v[idx, x] = m.v[idx, x] << 1
+
+
+def _load_i(m: "VectorMachine", idx: Indices, words: np.ndarray) -> None:
+    m.i[idx] = words & 0x0FFF
+
+
+def _jmp_v0_addr(m: "VectorMachine", idx: Indices, words: np.ndarray) -> None:
+    m.pc[idx] = (words & 0x0FFF) + m.v[idx, 0]
+
+
+def _rnd(m: "VectorMachine", idx: Indices, words: np.ndarray) -> None:
+    # Same xorshift as CPU.random_byte, uint32 arithmetic wraps like its mask.
+    state = m.rng[idx]
+    state ^= state << 13
+    state ^= state >> 17
+    state ^= state << 5
+    m.rng[idx] = state
+    m.v[idx, _x(words)] = state & (words & 0xFF)
+
+
+def _draw(m: "VectorMachine", idx: Indices, words: np.ndarray) -> None:
+    n = words & 0xF
+    overrun = m.i[idx] + n > MEMORY_SIZE
+    words, n = words[~overrun], n[~overrun]
+    idx = m.fault(idx, overrun)
+    m.v[idx, CARRY_FLAG] = 0  # cleared before Vx and Vy are read, as in the CPU
+    x = (m.v[idx, _x(words)] % SCREEN_WIDTH).astype(np.uint64)[:, None]
+    y = (m.v[idx, _y(words)] % SCREEN_HEIGHT).astype(np.int64)[:, None]
+
+    offsets = np.arange(SPRITE_ROWS)
+    present = offsets < n[:, None]
+    addresses = np.minimum(m.i[idx, None] + offsets, MEMORY_SIZE - 1)
+    sprite = np.where(present, m.memory[idx[:, None], addresses], 0).astype(np.uint64)
+    # Rotate each byte into place so columns past the right edge wrap, as FrameBuffer does.
+    bits = sprite << np.uint64(SCREEN_WIDTH - 8)
+    bits = (bits >> x) | ((bits << (np.uint64(SCREEN_WIDTH - 1) - x)) << np.uint64(1))
+    rows = (y + offsets) % SCREEN_HEIGHT
+    current = m.frame[idx[:, None], rows]
+    m.frame[idx[:, None], rows] = current ^ bits
+    m.v[idx, CARRY_FLAG] = (current & bits).any(axis=1)
+
+
+def _skp_vx(m: "VectorMachine", idx: Indices, words: np.ndarray, equal: bool) -> None:
+    pressed = m.keys[idx, m.v[idx, _x(words)] & 0xF]
+    _skip(m, idx, pressed == equal)
+
+
+def _wait(m: "VectorMachine", idx: Indices, words: np.ndarray) -> None:
+    keys = m.keys[idx]
+    pressed = keys.any(axis=1)
+    m.pc[idx[~pressed]] -= 2  # repeat this instruction until a key is down
+    m.v[idx[pressed], _x(words[pressed])] = keys[pressed].argmax(axis=1)
+
+
+def _load_dt_vx(m: "VectorMachine", idx: Indices, words: np.ndarray) -> None:
+    m.delay_timer[idx] = m.v[idx, _x(words)]
+
+
+def _load_st_vx(m: "VectorMachine", idx: Indices, words: np.ndarray) -> None:
+    m.sound_timer[idx] = m.v[idx, _x(words)]
+
+
+def _load_vx_dt(m: "VectorMachine", idx: Indices, words: np.ndarray) -> None:
+    m.v[idx, _x(words)] = m.delay_timer[idx]
+
+
+def _add_i_vx(m: "VectorMachine", idx: Indices, words: np.ndarray) -> None:
+    m.i[idx] += m.v[idx, _x(words)]
+
+
+def _load_f_vx(m: "VectorMachine", idx: Indices, words: np.ndarray) -> None:
+    m.i[idx] = m.v[idx, _x(words)].astype(np.int64) * 5
+
+
+def _registers_in_bounds(m: "VectorMachine", idx: Indices, words: np.ndarray) -> tuple:
+    """Halt instances whose V0..Vx block at I runs off memory, return the rest and their x."""
+    x = _x(words)
+    overrun = m.i[idx] + x >= MEMORY_SIZE
+    return m.fault(idx, overrun), x[~overrun]
+
+
+def _load_vx_i(m: "VectorMachine", idx: Indices, words: np.ndarray) -> None:
+    idx, x = _registers_in_bounds(m, idx, words)
+    for register in range(REGISTER_COUNT):
+        rows = idx[register <= x]
+        m.v[rows, register] = m.memory[rows, m.i[rows] + register]
+
+
+def _load_i_vx(m: "VectorMachine", idx: Indices, words: np.ndarray) -> None:
+    idx, x = _registers_in_bounds(m, idx, words)
+    for register in range(REGISTER_COUNT):
+        rows = idx[register <= x]
+        m.memory[rows, m.i[rows] + register] = m.v[rows, register]
+
+
+def _load_bcd(m: "VectorMachine", idx: Indices, words: np.ndarray) -> None:
+    overrun = m.i[idx] + 2 >= MEMORY_SIZE
+    words = words[~overrun]
+    idx = m.fault(idx, overrun)
+    value = m.v[idx, _x(words)]
+    i = m.i[idx]
+    m.memory[idx, i] = value // 100
+    m.memory[idx, i + 1] = (value // 10) % 10
+    m.memory[idx, i + 2] = value % 10
+
+
+# Vectorized counterpart of each CPU method named in the opcode table.
+VECTOR_OPS: dict[str, VectorOp] = {
+    "cls": _cls,
+    "ret": _ret,
+    "jmp": _jmp,
+    "sub": _sub,
+    "se_vx": _se_vx,
+    "sne_vx": _sne_vx,
+    "se_vx_vy": _se_vx_vy,
+    "load_vx": _load_vx,
+    "add_vx_kk": _add_vx_kk,
+    "set_vx_vy": _set_vx_vy,
+    "bitwise_vx_vy": _bitwise_vx_vy,
+    "add_vx_vy": _add_vx_vy,
+    "sub_vx_vy": _sub_vx_vy,
+    "subn_vx_vy": _subn_vx_vy,
+    "shr_vx": _shr_vx,
+    "shl_vx": _shl_vx,
+    "sne_vx_vy": _sne_vx_vy,
+    "load_i": _load_i,
+    "jmp_v0_addr": _jmp_v0_addr,
+    "rnd": _rnd,
+    "draw": _draw,
+    "skp_vx": _skp_vx,
+    "wait": _wait,
+    "load_dt_vx": _load_dt_vx,
+    "load_st_vx": _load_st_vx,
+    "load_vx_dt": _load_vx_dt,
+    "add_i_vx": _add_i_vx,
+    "load_f_vx": _load_f_vx,
+    "load_vx_i": _load_vx_i,
+    "load_i_vx": _load_i_vx,
+    "load_bcd": _load_bcd,
+}
+
+
+def opcode_keys(words: np.ndarray) -> np.ndarray:
+    """Vectorized opcode_key, masking each instruction to its opcode table key."""
+    group = words & 0xF000
+    wide = (group == 0x0000) | (group == 0xE000) | (group == 0xF000)
+    return np.where(wide, words & 0xF0FF, np.where(group == 0x8000, words & 0xF00F, group))
+
+
+class VectorMachine:
+    """Many instances of one ROM stepped in lockstep with NumPy.
+
+    Every piece of machine state is an array with the instance on the first
+    axis. Each step fetches one instruction per instance, groups the instances
+    by opcode and runs the opcode once over its group. An instance that would
+    make the CPU raise (bad opcode, stack or memory overrun) is marked halted
+    and stops stepping while the others carry on.
+    """
+
+    def __init__(self, rom_path: str, count: int, seeds: np.ndarray | None = None) -> None:
+        self.count = count
+        image = np.frombuffer(RAM(rom_path).memory, dtype=np.uint8)
+        self.memory: np.ndarray = np.tile(image, (count, 1))
+        self.v: np.ndarray = np.zeros((count, REGISTER_COUNT), dtype=np.uint8)
+        self.i: np.ndarray = np.zeros(count, dtype=np.int64)
+        self.pc: np.ndarray = np.full(count, PC_INIT, dtype=np.int64)
+        self.stack: np.ndarray = np.zeros((count, STACK_DEPTH), dtype=np.int64)
+        self.sp: np.ndarray = np.zeros(count, dtype=np.int64)
+        self.delay_timer: np.ndarray = np.zeros(count, dtype=np.uint8)
+        self.sound_timer: np.ndarray = np.zeros(count, dtype=np.uint8)
+        self.frame: np.ndarray = np.zeros((count, SCREEN_HEIGHT), dtype=np.uint64)  # packed rows
+        self.keys: np.ndarray = np.zeros((count, REGISTER_COUNT), dtype=np.uint8)
+        self.halted: np.ndarray = np.zeros(count, dtype=bool)
+        if seeds is None:
+            seeds = np.arange(count)
+        # Map seeds onto the same non-zero generator states CPU uses.
+        self.rng: np.ndarray = (np.asarray(seeds, dtype=np.uint64) % RNG_MASK + 1).astype(np.uint32)
+        self.executed = 0  # lockstep instructions run
+
+    def fault(self, idx: Indices, faulted: np.ndarray) -> Indices:
+        """Halt the instances where faulted is set, return the rest."""
+        self.halted[idx[faulted]] = True
+        return idx[~faulted]
+
+    def step(self) -> None:
+        """Fetch and execute one instruction on every running instance."""
+        idx = np.flatnonzero(~self.halted)
+        pc = self.pc[idx]
+        idx = self.fault(idx, (pc < 0) | (pc + 1 >= MEMORY_SIZE))
+        pc = self.pc[idx]
+        memory = self.memory
+        words = memory[idx, pc].astype(np.int64) << 8 | memory[idx, pc + 1]
+        keys = opcode_keys(words)
+        order = np.argsort(keys, kind="stable")
+        bounds = np.flatnonzero(np.diff(keys[order])) + 1
+        for group in np.split(order, bounds):
+            if not len(group):
+                continue
+            opcode = opcodes.get(int(keys[group[0]]))
+            if opcode is None:
+                self.halted[idx[group]] = True  # undecodable word
+                continue
+            members = idx[group]
+            VECTOR_OPS[opcode.call](self, members, words[group], *opcode.args)
+            if opcode.pc_inc:
+                members = members[~self.halted[members]]
+                self.pc[members] += opcode.length
+        self.executed += 1
+
+    def run(self, count: int) -> None:
+        """Execute count instructions without touching the timers."""
+        for _ in range(count):
+            self.step()
+
+    def decrement_timers(self) -> None:
+        """Decrement delay and sound timers."""
+        np.subtract(self.delay_timer, 1, out=self.delay_timer, where=self.delay_timer > 0)
+        np.subtract(self.sound_timer, 1, out=self.sound_timer, where=self.sound_timer > 0)
+
+    def cycle(self) -> None:
+        """Tick the timers then run one frame of instructions, like CPU.cycle."""
+        self.decrement_timers()
+        self.run(CPU_CYCLES_PER_TICK)
+
+    def pixels(self) -> np.ndarray:
+        """Framebuffers unpacked to one byte per pixel, shaped (count, 32, 64)."""
+        packed = self.frame.astype(">u8").view(np.uint8)
+        return np.unpackbits(packed.reshape(self.count, SCREEN_HEIGHT, -1), axis=-1)
@@ -0,0 +1,37 @@
+from collections.abc import Sequence
+from itertools import count
+from pathlib import Path
+
+import pytest
+
+from chip8.audio import HeadlessAudio
+from chip8.cpu import CPU
+from chip8.keypad import HeadlessKeypad
+from chip8.ram import RAM
+from chip8.screen import HeadlessScreen
+from tests.helpers import MachineFactory, RomWriter
+
+
+@pytest.fixture
+def write_rom(tmp_path: Path) -> RomWriter:
+    """Write ROM files into the test's temporary directory."""
+    numbers = count()
+
+    def write(program: Sequence[int] | bytes) -> str:
+        # Encode each 16-bit instruction big-endian, raw bytes go out as they are.
+        data = program if isinstance(program, bytes) else b"".join(w.to_bytes(2) for w in program)
+        rom_path = tmp_path / f"rom{next(numbers)}.ch8"
+        rom_path.write_bytes(data)
+        return str(rom_path)
+
+    return write
+
+
+@pytest.fixture
+def build() -> MachineFactory:
+    """Create headless CPUs, each with its own RAM, screen and keypad."""
+
+    def build[T: CPU](engine: type[T], rom: str | Path, seed: int | None = 1) -> T:
+        return engine(RAM(str(rom)), HeadlessScreen(), HeadlessKeypad(), HeadlessAudio(), seed)
+
+    return build
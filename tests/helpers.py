@@ -0,0 +1,21 @@
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Protocol
+
+from chip8.cpu import CPU
+
+
+class RomWriter(Protocol):
+    """Writes a ROM file and returns its path."""
+
+    def __call__(self, program: Sequence[int] | bytes) -> str:
+        """Write instructions, or raw bytes, out as a new ROM file."""
+        ...
+
+
+class MachineFactory(Protocol):
+    """Builds a headless CPU of an engine."""
+
+    def __call__[T: CPU](self, engine: type[T], rom: str | Path, seed: int | None = 1) -> T:
+        """Create a CPU of the engine running a ROM."""
+        ...
@@ -0,0 +1,87 @@
+import asyncio
+
+from chip8.aio import AsyncChip8, Frame
+from chip8.chip8 import Chip8
+from chip8.dispatch import DispatchCPU
+from tests.helpers import RomWriter
+
+ROM = "roms/particle.ch8"
+
+
+def test_machines_share_one_loop() -> None:
+    # Several machines run side by side and each ends where a blocking run would.
+    machines = [AsyncChip8(ROM, fps=0, seed=seed) for seed in (1, 2, 3)]
+
+    async def main() -> None:
+        await asyncio.gather(*(machine.run(120) for machine in machines))
+
+    asyncio.run(main())
+
+    for seed, machine in zip((1, 2, 3), machines, strict=True):
+        blocking = Chip8(ROM, headless=True, uncapped=True, seed=seed, engine=DispatchCPU)
+        blocking.run(120)
+        assert machine.chip8.digest() == blocking.digest()
+        assert machine.chip8.frames == 120
+
+
+def test_client_input_and_frames(write_rom: RomWriter) -> None:
+    # WAIT V3 / LD F, V3 / DRW V0, V0, 5 / JP 206: draws the digit of the pressed key.
+    machine = AsyncChip8(write_rom([0xF30A, 0xF329, 0xD005, 0x1206]), fps=0)
+    received: list[Frame] = []
+
+    async def client() -> None:
+        frames = machine.subscribe(backlog=100)
+        await machine.inputs.put(1 << 7)
+        while (frame := await frames.get()) is not None:
+            received.append(frame)
+        machine.unsubscribe(frames)
+
+    async def main() -> None:
+        spectator = asyncio.create_task(client())
+        await asyncio.sleep(0)
+        await machine.run(10)
+        await spectator
+
+    asyncio.run(main())
+
+    assert machine.chip8.cpu.v[3] == 7
+    assert machine.error is None
+    assert [frame.number for frame in received] == [1]  # only frames that change are sent
+    assert received[-1].pixels[0] == 0xF0  # top row of the 7 glyph
+
+
+def test_slow_subscriber_keeps_latest(write_rom: RomWriter) -> None:
+    # A subscriber that never reads holds only the newest frames and the end marker.
+    machine = AsyncChip8(write_rom([0x6000, 0xF029, 0xD005, 0x1204]), fps=0)
+
+    async def main() -> asyncio.Queue:
+        frames = machine.subscribe(backlog=2)
+        await machine.run(20)
+        return frames
+
+    frames = asyncio.run(main())
+
+    assert frames.qsize() == 2
+    assert frames.get_nowait().number == 20
+    assert frames.get_nowait() is None
+
+
+def test_fault_ends_run(write_rom: RomWriter) -> None:
+    # Running into an undecodable word stops the machine and records why.
+    machine = AsyncChip8(write_rom([0x0000]), fps=0)
+    asyncio.run(machine.run())
+    assert machine.error is not None
+    assert not machine.running
+
+
+def test_capped_run_paces_frames() -> None:
+    # At 120 frames per second, 12 frames take about a tenth of a second.
+    machine = AsyncChip8(ROM, fps=120, seed=1)
+
+    async def main() -> float:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await machine.run(12)
+        return loop.time() - start
+
+    assert asyncio.run(main()) >= 0.09
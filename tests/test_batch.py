@@ -0,0 +1,132 @@
+import hashlib
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from chip8.__main__ import run
+from chip8._exceptions import BatchError
+from chip8.batch import Job, load_jobs, run_batch, run_job
+from chip8.chip8 import Chip8
+from chip8.movie import Movie, rom_digest
+
+ROMS = Path("roms")
+
+
+def test_job_runs_to_its_cycle_budget() -> None:
+    result = run_job(Job(str(ROMS / "maze.ch8"), seed=3, cycles=1000))
+
+    assert result["executed"] == 1000
+    assert result["error"] is None
+    assert len(result["v"]) == 16
+    assert json.loads(json.dumps(result)) == result
+
+
+def test_job_reports_a_halted_machine() -> None:
+    result = run_job(Job(str(ROMS / "person.ch8"), cycles=1000))
+
+    assert result["executed"] < 1000
+    assert "decode" in result["error"]
+
+
+def test_job_replays_a_movie(tmp_path: Path) -> None:
+    # A movie job ends on the same screen as the recorded run.
+    rom = str(ROMS / "keyboard.ch8")
+    movie = tmp_path / "run.c8m"
+    chip8 = Chip8(rom, headless=True, uncapped=True, seed=5, record=str(movie))
+    chip8.run(frames=20)
+    chip8.keypad.pressed_keys[0xA] = 1
+    chip8.run(frames=40)
+
+    result = run_job(Job(rom, movie=str(movie), cycles=chip8.scheduler.executed))
+    screen = hashlib.sha1(chip8.screen.frame.to_bytes()).hexdigest()  # noqa: S324
+    assert result["framebuffer"] == screen
+    assert result["pc"] == chip8.cpu.pc
+
+
+def test_slow_movie_job_finishes(tmp_path: Path) -> None:
+    # Under 60 instructions a second some frames run nothing, the job still gets there.
+    rom = str(ROMS / "maze.ch8")
+    movie = tmp_path / "slow.c8m"
+    Movie(seed=1, ips=30, rom=rom_digest(rom)).save(movie)
+
+    result = run_job(Job(rom, movie=str(movie), cycles=100))
+
+    assert result["executed"] == 100
+    assert result["error"] is None
+
+
+def test_directory_makes_a_job_per_rom() -> None:
+    jobs = load_jobs(ROMS, cycles=500, seed=2, engine="block")
+
+    assert [Path(job.rom).name for job in jobs] == sorted(rom.name for rom in ROMS.glob("*.ch8"))
+    assert all(job.cycles == 500 and job.seed == 2 and job.engine == "block" for job in jobs)
+
+
+def test_manifest_paths_are_relative_to_it(tmp_path: Path) -> None:
+    manifest = tmp_path / "jobs.jsonl"
+    lines = [{"rom": "a.ch8", "seed": 9}, {"rom": "b.ch8", "movie": "b.c8m", "cycles": 10}]
+    manifest.write_text("\n".join(json.dumps(line) for line in lines) + "\n")
+
+    jobs = load_jobs(manifest, cycles=500, seed=0, engine="dispatch")
+
+    assert jobs == [
+        Job(str(tmp_path / "a.ch8"), seed=9, cycles=500),
+        Job(str(tmp_path / "b.ch8"), movie=str(tmp_path / "b.c8m"), cycles=10),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("line", "problem"),
+    [
+        ("{not json", "Expecting"),
+        ('{"seed": 1}', "has no rom"),
+        ("[1, 2]", "cannot convert"),
+        ('{"rom": "a.ch8", "speed": 2}', "speed"),
+    ],
+)
+def test_bad_manifest_lines_name_the_line(tmp_path: Path, line: str, problem: str) -> None:
+    manifest = tmp_path / "jobs.jsonl"
+    manifest.write_text(f'{{"rom": "a.ch8"}}\n\n{line}\n')
+
+    with pytest.raises(BatchError, match=problem) as error:
+        load_jobs(manifest, cycles=500, seed=0, engine="dispatch")
+    assert f"line 3 of {manifest}" in str(error.value)
+    result = CliRunner().invoke(run, ["batch", str(manifest)])
+    assert result.exit_code == 1
+    assert "line 3" in result.output
+
+
+def test_batch_matches_single_runs() -> None:
+    jobs = [Job(str(ROMS / name), seed=1, cycles=2000) for name in ("maze.ch8", "tank.ch8")]
+
+    results = sorted(run_batch(jobs, workers=2), key=lambda result: result["rom"])
+
+    for job, result in zip(jobs, results, strict=True):
+        expected = run_job(job)
+        assert {**result, "seconds": 0} == {**expected, "seconds": 0}
+
+
+def test_bad_jobs_only_fail_themselves(tmp_path: Path) -> None:
+    movie = tmp_path / "other.c8m"
+    Movie(seed=1, ips=720, rom=bytes(20)).save(movie)
+    maze = str(ROMS / "maze.ch8")
+    jobs = [
+        Job(str(tmp_path / "missing.ch8")),
+        Job(maze, engine="nope"),
+        Job(maze, movie=str(movie)),
+        Job(maze, movie=str(tmp_path / "missing.c8m")),
+        Job(maze, cycles=100),
+    ]
+
+    results = [run_job(job) for job in jobs]
+
+    assert [result["error"] is None for result in results] == [False] * 4 + [True]
+    assert "not found" in results[0]["error"]
+    assert "Unknown engine nope" in results[1]["error"]
+    assert "not recorded on" in results[2]["error"]
+    assert results[2]["pc"] is None
+    assert results[2]["executed"] == 0
+    assert results[4]["executed"] == 100
+    assert len(list(run_batch(jobs[:2], workers=1))) == 2
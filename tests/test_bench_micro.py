@@ -0,0 +1,34 @@
+from pathlib import Path
+
+import pytest
+
+from benchmarks.micro import UNROLL, programs
+from chip8.audio import HeadlessAudio
+from chip8.chip8 import ENGINES
+from chip8.cpu import CPU
+from chip8.keypad import HeadlessKeypad
+from chip8.ram import RAM
+from chip8.screen import HeadlessScreen
+
+PROGRAMS = programs()
+
+
+@pytest.mark.parametrize("name", PROGRAMS)
+@pytest.mark.parametrize("engine", ENGINES.values())
+def test_program_loops_forever(tmp_path: Path, engine: type[CPU], name: str) -> None:
+    """Every generated program keeps running in its loop without faulting."""
+    rom = tmp_path / f"{name}.ch8"
+    rom.write_bytes(PROGRAMS[name])
+    cpu = engine(RAM(str(rom)), HeadlessScreen(), HeadlessKeypad(), HeadlessAudio(), 0)
+    cpu.run(UNROLL * 40)
+    assert 0x200 <= cpu.pc < 0x200 + len(PROGRAMS[name])
+
+
+def test_call_chain_returns(tmp_path: Path) -> None:
+    """The CALL/RET chain unwinds fully before jumping back to the top."""
+    rom = tmp_path / "call_ret.ch8"
+    rom.write_bytes(PROGRAMS["call_ret"])
+    cpu = CPU(RAM(str(rom)), HeadlessScreen(), HeadlessKeypad(), HeadlessAudio(), 0)
+    cpu.run(15 + 15 + 1)
+    assert cpu.pc == 0x200
+    assert not cpu.stack
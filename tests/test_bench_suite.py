@@ -0,0 +1,44 @@
+from benchmarks.suite import compare, flatten, scripted_keys
+
+BASELINE = {
+    "meta": {"python": "3.13"},
+    "roms": {"walk.ch8": {"dispatch": {"instructions": 24000, "ips": 1000.0}}},
+    "state": {"dispatch": {"restore_us": 10.0}},
+}
+
+
+def test_flatten_skips_metadata() -> None:
+    """Only measured numbers are compared, keyed by their path."""
+    assert flatten(BASELINE) == {
+        "roms.walk.ch8.dispatch.ips": 1000.0,
+        "state.dispatch.restore_us": 10.0,
+    }
+
+
+def test_compare_within_threshold() -> None:
+    """Small changes either way are not regressions."""
+    results = {
+        "roms": {"walk.ch8": {"dispatch": {"ips": 950.0}}},
+        "state": {"dispatch": {"restore_us": 10.5}},
+    }
+    assert compare(results, BASELINE, 0.1) == []
+
+
+def test_compare_flags_regressions() -> None:
+    """Rates that drop and latencies that rise past the threshold are reported."""
+    results = {
+        "roms": {"walk.ch8": {"dispatch": {"ips": 800.0}}},
+        "state": {"dispatch": {"restore_us": 12.0}},
+    }
+    regressions = compare(results, BASELINE, 0.1)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("roms.walk.ch8.dispatch.ips")
+    assert regressions[1].startswith("state.dispatch.restore_us")
+
+
+def test_scripted_keys_cycle() -> None:
+    """Each key is held in turn, with gaps of no keys between."""
+    assert scripted_keys(0) == 1
+    assert scripted_keys(15) == 0
+    assert scripted_keys(30) == 1 << 1
+    assert scripted_keys(30 * 16) == 1
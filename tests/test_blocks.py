@@ -0,0 +1,109 @@
+from pathlib import Path
+
+import pytest
+
+from chip8._exceptions import ChipError
+from chip8.blocks import BlockCPU, compile_block
+from chip8.constants import PC_INIT
+from chip8.cpu import CPU
+from chip8.ram import RAM
+from tests.helpers import MachineFactory, RomWriter
+
+ROMS = sorted(Path("roms").glob("*.ch8"))
+
+
+def test_block_ends_at_control_flow(write_rom: RomWriter) -> None:
+    # LD, ADD, then JP closes the block and sets its length.
+    ram = RAM(write_rom([0x6A0F, 0x7A01, 0x1200, 0x6B01]))
+    block = compile_block(ram.memory, PC_INIT)
+
+    assert block is not None
+    assert block.length == 3
+    assert block.end == PC_INIT + 6
+
+
+def test_block_respects_limit(write_rom: RomWriter) -> None:
+    # Blocks can be cut short to fit the remaining instruction budget.
+    ram = RAM(write_rom([0x6A0F, 0x7A01, 0x7A01, 0x1200]))
+    block = compile_block(ram.memory, PC_INIT, limit=2)
+
+    assert block is not None
+    assert block.length == 2
+    assert "return 516" in block.source
+
+
+def test_undecodable_word_does_not_start_block(write_rom: RomWriter) -> None:
+    # Invalid instructions are left for the dispatch engine to report.
+    ram = RAM(write_rom([0x0000]))
+    assert compile_block(ram.memory, PC_INIT) is None
+
+
+def test_block_runs_register_ops(write_rom: RomWriter, build: MachineFactory) -> None:
+    # Execute a block and check registers plus the returned program counter.
+    cpu = build(BlockCPU, write_rom([0x6A0F, 0x7A01, 0x8AB4, 0x1200]))
+    cpu.v[0xB] = 0xF0
+
+    cpu.run(4)
+
+    assert cpu.v[0xA] == 0x00
+    assert cpu.v[0xF] == 1
+    assert cpu.pc == PC_INIT
+
+
+def test_memory_write_invalidates_block(write_rom: RomWriter, build: MachineFactory) -> None:
+    # Writing into a translated range drops the cached block.
+    cpu = build(BlockCPU, write_rom([0x6A0F, 0x1200]))
+    assert isinstance(cpu, BlockCPU)
+    cpu.run(2)
+    assert PC_INIT in cpu.blocks
+
+    cpu.ram[PC_INIT + 1] = 0x10
+
+    assert PC_INIT not in cpu.blocks
+
+
+def test_register_store_invalidates_block(write_rom: RomWriter, build: MachineFactory) -> None:
+    # FX55 storing over the running code drops its block, and the new bytes run next.
+    cpu = build(BlockCPU, write_rom([0xA202, 0x6012, 0x6108, 0xF155, 0x1202]))
+    assert isinstance(cpu, BlockCPU)
+    cpu.run(4)
+    assert PC_INIT not in cpu.blocks
+
+    cpu.run(2)
+
+    assert cpu.pc == PC_INIT + 8  # JP 208 written over LD V0, 12
+
+
+def test_self_modifying_rom_matches_reference(write_rom: RomWriter, build: MachineFactory) -> None:
+    # The loop rewrites its own ADD immediate from 1 to 0x10 via FX55.
+    rom_path = write_rom([0x6A00, 0x7A01, 0xA203, 0x6010, 0xF055, 0x1202])
+    reference = build(CPU, rom_path)
+    block = build(BlockCPU, rom_path)
+
+    for _ in range(16):
+        reference.step()
+    block.run(16)
+
+    assert reference.v[0xA] == 0x21
+    assert block.v == reference.v
+    assert block.pc == reference.pc
+
+
+@pytest.mark.parametrize("rom", ROMS, ids=[rom.name for rom in ROMS])
+def test_bundled_roms_match_reference(rom: Path, build: MachineFactory) -> None:
+    # Translated blocks should walk the same path through each bundled ROM.
+    reference = build(CPU, rom)
+    block = build(BlockCPU, rom)
+    for _ in range(200):
+        try:
+            reference.cycle()
+        except ChipError:
+            with pytest.raises(ChipError):
+                block.cycle()
+            break
+        block.cycle()
+        assert block.pc == reference.pc
+        assert block.v == reference.v
+        assert block.i == reference.i
+        assert block.screen.buffer == reference.screen.buffer
+    assert block.ram[PC_INIT:] == reference.ram[PC_INIT:]
@@ -0,0 +1,150 @@
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from chip8.__main__ import run
+from chip8.audio import HeadlessAudio
+from chip8.chip8 import Chip8
+from chip8.constants import CPU_CYCLES_PER_TICK
+from chip8.dispatch import DispatchCPU
+from chip8.keypad import HeadlessKeypad
+from chip8.screen import HeadlessScreen
+
+
+@pytest.fixture
+def rom_path(tmp_path: Path) -> Path:
+    """Write a ROM that loads a register then loops forever."""
+    # LD VA, 0x0F then JP to itself.
+    rom_path = tmp_path / "loop.ch8"
+    rom_path.write_bytes(b"\x6a\x0f\x12\x02")
+    return rom_path
+
+
+def test_headless_machine_skips_pygame(rom_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Build a machine without initializing pygame, a display or the mixer.
+    def _fail(*_args: object) -> None:
+        raise AssertionError("headless machine touched pygame")
+
+    monkeypatch.setattr("chip8.chip8.pg.init", _fail)
+    monkeypatch.setattr("chip8.screen.pg.display.set_mode", _fail)
+    monkeypatch.setattr("chip8.audio.mixer.init", _fail)
+
+    chip8 = Chip8(str(rom_path), headless=True)
+    chip8.cpu.cycle()
+
+    assert isinstance(chip8.screen, HeadlessScreen)
+    assert isinstance(chip8.keypad, HeadlessKeypad)
+    assert isinstance(chip8.audio, HeadlessAudio)
+    assert chip8.cpu.v[0xA] == 0x0F
+
+
+def test_backends_can_be_supplied(rom_path: Path) -> None:
+    # Passed-in backends are wired into the CPU unchanged.
+    screen = HeadlessScreen()
+    keypad = HeadlessKeypad()
+    audio = HeadlessAudio()
+
+    chip8 = Chip8(str(rom_path), headless=True, screen=screen, keypad=keypad, audio=audio)
+
+    assert chip8.cpu.screen is screen
+    assert chip8.cpu.keypad is keypad
+    assert chip8.cpu.audio is audio
+
+
+def test_turbo_skips_frames_and_reports(rom_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    # Turbo draws one frame in frame_skip and prints throughput when the run ends.
+    chip8 = Chip8(str(rom_path), headless=True, turbo=True, frame_skip=5, engine=DispatchCPU)
+
+    chip8.run(frames=20)
+
+    assert isinstance(chip8.cpu, DispatchCPU)
+    assert chip8.scheduler.uncapped is True
+    assert chip8.scheduler.executed == 20 * CPU_CYCLES_PER_TICK
+    assert chip8.drawn == 4
+    skipped = chip8.scheduler.skipped
+    assert skipped > 0
+    # Instructions fast-forwarded through the idle loop aren't counted as interpreted.
+    out = capsys.readouterr().out
+    assert f"{20 * CPU_CYCLES_PER_TICK - skipped:,} instructions interpreted" in out
+    assert f"{skipped:,} instructions skipped idle" in out
+
+
+def test_cli_rejects_a_frame_skip_of_zero(rom_path: Path) -> None:
+    args = ["-r", str(rom_path), "--headless", "--turbo", "--frame-skip", "0", "--frames", "1"]
+    result = CliRunner().invoke(run, args)
+
+    assert result.exit_code == 2
+    assert "--frame-skip" in result.output
+
+
+def test_cli_rejects_an_ips_of_zero(rom_path: Path) -> None:
+    args = ["-r", str(rom_path), "--headless", "--ips", "0", "--frames", "1"]
+    result = CliRunner().invoke(run, args)
+
+    assert result.exit_code == 2
+    assert "--ips" in result.output
+
+
+def test_cli_rejects_negative_rewind(rom_path: Path) -> None:
+    args = ["-r", str(rom_path), "--headless", "--rewind", "-1", "--frames", "1"]
+    result = CliRunner().invoke(run, args)
+
+    assert result.exit_code == 2
+    assert "--rewind" in result.output
+
+
+def test_cli_rejects_negative_frames(rom_path: Path) -> None:
+    result = CliRunner().invoke(run, ["-r", str(rom_path), "--headless", "--frames", "-1"])
+
+    assert result.exit_code == 2
+    assert "--frames" in result.output
+
+
+def test_cli_reports_an_unloadable_rom(tmp_path: Path) -> None:
+    runner = CliRunner()
+    result = runner.invoke(run, ["-r", str(tmp_path / "missing.ch8"), "--headless"])
+    assert result.exit_code == 1
+    assert "ROM file not found" in result.output
+
+    big = tmp_path / "big.ch8"
+    big.write_bytes(bytes(4096))
+    result = runner.invoke(run, ["-r", str(big), "--headless", "--frames", "1"])
+    assert result.exit_code == 1
+    assert "ROM size exceeds available memory" in result.output
+
+
+def test_normal_run_draws_every_frame(rom_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    # Without turbo every frame is drawn and nothing is reported.
+    chip8 = Chip8(str(rom_path), headless=True, uncapped=True, frame_skip=5)
+
+    chip8.run(frames=3)
+
+    assert chip8.drawn == 3
+    assert capsys.readouterr().out == ""
+
+
+def test_rewind_key_steps_back_through_frames(rom_path: Path) -> None:
+    # Holding the rewind key restores recorded frames instead of running new ones.
+    chip8 = Chip8(str(rom_path), headless=True, uncapped=True, rewind=1)
+    chip8.run(frames=5)
+    executed = chip8.scheduler.executed
+    chip8.cpu.v[0xA] = 0
+
+    chip8.keypad.rewinding = True
+    chip8.run(frames=6)
+
+    assert chip8.scheduler.executed == executed
+    assert chip8.rewind is not None
+    assert len(chip8.rewind) == 4
+    assert chip8.cpu.v[0xA] == 0x0F
+
+
+def test_quit_key_ends_the_run(rom_path: Path) -> None:
+    # The loop stops when the keypad asks to quit instead of exiting the process.
+    chip8 = Chip8(str(rom_path), headless=True, uncapped=True)
+    chip8.keypad.quit = True
+
+    chip8.run()
+
+    assert chip8.frames == 0
@@ -3,7 +3,7 @@ from pathlib import Path
 import pytest
 
 from chip8.audio import Audio
-from chip8.constants import CPU_CYCLES_PER_TICK, FONT, PC_INIT, REGISTER_COUNT
+from chip8.constants import CPU_CYCLES_PER_TICK, FONT, MEMORY_SIZE, PC_INIT, REGISTER_COUNT
 from chip8.cpu import CPU
 from chip8.keypad import Keypad
 from chip8.ram import RAM
@@ -73,6 +73,25 @@ def test_ram_starts_with_font_and_rom_bytes(cpu_factory: CPU) -> None:
     assert cpu.ram[PC_INIT : PC_INIT + 4] == [0x6A, 0x0F, 0x7A, 0x01]
 
 
+def test_ram_bulk_read_and_write(cpu_factory: CPU) -> None:
+    """Bulk access checks the whole range once and reports writes as one run."""
+    # Record on_write calls to check a bulk write is reported once.
+    ram = cpu_factory.ram
+    writes: list[tuple[int, int]] = []
+    ram.on_write = lambda address, length: writes.append((address, length))
+
+    ram.write(0x300, b"\x01\x02\x03")
+
+    assert bytes(ram.read(0x300, 3)) == b"\x01\x02\x03"
+    assert writes == [(0x300, 3)]
+    with pytest.raises(TypeError):
+        ram.read(0x300, 3)[0] = 9  # windows are read-only, writes go through write
+    with pytest.raises(IndexError):
+        ram.write(MEMORY_SIZE - 1, b"\x00\x00")
+    with pytest.raises(IndexError):
+        ram.read(-1, 2)
+
+
 def test_decode_and_execute_progress_instruction(cpu_factory: CPU) -> None:
     """Decode and execute should update register state."""
     # Execute two instructions and check arithmetic result.
@@ -99,3 +118,17 @@ def test_cycle_runs_configured_instructions_and_timers(cpu_factory: CPU) -> None
     assert cpu.delay_timer == 1
     assert cpu.pc == PC_INIT + (CPU_CYCLES_PER_TICK * 2)
     assert screen.clear_calls == 10
+
+
+def test_seed_reproduces_random_bytes(tmp_path: Path) -> None:
+    """Machines built with the same seed draw the same random bytes."""
+    # Compare the random streams of two equal seeds and one different seed.
+    rom_path = tmp_path / "empty.ch8"
+    rom_path.write_bytes(b"")
+    cpus = [
+        CPU(RAM(str(rom_path)), DummyScreen(), DummyKeypad(), Audio(mute=True), seed)
+        for seed in (3, 3, 4)
+    ]
+    first, second, other = ([cpu.random_byte() for _ in range(32)] for cpu in cpus)
+    assert first == second
+    assert first != other
@@ -0,0 +1,55 @@
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from chip8.__main__ import run
+from chip8.constants import MEMORY_SIZE, PC_INIT
+from chip8.disasm import disassemble, format_instruction, render_dot
+
+# LD I, 20c / CALL 208 / SE V0, 01 / JP 204 / DRW V0, V1, 1 / RET / two sprite bytes
+ROM = bytes.fromhex("a20c 2208 3001 1204 d011 00ee f090")
+
+
+def test_format_instruction_fills_operands() -> None:
+    """Operand placeholders in the opcode labels are replaced by their values."""
+    assert format_instruction(0xD125) == "DRW V1, V2, 5"
+    assert format_instruction(0x6A0F) == "LD VA, 0x0f"
+    assert format_instruction(0x1234) == "JMP 0x234"
+    assert format_instruction(0x0000) == "DB 0x00, 0x00"
+
+
+def test_code_and_data_are_separated() -> None:
+    """Only bytes reached by control flow are code, I targets are data."""
+    program = disassemble(ROM)
+    assert sorted(program.instructions) == [0x200, 0x202, 0x204, 0x206, 0x208, 0x20A]
+    assert program.data_refs == {0x20C}
+    assert program.code_mask() == bytearray([1] * 12 + [0] * 2)
+
+
+def test_basic_blocks_and_edges() -> None:
+    """Blocks start at every target and end at every branch."""
+    program = disassemble(ROM)
+    assert sorted(program.blocks) == [0x200, 0x204, 0x206, 0x208]
+    assert program.blocks[PC_INIT].successors == ((0x208, "call"), (0x204, "return"))
+    assert program.blocks[0x204].successors == ((0x206, "next"), (0x208, "skip"))
+    assert program.blocks[0x208].end == 0x20C
+    assert "b206 -> b204" in render_dot(program)
+
+
+def test_disasm_command(tmp_path: Path) -> None:
+    """The disasm subcommand lists labelled code and sprite data."""
+    rom = tmp_path / "flow.ch8"
+    rom.write_bytes(ROM)
+    result = CliRunner().invoke(run, ["disasm", str(rom)])
+    assert result.exit_code == 0
+    assert "L208:" in result.output
+    assert "D20c:" in result.output
+    assert "####...." in result.output
+
+
+def test_disasm_command_rejects_an_oversized_rom(tmp_path: Path) -> None:
+    rom = tmp_path / "big.ch8"
+    rom.write_bytes(bytes(MEMORY_SIZE))
+    result = CliRunner().invoke(run, ["disasm", str(rom)])
+    assert result.exit_code == 1
+    assert "ROM size exceeds available memory" in result.output
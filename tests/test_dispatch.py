@@ -0,0 +1,83 @@
+from pathlib import Path
+
+import pytest
+
+from chip8._exceptions import ChipError, DecodeError
+from chip8.constants import PC_INIT, REGISTER_COUNT
+from chip8.cpu import CPU
+from chip8.dispatch import INSTRUCTION_COUNT, DispatchCPU, dispatch_table
+from chip8.opcodes import opcodes
+from tests.helpers import MachineFactory, RomWriter
+
+ROMS = sorted(Path("roms").glob("*.ch8"))
+
+
+def test_table_covers_every_instruction_word() -> None:
+    # Every 16-bit word needs a handler, even if it only raises.
+    assert len(dispatch_table()) == INSTRUCTION_COUNT
+
+
+def test_table_is_shared_between_cpus(write_rom: RomWriter, build: MachineFactory) -> None:
+    # The table is built once per process and reused by each machine.
+    rom_path = write_rom(b"")
+    first = build(DispatchCPU, rom_path)
+    second = build(DispatchCPU, rom_path)
+    assert first.table is second.table
+
+
+def test_invalid_instruction_raises_decode_error(
+    write_rom: RomWriter,
+    build: MachineFactory,
+) -> None:
+    # Undefined words surface the same error as the reference decoder.
+    rom_path = write_rom([0x0000])
+    cpu = build(DispatchCPU, rom_path)
+    with pytest.raises(DecodeError):
+        cpu.step()
+
+
+@pytest.mark.parametrize("key", sorted(opcodes))
+def test_single_instruction_matches_reference(
+    key: int,
+    write_rom: RomWriter,
+    build: MachineFactory,
+) -> None:
+    # Run one instance of each opcode through both engines and compare state.
+    operands = {0x0000: 0x0A00, 0x8000: 0x0AB0, 0xE000: 0x0A00, 0xF000: 0x0A00}
+    instruction = key | operands.get(key & 0xF000, 0x0AB3)
+    rom_path = write_rom([instruction])
+
+    cpus = [build(CPU, rom_path), build(DispatchCPU, rom_path)]
+    for cpu in cpus:
+        cpu.v[:] = bytes(range(0x90, 0x90 + REGISTER_COUNT))
+        cpu.stack.append(0x300)
+        cpu.delay_timer = 7
+        cpu.i = 0x320
+        cpu.step()
+
+    reference, dispatch = cpus
+    assert dispatch.pc == reference.pc
+    assert dispatch.i == reference.i
+    assert dispatch.v == reference.v
+    assert dispatch.stack == reference.stack
+    assert dispatch.delay_timer == reference.delay_timer
+
+
+@pytest.mark.parametrize("rom", ROMS, ids=[rom.name for rom in ROMS])
+def test_bundled_roms_match_reference(rom: Path, build: MachineFactory) -> None:
+    # Both engines should walk the same path through each bundled ROM.
+    reference = build(CPU, rom)
+    dispatch = build(DispatchCPU, rom)
+    for _ in range(200):
+        try:
+            reference.cycle()
+        except ChipError:
+            with pytest.raises(ChipError):
+                dispatch.cycle()
+            break
+        dispatch.cycle()
+        assert dispatch.pc == reference.pc
+        assert dispatch.v == reference.v
+        assert dispatch.i == reference.i
+        assert dispatch.screen.buffer == reference.screen.buffer
+    assert dispatch.ram[PC_INIT:] == reference.ram[PC_INIT:]
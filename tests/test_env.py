@@ -0,0 +1,104 @@
+from pathlib import Path
+
+import pytest
+
+from chip8.ram import RAM
+from tests.helpers import RomWriter
+
+np = pytest.importorskip("numpy")
+from chip8.env import DEFAULT_ACTIONS, Chip8Env, VectorEnv  # noqa: E402
+
+ROM = str(Path("roms") / "maze.ch8")
+
+
+def test_observation_is_the_framebuffer() -> None:
+    env = Chip8Env(ROM)
+    obs = env.reset(seed=1)
+    obs, *_ = env.step(0)
+
+    assert obs.shape == (32, 64)
+    expected = [env.screen.frame.pixel(x, y) for y in range(32) for x in range(64)]
+    assert obs.ravel().tolist() == expected
+    assert obs is env.observation  # reused between steps
+
+
+def test_reset_with_a_seed_repeats_an_episode() -> None:
+    env = Chip8Env(ROM, frame_skip=2)
+    episodes = []
+    for _ in range(2):
+        env.reset(seed=9)
+        for _ in range(20):
+            obs, *_ = env.step(0)
+        episodes.append(obs.copy())
+
+    assert (episodes[0] == episodes[1]).all()
+
+
+def test_actions_press_keys_and_reward_reads_ram(write_rom: RomWriter) -> None:
+    # WAIT for a key, store it at 0x300, then spin.
+    rom = write_rom(bytes([0xF0, 0x0A, 0xA3, 0x00, 0xF0, 0x55, 0x12, 0x06]))
+
+    def reward(ram: RAM) -> float:
+        return float(ram[0x300])
+
+    env = Chip8Env(rom, reward=reward, done=lambda ram: ram[0x300] != 0, frame_skip=1)
+    env.reset()
+    _, score, done, _ = env.step(0)
+    assert (score, done) == (0.0, False)
+
+    _, score, done, _ = env.step(DEFAULT_ACTIONS.index(1 << 0xB))
+    assert (score, done) == (0xB, True)
+
+
+def test_halted_machine_ends_the_episode(write_rom: RomWriter) -> None:
+    env = Chip8Env(write_rom(b"\x00\x00"))
+    env.reset()
+
+    _, _, done, info = env.step(0)
+
+    assert done
+    assert "error" in info
+
+
+def test_max_steps_truncates() -> None:
+    env = Chip8Env(ROM, max_steps=3)
+    env.reset()
+    dones = [env.step(0)[2] for _ in range(3)]
+
+    assert dones == [False, False, True]
+
+
+def test_vector_env_stacks_sub_environments() -> None:
+    envs = VectorEnv(ROM, 3, max_steps=2)
+    obs = envs.reset(seeds=[1, 2, 1])
+    assert obs.shape == (3, 32, 64)
+
+    obs, rewards, dones, infos = envs.step([0, 0, 0])
+    assert obs is envs.observations
+    assert (obs[0] == obs[2]).all()
+    assert not dones.any()
+    assert rewards.shape == (3,)
+    assert len(infos) == 3
+
+    _, _, dones, infos = envs.step([0, 0, 0])
+    assert dones.all()
+    assert all(info["truncated"] for info in infos)
+    assert all(env.steps == 0 for env in envs.envs)  # finished sub-environments reset
+
+
+def test_vector_env_keeps_the_terminal_observation() -> None:
+    # The shared row shows the next episode, the info keeps the screen the last one ended on.
+    envs = VectorEnv(ROM, 2, max_steps=3)
+    envs.reset(seeds=[1, 1])
+    single = Chip8Env(ROM, max_steps=3)
+    single.reset(seed=1)
+    for _ in range(3):
+        expected = single.step(0)[0].copy()
+        obs, _, dones, infos = envs.step([0, 0])
+
+    assert dones.all()
+    assert expected.any()
+    for k, info in enumerate(infos):
+        assert (info["terminal_observation"] == expected).all()
+        assert not obs[k].any()
+    assert "terminal_observation" not in envs.step([0, 0])[3][0]
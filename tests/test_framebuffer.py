@@ -0,0 +1,93 @@
+from chip8.constants import SCREEN_HEIGHT, SCREEN_WIDTH
+from chip8.framebuffer import FrameBuffer
+
+
+def test_draw_sprite_places_bits_msb_first() -> None:
+    # A sprite byte reads left to right starting at the x coordinate.
+    frame = FrameBuffer()
+
+    assert frame.draw_sprite(2, 3, [0b1010_0000]) is False
+
+    assert frame.pixel(2, 3) == 1
+    assert frame.pixel(3, 3) == 0
+    assert frame.pixel(4, 3) == 1
+
+
+def test_draw_sprite_reports_collision_and_erases() -> None:
+    # Drawing the same sprite twice erases it and flags a collision.
+    frame = FrameBuffer()
+    frame.draw_sprite(10, 10, [0xFF, 0x81])
+
+    assert frame.draw_sprite(10, 10, [0xFF, 0x81]) is True
+    assert frame.rows == [0] * SCREEN_HEIGHT
+
+
+def test_draw_sprite_wraps_both_axes() -> None:
+    # Columns past the right edge and rows past the bottom wrap around.
+    frame = FrameBuffer()
+
+    frame.draw_sprite(SCREEN_WIDTH + 60, SCREEN_HEIGHT - 1, [0xFF, 0x80])
+
+    assert [frame.pixel(x, SCREEN_HEIGHT - 1) for x in (59, 60, 63, 0, 3, 4)] == [0, 1, 1, 1, 1, 0]
+    assert frame.pixel(60, 0) == 1
+
+
+def test_draw_sprite_matches_flip_pixel() -> None:
+    # Row blits agree with flipping each set bit one pixel at a time.
+    sprite = [0x3C, 0x42, 0x99, 0xFF]
+    blit = FrameBuffer()
+    flipped = FrameBuffer()
+    blit.draw_sprite(61, 30, sprite)
+    for row, byte in enumerate(sprite):
+        for bit in range(8):
+            if byte & (0x80 >> bit):
+                flipped.flip_pixel(61 + bit, 30 + row)
+
+    assert blit.rows == flipped.rows
+
+
+def test_clear_and_unpack() -> None:
+    # Clearing blanks every row and unpacking keeps the screen shape.
+    frame = FrameBuffer()
+    frame.flip_pixel(0, 0)
+    assert frame.to_lists()[0][:2] == [1, 0]
+
+    frame.clear()
+
+    assert frame.to_lists() == [[0] * SCREEN_WIDTH for _ in range(SCREEN_HEIGHT)]
+
+
+def test_to_bytes_packs_rows_top_to_bottom() -> None:
+    # Each row becomes eight bytes with column 0 in the high bit.
+    frame = FrameBuffer()
+    frame.flip_pixel(0, 0)
+    frame.flip_pixel(63, 1)
+
+    packed = frame.to_bytes()
+
+    assert len(packed) == SCREEN_WIDTH * SCREEN_HEIGHT // 8
+    assert packed[0] == 0x80
+    assert packed[15] == 0x01
+
+
+def test_take_damage_boxes_changed_rows() -> None:
+    # A fresh buffer is fully damaged, then only drawn regions are reported.
+    frame = FrameBuffer()
+    assert frame.take_damage() == [(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)]
+
+    frame.draw_sprite(4, 2, [0x80, 0x01])
+    frame.flip_pixel(0, 20)
+
+    assert frame.take_damage() == [(4, 2, 8, 2), (0, 20, 1, 1)]
+    assert frame.take_damage() == []
+
+
+def test_clear_damages_only_lit_rows() -> None:
+    # Clearing repaints the rows that had pixels on and nothing else.
+    frame = FrameBuffer()
+    frame.flip_pixel(8, 7)
+    frame.take_damage()
+
+    frame.clear()
+
+    assert frame.take_damage() == [(8, 7, 1, 1)]
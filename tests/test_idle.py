@@ -0,0 +1,85 @@
+import pytest
+
+from chip8.chip8 import ENGINES
+from chip8.constants import PC_INIT
+from chip8.cpu import CPU
+from chip8.idle import find_idle_loop
+from chip8.scheduler import Scheduler
+from tests.helpers import MachineFactory, RomWriter
+
+# LD V0, 3c / LD DT, V0 / LD V1, DT / SE V1, 00 / JP 204 / ADD V2, 01 / JP 20a
+TIMER_LOOP = [0x603C, 0xF015, 0xF107, 0x3100, 0x1204, 0x7201, 0x120A]
+# WAIT V3 / ADD V2, 01 / JP 202
+KEY_WAIT = [0xF30A, 0x7201, 0x1202]
+
+
+def test_finds_jump_to_self(write_rom: RomWriter, build: MachineFactory) -> None:
+    # JP 200 is a one instruction loop that never ends.
+    cpu = build(CPU, write_rom([0x1200]))
+    loop = find_idle_loop(cpu)
+    assert loop is not None
+    assert loop.length == 1
+    assert not loop.timed
+
+
+def test_finds_delay_timer_poll(write_rom: RomWriter, build: MachineFactory) -> None:
+    # The poll settles V1 to the delay timer and depends on it ticking.
+    cpu = build(CPU, write_rom(TIMER_LOOP))
+    cpu.run(2)
+    loop = find_idle_loop(cpu)
+    assert loop is not None
+    assert loop.length == 3
+    assert loop.timed
+    assert loop.registers[1] == 0x3C
+
+
+def test_busy_loop_is_not_idle(write_rom: RomWriter, build: MachineFactory) -> None:
+    # ADD changes a register on every trip, so the loop does real work.
+    cpu = build(CPU, write_rom([0x7201, 0x1200]))
+    assert find_idle_loop(cpu) is None
+
+
+def test_pressed_key_ends_wait(write_rom: RomWriter, build: MachineFactory) -> None:
+    # WAIT is only idle while no key is down.
+    cpu = build(CPU, write_rom(KEY_WAIT))
+    assert find_idle_loop(cpu) is not None
+    cpu.keypad.set_mask(1 << 5)
+    assert find_idle_loop(cpu) is None
+
+
+@pytest.mark.parametrize("engine", ENGINES.values())
+def test_skipping_matches_running(
+    engine: type[CPU],
+    write_rom: RomWriter,
+    build: MachineFactory,
+) -> None:
+    # Skipping idle trips ends in exactly the state running them would.
+    words = TIMER_LOOP
+    runs = []
+    for skip_idle in (False, True):
+        cpu = build(engine, write_rom(words))
+        scheduler = Scheduler(cpu, ips=1000, uncapped=True, skip_idle=skip_idle)
+        for _ in range(90):
+            scheduler.advance()
+        runs.append((cpu.snapshot(), scheduler.executed, scheduler.skipped))
+    (plain, executed, none), (skipped, executed_skipping, some) = runs
+    assert skipped == plain
+    assert executed_skipping == executed
+    assert none == 0
+    assert some > 0
+
+
+def test_wait_resumes_after_key(write_rom: RomWriter, build: MachineFactory) -> None:
+    # A key pressed while skipped through WAIT is picked up on the next frame.
+    cpu = build(CPU, write_rom(KEY_WAIT))
+    scheduler = Scheduler(cpu, ips=600, uncapped=True)
+    for _ in range(10):
+        scheduler.advance()
+    assert scheduler.skipped == scheduler.executed
+    assert cpu.pc == PC_INIT
+
+    cpu.keypad.set_mask(1 << 7)
+    scheduler.advance()
+
+    assert cpu.v[3] == 7
+    assert cpu.v[2] > 0
@@ -3,7 +3,7 @@ from types import SimpleNamespace
 import pygame as pg
 import pytest
 
-from chip8.keypad import Keypad
+from chip8.keypad import REWIND_KEY, HeadlessKeypad, Keypad
 
 
 def test_keypad_initializes_with_hex_layout() -> None:
@@ -50,21 +50,48 @@ def test_update_ignores_unmapped_keys(monkeypatch: pytest.MonkeyPatch) -> None:
 
 
 def test_update_quits_on_escape(monkeypatch: pytest.MonkeyPatch) -> None:
-    # Quit the emulator on escape.
+    # Escape asks the emulator loop to stop rather than exiting the process.
     keypad = Keypad()
     escape_event = SimpleNamespace(type=pg.KEYDOWN, key=pg.K_ESCAPE)
-    quit_called = False
+    monkeypatch.setattr(pg.event, "get", lambda: [escape_event])
 
-    def _quit() -> None:
-        # Record that pygame quit was requested.
-        nonlocal quit_called
-        quit_called = True
+    keypad.update()
+
+    assert keypad.quit is True
+
+
+def test_headless_keypad_ignores_event_pump(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Keys set directly survive an update without reading window events.
+    def _get() -> list[SimpleNamespace]:
+        raise AssertionError("headless keypad read window events")
+
+    monkeypatch.setattr(pg.event, "get", _get)
+    keypad = HeadlessKeypad()
+    keypad.pressed_keys[0x5] = 1
+
+    keypad.update()
+
+    assert keypad.pressed_keys[0x5] == 1
+
+
+def test_update_tracks_rewind_key(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Holding the rewind key sets rewinding until it is released.
+    keypad = Keypad()
+    monkeypatch.setattr(pg.event, "get", lambda: [SimpleNamespace(type=pg.KEYDOWN, key=REWIND_KEY)])
+    keypad.update()
+    assert keypad.rewinding
+
+    monkeypatch.setattr(pg.event, "get", lambda: [SimpleNamespace(type=pg.KEYUP, key=REWIND_KEY)])
+    keypad.update()
+    assert not keypad.rewinding
+    assert keypad.pressed_keys == [0] * 16
 
-    monkeypatch.setattr(pg.event, "get", lambda: [escape_event])
-    monkeypatch.setattr(pg, "quit", _quit)
-    monkeypatch.setattr("chip8.keypad.sys.exit", lambda: (_ for _ in ()).throw(SystemExit()))
 
-    with pytest.raises(SystemExit):
-        keypad.update()
+def test_mask_round_trips_pressed_keys() -> None:
+    # Key n maps to bit n of the mask.
+    keypad = HeadlessKeypad()
+    keypad.pressed_keys[0x1] = keypad.pressed_keys[0xF] = 1
+    assert keypad.mask == 0x8002
 
-    assert quit_called is True
+    keypad.set_mask(0x0011)
+    assert keypad.pressed_keys == [1, 0, 0, 0, 1] + [0] * 11
@@ -0,0 +1,210 @@
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from chip8 import chip8
+from chip8.__main__ import run
+from chip8._exceptions import ChipError, ExecuteError, LockstepError, MovieError
+from chip8.cpu import CPU
+from chip8.dispatch import DispatchCPU
+from chip8.lockstep import Lockstep
+from chip8.movie import Movie, rom_digest
+from tests.helpers import RomWriter
+
+ROM = "roms/particle.ch8"
+
+
+class FlagCPU(CPU):
+    """Reference CPU with a drift: DRW flips VF whenever V0 is 9."""
+
+    def draw(self) -> None:
+        """Draw, then flip VF."""
+        super().draw()
+        if self.v[0] == 9:
+            self.v[0xF] ^= 1
+
+
+class WaitCPU(CPU):
+    """Reference CPU with a drift: keys waited for land one higher in Vx."""
+
+    def wait(self) -> None:
+        """Wait for a key, then add one to it."""
+        super().wait()
+        if any(self.keypad.pressed_keys):
+            self.v[self.x] += 1
+
+
+class FaultCPU(CPU):
+    """Reference CPU that faults on the first DRW."""
+
+    def draw(self) -> None:
+        """Fail."""
+        raise ExecuteError("Draw failed")
+
+
+class BatchCPU(DispatchCPU):
+    """Dispatch CPU with a drift that only shows running more than one instruction at once."""
+
+    def run(self, count: int) -> None:
+        """Run, then scribble on memory if it was a batch."""
+        super().run(count)
+        if count > 1:
+            self.ram.memory[0xFFF] ^= 1
+
+
+class ScribbleCPU(DispatchCPU):
+    """Dispatch CPU that faults where the reference does, scribbling on V5 first."""
+
+    def run(self, count: int) -> None:
+        """Run, changing V5 if it faults."""
+        try:
+            super().run(count)
+        except ChipError:
+            self.v[5] ^= 1
+            raise
+
+
+@pytest.fixture
+def drifting(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(chip8.ENGINES, "flag", FlagCPU)
+    monkeypatch.setitem(chip8.ENGINES, "wait", WaitCPU)
+    monkeypatch.setitem(chip8.ENGINES, "fault", FaultCPU)
+    monkeypatch.setitem(chip8.ENGINES, "batch", BatchCPU)
+    monkeypatch.setitem(chip8.ENGINES, "scribble", ScribbleCPU)
+
+
+@pytest.mark.parametrize("rom", ["particle", "walk", "tank", "maze", "keyboard", "test"])
+def test_engines_agree(rom: str) -> None:
+    result = Lockstep(f"roms/{rom}.ch8", ["dispatch", "block", "vector"], frames=120).run()
+    assert result.divergence is None
+    assert result.fault is None
+    assert result.instructions == 120 * 12
+
+
+@pytest.mark.usefixtures("drifting")
+def test_first_diverging_instruction() -> None:
+    coarse = Lockstep(ROM, ["dispatch", "flag"], frames=300, seed=3).run()
+    fine = Lockstep(ROM, ["dispatch", "flag"], frames=300, seed=3, interval=1).run()
+    divergence = coarse.divergence
+    assert divergence is not None
+    assert divergence == fine.divergence
+    assert divergence.engine == "flag"
+    assert divergence.word >> 12 == 0xD
+    report = divergence.report()
+    assert f"at instruction {divergence.instruction:,}" in report
+    assert [line.split()[0] for line in report.splitlines() if line.endswith("<")] == ["VF"]
+
+
+@pytest.mark.usefixtures("drifting")
+def test_movie_keys_reach_every_engine(write_rom: RomWriter) -> None:
+    # WAIT V3 / LD F, V3 / DRW V0, V0, 5 / JP 206: draws the digit of the pressed key.
+    rom = write_rom([0xF30A, 0xF329, 0xD005, 0x1206])
+    movie = Movie(seed=1, ips=720, rom=rom_digest(rom))
+    for mask in (0, 0, 0, 1 << 7, 0):
+        movie.record(mask)
+
+    assert Lockstep(rom, ["dispatch", "vector"], movie=movie).run().divergence is None
+    result = Lockstep(rom, ["wait"], movie=movie).run()
+    assert result.divergence is not None
+    assert result.divergence.instruction == 3 * 12
+    assert result.divergence.frame == 3
+    marked = [line.split()[0] for line in result.divergence.report().splitlines() if "<" in line]
+    assert marked == ["V3"]
+
+    with pytest.raises(MovieError):
+        Lockstep(ROM, ["dispatch"], movie=movie)
+
+
+@pytest.mark.usefixtures("drifting")
+def test_batch_only_divergence() -> None:
+    # Single steps all agree, so the whole chunk is reported rather than passed over.
+    result = Lockstep(ROM, ["batch"], interval=5).run()
+    divergence = result.divergence
+    assert divergence is not None
+    assert divergence.engine == "batch"
+    assert (divergence.instruction, divergence.length) == (0, 5)
+    report = divergence.report()
+    assert "at instructions 0-4 (frame 0)" in report
+    assert "memory differs at fff" in report
+    assert Lockstep(ROM, ["batch"], interval=1, frames=10).run().divergence is None
+
+
+def test_shared_fault_ends_the_run(write_rom: RomWriter) -> None:
+    # LD V0, 1 / then an undecodable word.
+    rom = write_rom([0x6001, 0x0000])
+    result = Lockstep(rom, ["dispatch", "block", "vector"]).run()
+    assert result.divergence is None
+    assert result.instructions == 1
+    assert result.fault is not None
+
+
+@pytest.mark.usefixtures("drifting")
+def test_shared_fault_in_different_states_diverges(write_rom: RomWriter) -> None:
+    rom = write_rom([0x6001, 0x0000])
+    result = Lockstep(rom, ["dispatch", "scribble"]).run()
+    divergence = result.divergence
+    assert divergence is not None
+    assert divergence.engine == "scribble"
+    assert divergence.expected_error is not None
+    assert divergence.actual_error is not None
+    assert result.fault is None
+    marked = [line.split()[0] for line in divergence.report().splitlines() if "<" in line]
+    assert marked == ["V5"]
+
+
+@pytest.mark.usefixtures("drifting")
+def test_lone_fault_diverges() -> None:
+    result = Lockstep(ROM, ["dispatch", "fault"]).run()
+    divergence = result.divergence
+    assert divergence is not None
+    assert divergence.engine == "fault"
+    assert divergence.expected_error is None
+    assert divergence.actual_error is not None
+    assert divergence.actual_error.endswith("Draw failed")
+    assert "fault raised: Execution Error" in divergence.report()
+
+
+def test_bad_options() -> None:
+    with pytest.raises(LockstepError):
+        Lockstep(ROM, ["nope"])
+    with pytest.raises(LockstepError):
+        Lockstep(ROM, ["dispatch"], interval=0)
+    with pytest.raises(LockstepError):
+        Lockstep(ROM, ["dispatch"], ips=0)
+
+
+@pytest.mark.parametrize("ips", [1000, 30])
+def test_uneven_frames(ips: int) -> None:
+    # Frames of ips / 60 instructions carry their fraction, as the scheduler runs them.
+    result = Lockstep(ROM, ["dispatch", "block"], frames=60, ips=ips, interval=7).run()
+    assert result.divergence is None
+    assert result.instructions == ips
+
+
+def test_cli(monkeypatch: pytest.MonkeyPatch) -> None:
+    runner = CliRunner()
+    result = runner.invoke(run, ["lockstep", ROM, "--frames", "60"])
+    assert result.exit_code == 0
+    assert "dispatch, block matched" in result.output
+    monkeypatch.setitem(chip8.ENGINES, "block", FlagCPU)
+    args = ["lockstep", ROM, "-e", "block", "--seed", "3", "--frames", "300"]
+    result = runner.invoke(run, args)
+    assert result.exit_code == 1
+    assert "block diverged from reference" in result.output
+
+
+def test_cli_errors(tmp_path: Path, write_rom: RomWriter) -> None:
+    runner = CliRunner()
+    result = runner.invoke(run, ["lockstep", ROM, "--interval", "0"])
+    assert result.exit_code == 1
+    assert "Interval must be at least one instruction" in result.output
+    path = tmp_path / "other.movie"
+    Movie(seed=1, ips=720, rom=rom_digest("roms/walk.ch8")).save(path)
+    result = runner.invoke(run, ["lockstep", ROM, "--movie", str(path)])
+    assert result.exit_code == 1
+    assert "Movie was not recorded on" in result.output
+    # CALL 0x200 recurses until the stack is too deep to save.
+    result = runner.invoke(run, ["lockstep", write_rom([0x2200]), "-e", "dispatch"])
+    assert result.exit_code == 1
+    assert "Stack too deep to save" in result.output
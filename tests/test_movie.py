@@ -0,0 +1,101 @@
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from chip8.__main__ import run
+from chip8._exceptions import MovieError
+from chip8.chip8 import Chip8, replay
+from chip8.movie import Movie
+
+ROM = str(Path("roms") / "maze.ch8")
+
+
+def test_frames_are_run_length_encoded() -> None:
+    movie = Movie(seed=1, ips=720, rom=bytes(20))
+    for mask in (0, 0, 0, 0x10, 0x10, 0):
+        movie.record(mask)
+
+    assert movie.runs == [[3, 0], [2, 0x10], [1, 0]]
+    assert list(movie.frames()) == [0, 0, 0, 0x10, 0x10, 0]
+    assert len(movie) == 6
+
+
+def test_truncate_drops_trailing_frames() -> None:
+    movie = Movie(seed=1, ips=720, rom=bytes(20))
+    for mask in (0, 0, 0, 0x10, 0x10, 0):
+        movie.record(mask)
+
+    movie.truncate(4)
+    assert list(movie.frames()) == [0, 0, 0, 0x10]
+
+
+def test_file_round_trip(tmp_path: Path) -> None:
+    movie = Movie(seed=2**40, ips=1000, rom=bytes(range(20)), digest=bytes(range(20, 40)))
+    movie.record(0xFFFF)
+    movie.record(0)
+    path = tmp_path / "run.c8m"
+    movie.save(path)
+
+    assert Movie.load(path) == movie
+
+
+def test_load_rejects_other_files(tmp_path: Path) -> None:
+    path = tmp_path / "run.c8m"
+    path.write_bytes(b"not a movie" * 10)
+    with pytest.raises(MovieError):
+        Movie.load(path)
+    path.write_bytes(b"C8MV")
+    with pytest.raises(MovieError):
+        Movie.load(path)
+    Movie(seed=1, ips=0, rom=bytes(20)).save(path)
+    with pytest.raises(MovieError, match="below one"):
+        Movie.load(path)
+
+
+@pytest.mark.parametrize("name", ["keyboard.ch8", "maze.ch8", "particle.ch8"])
+def test_replay_reproduces_a_recorded_run(tmp_path: Path, name: str) -> None:
+    # Keys pressed part way through and random numbers both replay exactly.
+    rom = str(Path("roms") / name)
+    path = tmp_path / "run.c8m"
+    chip8 = Chip8(rom, headless=True, uncapped=True, seed=7, record=str(path))
+    chip8.run(frames=30)
+    chip8.keypad.pressed_keys[5] = 1
+    chip8.run(frames=40)
+    chip8.keypad.pressed_keys[5] = 0
+    chip8.run(frames=60)
+
+    movie = Movie.load(path)
+    assert len(movie) == 60
+    assert movie.runs == [[30, 0], [10, 1 << 5], [20, 0]]
+    assert movie.digest == chip8.digest()
+    assert replay(movie, rom).digest() == movie.digest
+
+
+def test_rewinding_trims_the_movie(tmp_path: Path) -> None:
+    # Long after the rewind ring first dropped frames, rewinding trims only what was undone.
+    path = tmp_path / "run.c8m"
+    chip8 = Chip8(ROM, headless=True, uncapped=True, seed=7, rewind=1, record=str(path))
+    chip8.run(frames=300)
+    chip8.keypad.rewinding = True
+    chip8.run(frames=303)  # three frames back
+    chip8.keypad.rewinding = False
+    chip8.run(frames=313)
+
+    movie = Movie.load(path)
+    assert len(movie) == 307
+    assert replay(movie, ROM).digest() == movie.digest
+
+
+def test_replay_rejects_another_rom() -> None:
+    movie = Movie(seed=1, ips=720, rom=bytes(20))
+    with pytest.raises(MovieError):
+        replay(movie, ROM)
+
+
+def test_cli_replay_of_another_rom(tmp_path: Path) -> None:
+    path = tmp_path / "other.c8m"
+    Movie(seed=1, ips=720, rom=bytes(20)).save(path)
+    result = CliRunner().invoke(run, ["-r", ROM, "--replay", str(path)])
+    assert result.exit_code == 1
+    assert "Error: Movie was not recorded on" in result.output
@@ -5,6 +5,7 @@ import pytest
 from chip8.audio import Audio
 from chip8.constants import PC_INIT, REGISTER_COUNT
 from chip8.cpu import CPU
+from chip8.ctypes import Sprite
 from chip8.keypad import Keypad
 from chip8.opcodes import opcodes
 from chip8.ram import RAM
@@ -16,10 +17,11 @@ class DummyScreen(Screen):
 
     def __init__(self) -> None:
         """Initialize the screen test double."""
-        self.buffer = []
         self.clear_calls = 0
         self.flip_calls: list[tuple[int, int]] = []
         self.flip_results: list[bool] = []
+        self.draw_calls: list[tuple[int, int, list[int]]] = []
+        self.draw_results: list[bool] = []
 
     def clear(self) -> None:
         """Record each clear call."""
@@ -34,6 +36,14 @@ class DummyScreen(Screen):
             return self.flip_results.pop(0)
         return False
 
+    def draw_sprite(self, x: int, y: int, sprite: Sprite) -> bool:
+        """Record sprite draws and return queued collision values."""
+        # Provide deterministic draw collision behavior.
+        self.draw_calls.append((x, y, list(sprite)))
+        if self.draw_results:
+            return self.draw_results.pop(0)
+        return False
+
 
 class DummyKeypad(Keypad):
     """Simple keypad double for opcode tests."""
@@ -290,7 +300,7 @@ def test_bnnn_jp_v0_addr(cpu: CPU) -> None:
 def test_cxkk_rnd(cpu: CPU, monkeypatch: pytest.MonkeyPatch) -> None:
     """Random masked byte into Vx."""
     # Verify random source is AND-masked by kk.
-    monkeypatch.setattr("chip8.cpu.random.randint", lambda _a, _b: 0xAB)
+    monkeypatch.setattr(cpu, "random_byte", lambda: 0xAB)
     run_instruction(cpu, 0xCA0F)
     assert cpu.v[0xA] == 0x0B
 
@@ -304,11 +314,11 @@ def test_dxyn_draw(cpu: CPU) -> None:
     cpu.ram[cpu.i] = 0b1100_0000
     cpu.v[0xA] = 1
     cpu.v[0xB] = 2
-    screen.flip_results = [False, True]
+    screen.draw_results = [True]
 
     run_instruction(cpu, 0xDAB1)
 
-    assert screen.flip_calls == [(1, 2), (2, 2)]
+    assert screen.draw_calls == [(1, 2, [0b1100_0000])]
     assert cpu.v[0xF] == 1
 
 
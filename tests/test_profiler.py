@@ -0,0 +1,86 @@
+import pytest
+
+from chip8._exceptions import DecodeError
+from chip8.blocks import BlockCPU
+from chip8.chip8 import Chip8
+from chip8.cpu import CPU
+from chip8.dispatch import DispatchCPU
+from chip8.profiler import INVALID_LABEL, ProfiledCPU, opcode_labels, profiled
+from tests.helpers import MachineFactory, RomWriter
+
+
+def test_labels_cover_every_word() -> None:
+    labels = opcode_labels()
+    assert labels[0x00E0] == "CLS"
+    assert labels[0xD123] == "DRW Vx, Vy, n"
+    assert labels[0x0000] == INVALID_LABEL
+
+
+def test_engine_is_left_untouched(write_rom: RomWriter, build: MachineFactory) -> None:
+    # Profiling builds a subclass, the plain engine keeps its own run.
+    assert profiled(DispatchCPU) is not DispatchCPU
+    assert issubclass(profiled(DispatchCPU), DispatchCPU)
+    assert profiled(DispatchCPU) is profiled(DispatchCPU)
+    assert not hasattr(build(DispatchCPU, write_rom(b"")), "profile")
+
+
+@pytest.mark.parametrize("engine", [CPU, DispatchCPU, BlockCPU])
+def test_counts_per_opcode_and_address(
+    engine: type[CPU],
+    write_rom: RomWriter,
+    build: MachineFactory,
+) -> None:
+    # LD V0, 1; ADD V0, 1; JP 0x202: the ADD and JP alternate after the first LD.
+    cpu = build(profiled(engine), write_rom([0x6001, 0x7001, 0x1202]))
+    cpu.run(9)
+
+    assert cpu.v[0] == 5
+    profile = cpu.profile
+    counts = {row["label"]: row["count"] for row in profile.opcodes()}
+    assert counts == {"LD Vx, kk": 1, "ADD Vx, kk": 4, "JMP addr": 4}
+    addresses = {row["address"]: (row["word"], row["count"]) for row in profile.addresses()}
+    assert addresses == {0x200: (0x6001, 1), 0x202: (0x7001, 4), 0x204: (0x1202, 4)}
+    assert all(row["ns"] >= 0 for row in profile.addresses())
+
+
+def test_block_engine_keeps_translating(write_rom: RomWriter, build: MachineFactory) -> None:
+    # Blocks are timed whole, their time shared between the instructions in them.
+    cpu = build(profiled(BlockCPU), write_rom([0x6001, 0x7001, 0x1202]))
+    cpu.run(9)
+
+    assert isinstance(cpu, BlockCPU)
+    assert cpu.blocks
+    starts = [start for start, _, _ in cpu.profile.blocks]
+    assert starts == [0x200, 0x202]
+    rows = {row["address"]: row["ns"] for row in cpu.profile.addresses()}
+    assert rows[0x202] == rows[0x204]
+
+
+def test_idle_loops_are_profiled(write_rom: RomWriter) -> None:
+    # JP to itself would be fast-forwarded, but a profile has to see the spin.
+    chip8 = Chip8(write_rom([0x1200]), headless=True, uncapped=True, engine=profiled(DispatchCPU))
+    chip8.run(10)
+
+    assert chip8.scheduler.skipped == 0
+    assert isinstance(chip8.cpu, ProfiledCPU)
+    counts = {row["label"]: row["count"] for row in chip8.cpu.profile.opcodes()}
+    assert counts == {"JMP addr": chip8.scheduler.executed}
+
+
+def test_report_and_json(write_rom: RomWriter, build: MachineFactory) -> None:
+    cpu = build(profiled(DispatchCPU), write_rom([0x6001, 0x1200]))
+    cpu.run(10)
+
+    report = cpu.profile.report()
+    assert "LD Vx, kk" in report
+    assert "0200     6001" in report
+    data = cpu.profile.to_dict()
+    assert {row["label"] for row in data["opcodes"]} == {"LD Vx, kk", "JMP addr"}
+    times = [row["ns"] for row in data["addresses"]]
+    assert times == sorted(times, reverse=True)
+
+
+def test_errors_surface_unchanged(write_rom: RomWriter, build: MachineFactory) -> None:
+    cpu = build(profiled(DispatchCPU), write_rom([0x0000]))
+    with pytest.raises(DecodeError):
+        cpu.run(1)
@@ -0,0 +1,81 @@
+from pathlib import Path
+
+import pytest
+
+from chip8.audio import HeadlessAudio
+from chip8.cpu import CPU
+from chip8.dispatch import DispatchCPU
+from chip8.keypad import HeadlessKeypad
+from chip8.ram import RAM
+from chip8.rewind import Rewind
+from chip8.screen import HeadlessScreen
+
+
+@pytest.fixture
+def cpu() -> CPU:
+    """Build a headless CPU running the maze ROM, which draws every frame."""
+    rom = Path("roms") / "maze.ch8"
+    return DispatchCPU(RAM(str(rom)), HeadlessScreen(), HeadlessKeypad(), HeadlessAudio())
+
+
+def test_step_back_restores_frames_newest_first(cpu: CPU) -> None:
+    # Stepping back across several keyframes returns each earlier frame in turn.
+    rewind = Rewind(cpu, seconds=1, keyframe_interval=4)
+    states = []
+    for _ in range(10):
+        cpu.run(12)
+        rewind.record()
+        states.append(cpu.snapshot())
+    assert len(rewind) == 10
+
+    for state in reversed(states[:-1]):
+        assert rewind.step_back()
+        assert cpu.snapshot() == state
+    assert not rewind.step_back()
+    assert cpu.snapshot() == states[0]
+    assert len(rewind) == rewind.frames == 1
+
+
+def test_clear_starts_over(cpu: CPU) -> None:
+    rewind = Rewind(cpu, seconds=1, keyframe_interval=4)
+    for _ in range(6):
+        cpu.run(12)
+        rewind.record()
+    rewind.clear()
+
+    assert len(rewind) == rewind.frames == 0
+    assert not rewind.step_back()
+    rewind.record()
+    assert rewind.frames == 1
+
+
+def test_recording_resumes_after_stepping_back(cpu: CPU) -> None:
+    rewind = Rewind(cpu, seconds=1, keyframe_interval=4)
+    for _ in range(6):
+        cpu.run(12)
+        rewind.record()
+    rewind.step_back()
+    rewind.step_back()
+    rewind.step_back()
+    cpu.run(12)
+    rewind.record()
+    expected = cpu.snapshot()
+    cpu.run(12)
+    rewind.record()
+
+    assert rewind.step_back()
+    assert cpu.snapshot() == expected
+
+
+def test_ring_stays_bounded(cpu: CPU) -> None:
+    # Old segments fall off, keeping about the requested seconds of frames.
+    rewind = Rewind(cpu, seconds=1, keyframe_interval=10)
+    for _ in range(1000):
+        cpu.run(12)
+        rewind.record()
+
+    assert 60 <= len(rewind) <= 70
+    stored = sum(
+        len(segment.keyframe) + sum(map(len, segment.deltas)) for segment in rewind.segments
+    )
+    assert stored < 70 * len(cpu.snapshot())
@@ -0,0 +1,66 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from chip8 import romcache
+from chip8._exceptions import RomError
+from chip8.constants import FONT, MEMORY_SIZE, PC_INIT
+from chip8.ram import RAM
+
+
+@pytest.fixture(autouse=True)
+def empty_cache() -> None:
+    """Start every test with nothing cached."""
+    romcache.clear()
+
+
+def test_image_holds_font_and_rom(tmp_path: Path) -> None:
+    """The cached image is the whole power-on memory."""
+    rom = tmp_path / "a.ch8"
+    rom.write_bytes(b"\x60\x01\x12\x00")
+    image = romcache.load_image(rom)
+    assert len(image.memory) == MEMORY_SIZE
+    assert image.memory[: len(FONT)] == bytes(FONT)
+    assert image.rom == b"\x60\x01\x12\x00"
+    assert RAM(str(rom)).memory == image.memory
+
+
+def test_repeat_loads_share_one_image(tmp_path: Path) -> None:
+    """Loading a path again, or another path with the same bytes, reuses the image."""
+    first, second = tmp_path / "a.ch8", tmp_path / "b.ch8"
+    first.write_bytes(b"\x60\x01")
+    second.write_bytes(b"\x60\x01")
+    image = romcache.load_image(first)
+    assert romcache.load_image(first) is image
+    assert romcache.load_image(second) is image
+
+
+def test_changed_file_is_read_again(tmp_path: Path) -> None:
+    """A file rewritten on disk is picked up by its new stat."""
+    rom = tmp_path / "a.ch8"
+    rom.write_bytes(b"\x60\x01")
+    before = romcache.load_image(rom)
+    rom.write_bytes(b"\x60\x02")
+    stat = rom.stat()
+    os.utime(rom, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    after = romcache.load_image(rom)
+    assert after.rom == b"\x60\x02"
+    assert after.digest != before.digest
+
+
+def test_empty_rom_loads(tmp_path: Path) -> None:
+    """An empty file can't be mapped but still loads as an empty program."""
+    rom = tmp_path / "empty.ch8"
+    rom.write_bytes(b"")
+    assert romcache.load_image(rom).size == 0
+
+
+def test_bad_roms_raise(tmp_path: Path) -> None:
+    """Missing and oversized ROMs are reported as ROM errors."""
+    with pytest.raises(RomError):
+        romcache.load_image(tmp_path / "missing.ch8")
+    big = tmp_path / "big.ch8"
+    big.write_bytes(bytes(MEMORY_SIZE - PC_INIT + 1))
+    with pytest.raises(RomError):
+        romcache.load_image(big)
@@ -0,0 +1,150 @@
+from pathlib import Path
+
+import pytest
+
+from chip8.audio import HeadlessAudio
+from chip8.constants import CPU_CYCLES_PER_TICK
+from chip8.cpu import CPU
+from chip8.keypad import HeadlessKeypad
+from chip8.ram import RAM
+from chip8.scheduler import MAX_LAG, Scheduler
+from chip8.screen import HeadlessScreen
+
+
+class FakeClock:
+    """Host clock that only moves when told to."""
+
+    def __init__(self) -> None:
+        """Start the clock at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current fake time."""
+        return self.now
+
+
+@pytest.fixture
+def cpu(tmp_path: Path) -> CPU:
+    """Build a headless CPU spinning on ADD V0, 1 then JP back."""
+    # Every instruction pair bumps V0 so progress is easy to count.
+    rom_path = tmp_path / "spin.ch8"
+    rom_path.write_bytes(b"\x70\x01\x12\x00")
+    return CPU(RAM(str(rom_path)), HeadlessScreen(), HeadlessKeypad(), HeadlessAudio())
+
+
+def test_advance_follows_host_time(cpu: CPU) -> None:
+    # An eighth of a second at 800 instructions per second runs 100 instructions.
+    clock = FakeClock()
+    scheduler = Scheduler(cpu, ips=800, clock=clock)
+    scheduler.advance()  # anchor emulated time to the host clock
+
+    clock.now = 0.125
+    assert scheduler.advance() == 100
+    assert scheduler.executed == 100
+
+
+def test_timers_tick_at_60hz_of_emulated_time(cpu: CPU) -> None:
+    # A delay timer of 30 runs out after half an emulated second.
+    clock = FakeClock()
+    scheduler = Scheduler(cpu, ips=1200, clock=clock)
+    scheduler.advance()
+    cpu.delay_timer = 30
+    cpu.audio.timer = 30
+
+    clock.now = 0.25
+    scheduler.advance()
+    assert cpu.delay_timer == 15
+    assert cpu.audio.timer == 15
+
+    clock.now = 0.5
+    scheduler.advance()
+    clock.now = 0.5 + 1 / 60  # the last tick lands before the next instruction
+    scheduler.advance()
+    assert cpu.delay_timer == 0
+    assert cpu.audio.timer == 0
+
+
+def test_slow_frames_catch_up_without_drift(cpu: CPU) -> None:
+    # Uneven host frames still add up to the same instruction count.
+    clock = FakeClock()
+    scheduler = Scheduler(cpu, ips=700, clock=clock)
+    scheduler.advance()
+
+    for now in (0.003, 0.05, 0.051, 0.12, 0.2, 0.4, 0.6, 0.8, 1.0):
+        clock.now = now
+        scheduler.advance()
+
+    assert scheduler.executed == 700
+    assert scheduler.ticks == 60
+
+
+def test_long_stalls_are_dropped(cpu: CPU) -> None:
+    # A stall longer than MAX_LAG only runs MAX_LAG worth of instructions.
+    clock = FakeClock()
+    scheduler = Scheduler(cpu, ips=1000, clock=clock)
+    scheduler.advance()
+
+    clock.now = 10.0
+    assert scheduler.advance() == int(MAX_LAG * 1000)
+
+    clock.now = 10.125
+    assert scheduler.advance() == 125
+
+
+def test_uncapped_runs_one_frame_per_call(cpu: CPU) -> None:
+    # Without a cap each call runs a frame of instructions regardless of the clock.
+    clock = FakeClock()
+    scheduler = Scheduler(cpu, ips=720, uncapped=True, clock=clock)
+
+    for _ in range(3):
+        scheduler.advance()
+
+    assert scheduler.executed == 3 * CPU_CYCLES_PER_TICK
+    assert cpu.v[0] == 3 * CPU_CYCLES_PER_TICK // 2
+
+
+@pytest.mark.parametrize("ips", [1000, 30])
+def test_uncapped_frames_carry_the_fraction(cpu: CPU, ips: int) -> None:
+    # A second of frames runs exactly ips instructions, even when a frame is under one.
+    scheduler = Scheduler(cpu, ips=ips, uncapped=True)
+
+    for _ in range(60):
+        scheduler.advance()
+
+    assert scheduler.executed == ips
+    assert scheduler.ticks == 60
+
+
+def test_default_rate_matches_cycle(tmp_path: Path) -> None:
+    # One frame at the default rate is the same as one CPU cycle.
+    rom_path = tmp_path / "timer.ch8"
+    rom_path.write_bytes(b"\xf1\x07\x70\x01\x12\x00")
+    reference = CPU(RAM(str(rom_path)), HeadlessScreen(), HeadlessKeypad(), HeadlessAudio())
+    scheduled = CPU(RAM(str(rom_path)), HeadlessScreen(), HeadlessKeypad(), HeadlessAudio())
+    for machine in (reference, scheduled):
+        machine.delay_timer = 9
+    scheduler = Scheduler(scheduled, uncapped=True)
+
+    for _ in range(5):
+        reference.cycle()
+        scheduler.advance()
+
+    assert scheduled.v == reference.v
+    assert scheduled.delay_timer == reference.delay_timer
+    assert scheduled.pc == reference.pc
+
+
+def test_resync_forgets_paused_time(cpu: CPU) -> None:
+    # Host time spent paused is not made up once pacing resumes.
+    clock = FakeClock()
+    scheduler = Scheduler(cpu, ips=1000, clock=clock)
+    scheduler.advance()
+    clock.now = 0.125
+    scheduler.advance()
+
+    scheduler.resync()
+    clock.now = 5.0
+    assert scheduler.advance() == 0
+    clock.now = 5.125
+    assert scheduler.advance() == 125
+    assert scheduler.executed == 250
@@ -1,8 +1,9 @@
+import pygame as pg
 import pytest
 
 from chip8.config import BLACK, WHITE
-from chip8.constants import PIXEL_HEIGHT, PIXEL_WIDTH, SCREEN_HEIGHT, SCREEN_WIDTH
-from chip8.screen import Screen
+from chip8.constants import SCREEN_HEIGHT, SCREEN_WIDTH
+from chip8.screen import HeadlessScreen, Screen
 
 
 @pytest.fixture
@@ -12,32 +13,34 @@ def patch_screen_pygame(monkeypatch: pytest.MonkeyPatch) -> dict[str, object]:
         "set_mode": None,
         "flip_calls": 0,
         "update_calls": 0,
-        "rect_calls": [],
+        "update_rects": [],
+        "scale_calls": 0,
     }
+    scale = pg.transform.scale
 
-    def _set_mode(size: tuple[int, int]) -> object:
-        # Record the requested display size.
+    def _set_mode(size: tuple[int, int]) -> pg.Surface:
+        # Record the requested display size and draw onto an offscreen surface.
         calls["set_mode"] = size
-        return object()
+        return pg.Surface(size)
 
     def _flip() -> None:
         # Record display flip requests.
         calls["flip_calls"] = int(calls["flip_calls"]) + 1
 
-    def _update() -> None:
-        # Record display update requests.
+    def _update(rects: list[pg.Rect]) -> None:
+        # Record display update requests and the regions they flush.
         calls["update_calls"] = int(calls["update_calls"]) + 1
+        calls["update_rects"] = list(rects)
 
-    def _rect(surface: object, color: tuple[int, int, int], rect: list[int]) -> None:
-        # Record pixel draw requests.
-        rect_calls = calls["rect_calls"]
-        assert isinstance(rect_calls, list)
-        rect_calls.append((surface, color, rect))
+    def _scale(surface: pg.Surface, size: tuple[int, int], dest: pg.Surface) -> pg.Surface:
+        # Record scaled blits to the window regions.
+        calls["scale_calls"] = int(calls["scale_calls"]) + 1
+        return scale(surface, size, dest)
 
     monkeypatch.setattr("chip8.screen.pg.display.set_mode", _set_mode)
     monkeypatch.setattr("chip8.screen.pg.display.flip", _flip)
     monkeypatch.setattr("chip8.screen.pg.display.update", _update)
-    monkeypatch.setattr("chip8.screen.pg.draw.rect", _rect)
+    monkeypatch.setattr("chip8.screen.pg.transform.scale", _scale)
     return calls
 
 
@@ -68,8 +71,8 @@ def test_clear_resets_entire_buffer_and_flips_display(
 ) -> None:
     # Restore all pixels to the cleared state without forcing an immediate refresh.
     screen = Screen(1)
-    screen.buffer[0][0] = 1
-    screen.buffer[5][5] = 1
+    screen.flip_pixel(0, 0)
+    screen.flip_pixel(5, 5)
     update_calls = int(patch_screen_pygame["update_calls"])
 
     screen.clear()
@@ -81,22 +84,37 @@ def test_clear_resets_entire_buffer_and_flips_display(
 def test_update_draws_full_frame_and_refreshes_display(
     patch_screen_pygame: dict[str, object],
 ) -> None:
-    # Draw every pixel in the current screen buffer.
+    # Scale the whole framebuffer onto the window on the first frame.
     screen = Screen(2)
-    screen.buffer[0][0] = 1
-    rect_calls_before = len(patch_screen_pygame["rect_calls"])
+    screen.flip_pixel(0, 0)
+    scale_calls_before = int(patch_screen_pygame["scale_calls"])
     update_calls_before = int(patch_screen_pygame["update_calls"])
 
     screen.update()
 
-    rect_calls = patch_screen_pygame["rect_calls"]
-    assert isinstance(rect_calls, list)
-    assert len(rect_calls) - rect_calls_before == SCREEN_WIDTH * SCREEN_HEIGHT
-    new_rect_calls = rect_calls[rect_calls_before:]
-    assert new_rect_calls[0][1] == WHITE
-    assert new_rect_calls[0][2] == [0, 0, PIXEL_WIDTH * 2, PIXEL_HEIGHT * 2]
-    assert new_rect_calls[1][1] == BLACK
+    assert int(patch_screen_pygame["scale_calls"]) == scale_calls_before + 1
+    assert screen.screen.get_at((0, 0))[:3] == WHITE
+    assert screen.screen.get_at((1, 1))[:3] == WHITE
+    assert screen.screen.get_at((2, 0))[:3] == BLACK
     assert int(patch_screen_pygame["update_calls"]) == update_calls_before + 1
+    assert patch_screen_pygame["update_rects"] == [
+        pg.Rect(0, 0, SCREEN_WIDTH * 2, SCREEN_HEIGHT * 2),
+    ]
+
+
+def test_update_flushes_only_damaged_region(
+    patch_screen_pygame: dict[str, object],
+) -> None:
+    # Redraw just the box around a sprite drawn after the first frame.
+    screen = Screen(2)
+    screen.update()  # consume initial full frame
+
+    screen.draw_sprite(10, 5, [0b0110_0000, 0b0100_0000])
+    screen.update()
+
+    assert patch_screen_pygame["update_rects"] == [pg.Rect(22, 10, 4, 4)]
+    assert screen.screen.get_at((22, 10))[:3] == WHITE
+    assert screen.screen.get_at((20, 10))[:3] == BLACK
 
 
 def test_update_skips_when_not_dirty(
@@ -105,10 +123,25 @@ def test_update_skips_when_not_dirty(
     # Avoid redundant full-frame redraw when buffer is unchanged.
     screen = Screen(1)
     screen.update()  # consume initial dirty frame
-    rect_calls_before = len(patch_screen_pygame["rect_calls"])
+    scale_calls_before = int(patch_screen_pygame["scale_calls"])
     update_calls_before = int(patch_screen_pygame["update_calls"])
 
     screen.update()
 
-    assert len(patch_screen_pygame["rect_calls"]) == rect_calls_before
+    assert int(patch_screen_pygame["scale_calls"]) == scale_calls_before
     assert int(patch_screen_pygame["update_calls"]) == update_calls_before
+
+
+def test_headless_screen_never_opens_display(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Fail loudly if the headless screen touches the display.
+    def _set_mode(_size: tuple[int, int]) -> object:
+        raise AssertionError("headless screen opened a window")
+
+    monkeypatch.setattr("chip8.screen.pg.display.set_mode", _set_mode)
+    screen = HeadlessScreen(3)
+
+    assert screen.flip_pixel(1, 1) is False
+    screen.update()
+
+    assert screen.buffer[1][1] == 1
+    assert screen.dirty is False
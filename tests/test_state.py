@@ -0,0 +1,106 @@
+from pathlib import Path
+
+import pytest
+
+from chip8._exceptions import StateError
+from chip8.blocks import BlockCPU
+from chip8.constants import STACK_DEPTH
+from chip8.cpu import CPU
+from chip8.dispatch import DispatchCPU
+from chip8.state import STATE_SIZE
+from tests.helpers import MachineFactory, RomWriter
+
+ROM = Path("roms") / "maze.ch8"
+
+
+def test_memory_and_registers_share_the_state_buffer(build: MachineFactory) -> None:
+    # RAM and V registers are windows onto the one save state buffer.
+    cpu = build(CPU, ROM)
+    cpu.ram[0x300] = 0xAB
+    cpu.v[3] = 0xCD
+    assert cpu.state.buffer[0x300] == 0xAB
+    assert cpu.state.buffer[len(cpu.ram.memory) + 3] == 0xCD
+
+
+def test_snapshot_restores_every_part_of_the_machine(build: MachineFactory) -> None:
+    cpu = build(CPU, ROM)
+    cpu.ram[0x300] = 0x11
+    cpu.v[0] = 0x22
+    cpu.i = 0x345
+    cpu.pc = 0x250
+    cpu.stack[:] = [0x204, 0x208]
+    cpu.delay_timer = 9
+    cpu.audio.timer = 4
+    cpu.screen.draw_sprite(3, 5, [0xF0])
+    saved = cpu.snapshot()
+    assert len(saved) == STATE_SIZE
+
+    cpu.ram[0x300] = 0
+    cpu.v[0] = 0
+    cpu.i = cpu.delay_timer = cpu.audio.timer = 0
+    cpu.pc = 0x200
+    cpu.stack.clear()
+    cpu.screen.clear()
+    cpu.screen.update()
+
+    cpu.restore(saved)
+    assert cpu.ram[0x300] == 0x11
+    assert cpu.v[0] == 0x22
+    assert (cpu.i, cpu.pc, cpu.stack) == (0x345, 0x250, [0x204, 0x208])
+    assert (cpu.delay_timer, cpu.audio.timer) == (9, 4)
+    assert cpu.screen.frame.pixel(3, 5) == 1
+    assert cpu.screen.dirty
+    assert cpu.screen.frame.take_damage() == [(3, 5, 4, 1)]
+
+
+def test_snapshot_into_reuses_the_given_buffer(build: MachineFactory) -> None:
+    cpu = build(DispatchCPU, ROM)
+    slot = bytearray(STATE_SIZE)
+    assert cpu.snapshot(slot) is slot
+    assert slot == cpu.snapshot()
+
+
+def test_restore_resumes_the_same_run(build: MachineFactory) -> None:
+    # Running on from a restored snapshot repeats the original run exactly.
+    cpu = build(DispatchCPU, ROM)
+    cpu.run(200)
+    saved = cpu.snapshot()
+    cpu.run(500)
+    expected = cpu.snapshot()
+
+    cpu.restore(saved)
+    cpu.run(500)
+    assert cpu.snapshot() == expected
+
+
+def test_snapshot_moves_between_engines(build: MachineFactory) -> None:
+    source = build(CPU, ROM)
+    source.run(100)
+    target = build(DispatchCPU, ROM)
+    target.restore(source.snapshot())
+    assert target.snapshot() == source.snapshot()
+
+
+def test_block_cpu_restore_drops_translated_blocks(
+    write_rom: RomWriter,
+    build: MachineFactory,
+) -> None:
+    first = write_rom([0x6001, 0x1200])  # V0 = 1, loop
+    second = write_rom([0x6002, 0x1200])  # V0 = 2, loop
+    cpu = build(BlockCPU, first)
+    cpu.run(2)
+    cpu.restore(build(BlockCPU, second).snapshot())
+    cpu.run(2)
+    assert cpu.v[0] == 2
+
+
+def test_restore_rejects_the_wrong_size(build: MachineFactory) -> None:
+    with pytest.raises(StateError):
+        build(CPU, ROM).restore(bytes(10))
+
+
+def test_snapshot_rejects_a_stack_too_deep_to_save(build: MachineFactory) -> None:
+    cpu = build(CPU, ROM)
+    cpu.stack[:] = [0x200] * (STACK_DEPTH + 1)
+    with pytest.raises(StateError):
+        cpu.snapshot()
@@ -0,0 +1,197 @@
+import asyncio
+import random
+from pathlib import Path
+
+import pytest
+
+from chip8._exceptions import StreamError
+from chip8.aio import AsyncChip8
+from chip8.chip8 import Chip8
+from chip8.keypad import HeadlessKeypad
+from chip8.screen import HeadlessScreen
+from chip8.stream import (
+    DELTA,
+    FRAME_BYTES,
+    KEYFRAME,
+    PACKET,
+    FrameDecoder,
+    FrameEncoder,
+    pack_bits,
+    read_packet,
+    start_server,
+    stream,
+    unpack_bits,
+    view,
+)
+
+ROM = "roms/walk.ch8"
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"\x00" * FRAME_BYTES,
+        b"\x01\x02",
+        b"\xaa" * 300 + bytes(range(256)) + b"\x00\x00\x00\x01",
+        random.Random(1).randbytes(1000),
+    ],
+)
+def test_pack_bits_roundtrip(data: bytes) -> None:
+    assert unpack_bits(pack_bits(data), len(data)) == data
+
+
+def test_blank_screen_packs_small() -> None:
+    assert len(pack_bits(bytes(FRAME_BYTES))) == 4
+
+
+def test_unpack_bits_errors() -> None:
+    with pytest.raises(StreamError):
+        unpack_bits(b"\x05\x01", 6)  # literal run cut short
+    with pytest.raises(StreamError):
+        unpack_bits(b"\xfe", 3)  # repeat with no byte
+    with pytest.raises(StreamError):
+        unpack_bits(pack_bits(b"abc"), 4)
+
+
+def test_decoder_follows_a_running_rom() -> None:
+    # Every packet rebuilds exactly the screen the machine showed for that frame.
+    chip8 = Chip8(ROM, headless=True, uncapped=True, seed=1)
+    encoder = FrameEncoder(keyframe_interval=30)
+    decoder = FrameDecoder()
+    kinds = []
+    for number in range(1, 121):
+        chip8.step()
+        packet = encoder.encode(number, chip8.screen.frame.to_bytes())
+        if packet is None:
+            continue
+        kinds.append(packet[0])
+        assert decoder.decode(packet) == chip8.screen.frame.rows
+        assert decoder.number == number
+    assert kinds[0] == KEYFRAME
+    assert DELTA in kinds
+    assert kinds.count(KEYFRAME) >= 3
+
+
+def test_unchanged_frames_send_nothing() -> None:
+    encoder = FrameEncoder()
+    pixels = bytes(FRAME_BYTES)
+    assert encoder.encode(1, pixels) is not None
+    assert encoder.encode(2, pixels) is None
+    encoder.request_keyframe()
+    packet = encoder.encode(3, pixels)
+    assert packet is not None
+    assert packet[0] == KEYFRAME
+
+
+def test_decoder_errors() -> None:
+    encoder = FrameEncoder()
+    encoder.encode(1, bytes(FRAME_BYTES))
+    delta = encoder.encode(2, b"\xff" + bytes(FRAME_BYTES - 1))
+    assert delta is not None
+    with pytest.raises(StreamError, match="before the first keyframe"):
+        FrameDecoder().decode(delta)
+    with pytest.raises(StreamError):
+        FrameDecoder().decode(PACKET.pack(7, 1, 0))
+    keyframe = FrameEncoder().encode(1, bytes(FRAME_BYTES))
+    assert keyframe is not None
+    with pytest.raises(StreamError):
+        FrameDecoder().decode(keyframe[:-1])
+
+
+def test_read_packet_truncated() -> None:
+    async def main() -> None:
+        reader = asyncio.StreamReader()
+        reader.feed_data(PACKET.pack(KEYFRAME, 1, 10) + b"abc")
+        reader.feed_eof()
+        with pytest.raises(StreamError):
+            await read_packet(reader)
+        empty = asyncio.StreamReader()
+        empty.feed_eof()
+        assert await read_packet(empty) is None
+
+    asyncio.run(main())
+
+
+class PollingKeypad(HeadlessKeypad):
+    """Headless keypad that asks to quit after being polled a number of times."""
+
+    def __init__(self, polls: int) -> None:
+        """Quit on the given poll."""
+        super().__init__()
+        self.polls = polls
+
+    def update(self) -> None:
+        """Count down to quitting."""
+        self.polls -= 1
+        self.quit = self.polls <= 0
+
+
+def test_viewer_polls_keys_while_the_screen_is_still() -> None:
+    # Nothing arrives after the first frame, yet the keypad is still polled and can quit.
+    keyframe = FrameEncoder().encode(1, b"\xff" + bytes(FRAME_BYTES - 1))
+    assert keyframe is not None
+    screen = HeadlessScreen()
+
+    async def main() -> int:
+        reader = asyncio.StreamReader()
+        asyncio.get_running_loop().call_later(0.05, reader.feed_data, keyframe[:5])
+        asyncio.get_running_loop().call_later(0.07, reader.feed_data, keyframe[5:])
+        return await asyncio.wait_for(view(reader, screen, PollingKeypad(12)), timeout=5)
+
+    assert asyncio.run(main()) == 1
+    assert screen.frame.rows[0]
+
+
+def test_viewer_over_socket(tmp_path: Path) -> None:
+    # Two viewers connect at once, each gets its own machine and a full stream.
+    socket = tmp_path / "chip8.sock"
+
+    async def watch() -> HeadlessScreen:
+        reader, writer = await asyncio.open_unix_connection(socket)
+        screen = HeadlessScreen()
+        assert await view(reader, screen) > 0
+        writer.close()
+        return screen
+
+    async def main() -> tuple[HeadlessScreen, HeadlessScreen]:
+        async with await start_server(ROM, socket, frames=90):
+            return await asyncio.gather(watch(), watch())
+
+    screens = asyncio.run(main())
+    for screen in screens:
+        assert not screen.dirty
+        assert any(screen.frame.rows)
+
+
+def test_stream_matches_machine() -> None:
+    machine = AsyncChip8(ROM, fps=0, seed=1)
+    screen = HeadlessScreen()
+
+    async def main() -> int:
+        reader = asyncio.StreamReader()
+        transport = _ReaderTransport(reader)
+        protocol = asyncio.StreamReaderProtocol(reader)
+        writer = asyncio.StreamWriter(transport, protocol, reader, asyncio.get_running_loop())
+        await stream(machine, writer, 90)
+        return await view(reader, screen)
+
+    assert asyncio.run(main()) > 0
+    assert screen.frame.rows == machine.chip8.screen.frame.rows
+
+
+class _ReaderTransport(asyncio.WriteTransport):
+    """Transport that writes straight into a stream reader, for an in-memory pipe."""
+
+    def __init__(self, reader: asyncio.StreamReader) -> None:
+        super().__init__()
+        self.reader = reader
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        self.reader.feed_data(bytes(data))
+
+    def close(self) -> None:
+        self.reader.feed_eof()
+
+    def is_closing(self) -> bool:
+        return False
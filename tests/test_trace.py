@@ -0,0 +1,177 @@
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from chip8.__main__ import run
+from chip8._exceptions import TraceError
+from chip8.blocks import BlockCPU
+from chip8.chip8 import Chip8
+from chip8.cpu import CPU
+from chip8.dispatch import DispatchCPU
+from chip8.trace import (
+    HEADER,
+    MAGIC,
+    NO_REGISTER,
+    TraceRecord,
+    TraceWriter,
+    format_record,
+    query,
+    read_trace,
+    traced,
+    written_registers,
+)
+
+ROM = "roms/particle.ch8"
+
+
+def reference_steps(count: int) -> list[tuple[int, int, int]]:
+    """(pc, word, I) of the first count instructions, stepped by the reference CPU."""
+    cpu = Chip8(ROM, headless=True, uncapped=True, seed=1, skip_idle=False).cpu
+    memory = cpu.ram.memory
+    steps = []
+    for _ in range(count):
+        pc = cpu.pc
+        word = memory[pc] << 8 | memory[pc + 1]
+        cpu.step()
+        steps.append((pc, word, cpu.i))
+    return steps
+
+
+def test_written_registers() -> None:
+    writes = written_registers()
+    assert writes[0x6A12] == 0xA
+    assert writes[0x8124] == 1
+    assert writes[0xF365] == 3
+    assert writes[0xD015] == NO_REGISTER
+    assert writes[0xA123] == NO_REGISTER
+
+
+@pytest.mark.parametrize("engine", [CPU, DispatchCPU, BlockCPU])
+@pytest.mark.parametrize("name", ["run.trace", "run.trace.gz"])
+def test_trace_matches_reference(tmp_path: Path, engine: type[CPU], name: str) -> None:
+    # Every engine traces the instructions the reference CPU runs, in order.
+    path = tmp_path / name
+    chip8 = Chip8(ROM, headless=True, uncapped=True, seed=1, engine=engine, trace=str(path))
+    chip8.run(30)
+    chip8.close()
+    records = list(read_trace(path))
+    assert len(records) == chip8.scheduler.executed
+    assert chip8.scheduler.skipped == 0
+    assert [(r.pc, r.word, r.i) for r in records] == reference_steps(len(records))
+    assert [r.index for r in records[:3]] == [0, 1, 2]
+
+
+def test_register_values(tmp_path: Path) -> None:
+    rom = tmp_path / "regs.ch8"
+    # LD V3, 0x12 / ADD V3, 0x01 / LD I, 0x300 / JP 0x206
+    rom.write_bytes(bytes.fromhex("6312 7301 a300 1206"))
+    path = tmp_path / "regs.trace"
+    chip8 = Chip8(str(rom), headless=True, uncapped=True, engine=DispatchCPU, trace=str(path))
+    chip8.cpu.run(4)
+    chip8.close()
+    records = list(read_trace(path))
+    assert [(r.register, r.value) for r in records[:2]] == [(3, 0x12), (3, 0x13)]
+    assert records[2].register is None
+    assert records[2].i == 0x300
+    assert format_record(records[1]) == (
+        "         1  202:  7301  ADD V3, 0x01          I=000  V3=13"
+    )
+
+
+def test_small_chunks_flush(tmp_path: Path) -> None:
+    # A buffer that fills many times over still writes every record once, in order.
+    path = tmp_path / "chunks.trace"
+    chip8 = Chip8(ROM, headless=True, uncapped=True, seed=1, engine=DispatchCPU, skip_idle=False)
+    cpu = traced(DispatchCPU)(chip8.ram, chip8.screen, chip8.keypad, chip8.audio, 1)
+    cpu.trace = writer = TraceWriter(path, chunk=3)
+    cpu.run(10)
+    cpu.run(7)
+    writer.close()
+    assert writer.records == 17
+    assert [(r.pc, r.word, r.i) for r in read_trace(path)] == reference_steps(17)
+
+
+def test_untraced_machine_runs_normally() -> None:
+    chip8 = Chip8(ROM, headless=True, uncapped=True, seed=1, engine=traced(DispatchCPU))
+    plain = Chip8(ROM, headless=True, uncapped=True, seed=1, engine=DispatchCPU)
+    chip8.run(30)
+    plain.run(30)
+    assert chip8.digest() == plain.digest()
+
+
+def test_query() -> None:
+    records = [
+        TraceRecord(0, 0x200, 0x6312, 0, 3, 0x12),
+        TraceRecord(1, 0x202, 0xD015, 0, None, 0),
+        TraceRecord(2, 0x200, 0x6312, 0, 3, 0x12),
+    ]
+    assert [r.index for r in query(records, pc=0x200)] == [0, 2]
+    assert [r.index for r in query(records, mnemonic="drw")] == [1]
+    assert [r.index for r in query(records, register=3, pc=0x200)] == [0, 2]
+    assert not list(query(records, register=4))
+
+
+def test_bad_files(tmp_path: Path) -> None:
+    short = tmp_path / "short.trace"
+    short.write_bytes(b"C8")
+    with pytest.raises(TraceError):
+        list(read_trace(short))
+    other = tmp_path / "other.trace"
+    other.write_bytes(b"nope" + bytes(20))
+    with pytest.raises(TraceError):
+        list(read_trace(other))
+    torn = tmp_path / "torn.trace"
+    torn.write_bytes(HEADER.pack(MAGIC, 1, 8) + bytes(11))
+    with pytest.raises(TraceError):
+        list(read_trace(torn))
+
+
+def test_damaged_gzip(tmp_path: Path) -> None:
+    path = tmp_path / "run.trace.gz"
+    chip8 = Chip8(ROM, headless=True, uncapped=True, seed=1, trace=str(path))
+    chip8.run(10)
+    chip8.close()
+    data = path.read_bytes()
+    torn = tmp_path / "torn.trace.gz"
+    torn.write_bytes(data[: len(data) // 2])
+    with pytest.raises(TraceError, match="corrupt"):
+        list(read_trace(torn))
+    garbled = tmp_path / "garbled.trace.gz"
+    garbled.write_bytes(data[:2] + bytes(len(data) - 2))
+    with pytest.raises(TraceError, match="corrupt"):
+        list(read_trace(garbled))
+    result = CliRunner().invoke(run, ["trace", str(torn)])
+    assert result.exit_code == 1
+    assert "corrupt" in result.output
+
+
+def test_zstd(tmp_path: Path) -> None:
+    pytest.importorskip("zstandard")
+    path = tmp_path / "run.trace.zst"
+    chip8 = Chip8(ROM, headless=True, uncapped=True, seed=1, trace=str(path))
+    chip8.run(10)
+    chip8.close()
+    assert len(list(read_trace(path))) == chip8.scheduler.executed
+
+
+def test_cli(tmp_path: Path) -> None:
+    path = tmp_path / "cli.trace.gz"
+    runner = CliRunner()
+    args = ["-r", ROM, "--headless", "--uncapped", "--frames", "10", "--trace", str(path)]
+    assert runner.invoke(run, args).exit_code == 0
+    result = runner.invoke(run, ["trace", str(path), "--opcode", "DRW", "--limit", "2"])
+    assert result.exit_code == 0
+    lines = result.output.splitlines()
+    assert len(lines) == 2
+    assert all("DRW" in line for line in lines)
+    assert runner.invoke(run, ["trace", str(path), "--pc", "xyz"]).exit_code != 0
+
+
+def test_cli_rejects_tracing_a_replay(tmp_path: Path) -> None:
+    movie = tmp_path / "run.c8m"
+    Chip8(ROM, headless=True, uncapped=True, record=str(movie)).run(5)
+    args = ["-r", ROM, "--replay", str(movie), "--trace", str(tmp_path / "run.trace")]
+    result = CliRunner().invoke(run, args)
+    assert result.exit_code == 2
+    assert "--replay can't be combined" in result.output
@@ -0,0 +1,87 @@
+from pathlib import Path
+
+import pytest
+
+from chip8._exceptions import ChipError
+from chip8.cpu import CPU
+from chip8.dispatch import DispatchCPU
+from chip8.opcodes import opcodes
+from tests.helpers import MachineFactory, RomWriter
+
+np = pytest.importorskip("numpy")
+from chip8.vector import VECTOR_OPS, VectorMachine  # noqa: E402
+
+ROMS = sorted(Path("roms").glob("*.ch8"))
+
+
+def assert_same(machine: VectorMachine, k: int, cpu: CPU) -> None:
+    """Check one instance holds exactly the scalar CPU's state."""
+    assert machine.pc[k] == cpu.pc
+    assert machine.i[k] == cpu.i
+    assert machine.v[k].tobytes() == bytes(cpu.v)
+    assert machine.memory[k].tobytes() == bytes(cpu.ram.memory)
+    assert list(machine.stack[k, : machine.sp[k]]) == cpu.stack
+    assert machine.delay_timer[k] == cpu.delay_timer
+    assert machine.rng[k] == cpu.rng
+    assert [int(row) for row in machine.frame[k]] == cpu.screen.frame.rows
+
+
+def test_every_opcode_has_a_vector_op() -> None:
+    assert {opcode.call for opcode in opcodes.values()} <= set(VECTOR_OPS)
+
+
+@pytest.mark.parametrize("rom", ROMS, ids=[rom.name for rom in ROMS])
+def test_instances_match_the_cpu(rom: Path, build: MachineFactory) -> None:
+    # Each instance walks the same path as a scalar CPU with its seed.
+    seeds = [3, 4, 5]
+    machine = VectorMachine(str(rom), len(seeds), np.array(seeds))
+    cpus = [build(DispatchCPU, rom, seed) for seed in seeds]
+    halted = [False] * len(cpus)
+    for _ in range(100):
+        machine.cycle()
+        for k, cpu in enumerate(cpus):
+            if halted[k]:
+                continue
+            try:
+                cpu.cycle()
+            except ChipError:
+                halted[k] = True
+
+    assert list(machine.halted) == halted
+    for k, cpu in enumerate(cpus):
+        if not halted[k]:
+            assert_same(machine, k, cpu)
+
+
+def test_instances_follow_their_own_keys(write_rom: RomWriter) -> None:
+    # WAIT then store the key: only instances with a key down move on.
+    machine = VectorMachine(write_rom([0xF30A, 0x1202]), 3)
+    machine.keys[1, 0x7] = 1
+    machine.keys[2, 0xC] = 1
+
+    machine.step()
+
+    assert list(machine.pc) == [0x200, 0x202, 0x202]
+    assert list(machine.v[:, 3]) == [0, 0x7, 0xC]
+
+
+def test_faulting_instances_halt_alone(write_rom: RomWriter) -> None:
+    # Instances that RET with an empty stack stop, the others keep running.
+    machine = VectorMachine(write_rom([0x3A01, 0x00EE, 0x1204]), 2)  # SE VA, 1; RET; JP
+    machine.v[1, 0xA] = 1
+
+    machine.run(3)
+
+    assert list(machine.halted) == [True, False]
+    assert machine.pc[1] == 0x204
+
+
+def test_pixels_unpack_the_framebuffer(write_rom: RomWriter) -> None:
+    machine = VectorMachine(write_rom([0xD005]), 2)  # draw the 0 glyph at (0, 0)
+
+    machine.step()
+
+    pixels = machine.pixels()
+    assert pixels.shape == (2, 32, 64)
+    assert list(pixels[0, 0, :8]) == [1, 1, 1, 1, 0, 0, 0, 0]
+    assert (pixels[0] == pixels[1]).all()